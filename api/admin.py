@@ -1,3 +1,42 @@
 from django.contrib import admin
 
-# Register your models here.
+from api.models import (
+    DnsRecordObservation, DorkUrlObservation, HostObservation, PortObservation, ScanJob, WhoisSnapshot)
+
+
+@admin.register(ScanJob)
+class ScanJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'progress', 'created_at', 'finished_at')
+    list_filter = ('kind', 'status')
+
+
+@admin.register(DnsRecordObservation)
+class DnsRecordObservationAdmin(admin.ModelAdmin):
+    list_display = ('domain', 'record_type', 'value', 'change', 'observed_at')
+    list_filter = ('record_type', 'change')
+    search_fields = ('domain', 'value')
+
+
+@admin.register(WhoisSnapshot)
+class WhoisSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('domain', 'registrar', 'expiration_date', 'observed_at')
+    search_fields = ('domain', 'registrar')
+
+
+@admin.register(PortObservation)
+class PortObservationAdmin(admin.ModelAdmin):
+    list_display = ('host', 'port', 'protocol', 'state', 'service', 'observed_at')
+    list_filter = ('state', 'protocol')
+    search_fields = ('host',)
+
+
+@admin.register(HostObservation)
+class HostObservationAdmin(admin.ModelAdmin):
+    list_display = ('host', 'observed_at')
+    search_fields = ('host',)
+
+
+@admin.register(DorkUrlObservation)
+class DorkUrlObservationAdmin(admin.ModelAdmin):
+    list_display = ('url', 'query', 'observed_at')
+    search_fields = ('url', 'query')
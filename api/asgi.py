@@ -0,0 +1,25 @@
+"""
+ASGI config for api project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Las vistas de api/async_views.py sólo liberan el hilo mientras esperan la
+red cuando se sirven por aquí (p.ej. uvicorn api.asgi:application).
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
+
+application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.SCANNER_WARM_UP:
+    # Los escáneres quedan listos antes de la primera petición
+    from core.infrastructure.adapters.scanner_adapter import container  # noqa: E402
+    container.warm_up()
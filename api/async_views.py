@@ -0,0 +1,258 @@
+# api/async_views.py
+"""Versiones asíncronas de los endpoints de escaneo (/api/async/...) y /api/bulk-scan/.
+
+Servidas bajo ASGI (api/asgi.py), una petición no ocupa un hilo mientras
+espera la respuesta DNS, HTTP o de nmap, así que un proceso puede mantener
+miles de escaneos en curso. Aceptan las mismas peticiones que las vistas
+síncronas, salvo las respuestas NDJSON. El histórico y los jobs usan el ORM,
+que es síncrono, y se llaman con sync_to_async.
+"""
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Optional
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import serializers
+
+from api import encoders, jobs, result_store, throttling
+from api.streaming import NDJSON_MEDIA_TYPE, async_stream_response
+from api.views import (
+    DnsScanRequestSerializer,
+    GoogleDorkRequestSerializer,
+    NmapScanRequestSerializer,
+    NmapScanView,
+    WhoisScanRequestSerializer,
+    nmap_cost,
+)
+from core.application.bulk_scan import BulkScanUseCase, ScanLimiter, plan_requests
+from core.application.use_cases import DnsScanUseCase, GoogleDorkUseCase, NmapScanUseCase, WhoisScanUseCase
+from core.infrastructure.adapters.scanner_adapter import (
+    create_dns_scan_use_case,
+    create_google_dork_use_case,
+    create_nmap_scan_use_case,
+    create_whois_scan_use_case,
+    NMAP_SWEEP_MAX_HOSTS,
+)
+from core.infrastructure.scanners.nmap_scan import check_targets
+
+SCAN_TYPES = ('dns', 'whois', 'nmap', 'dork')
+
+# Subpeticiones simultáneas por escáner para todas las peticiones en bloque del proceso
+bulk_scan_limiter = ScanLimiter(settings.BULK_SCAN_CONCURRENCY)
+
+
+@sync_to_async
+def store_result(incremental: bool, changes: Callable[..., Any], writer: Callable[..., Any], *args):
+    """Calcula el diff con el histórico (si se pidió) y guarda el resultado en un solo salto de hilo."""
+    diff = changes(*args) if incremental else None
+    result_store.save(writer, *args)
+    return diff
+
+
+# Un escaneo completo (escáner, histórico y serialización); las usan las vistas y el escaneo en bloque
+async def dork_scan(use_case: GoogleDorkUseCase, query: str, incremental: bool) -> Any:
+    result = await use_case.execute_async(query)
+    changes = await store_result(incremental, result_store.dork_changes,
+                                 result_store.record_dork, query, result.results)
+    return result_store.with_changes(encoders.dork_result.encode(result), changes)
+
+
+async def dns_scan(use_case: DnsScanUseCase, domain: str, record_types: Iterable[str], incremental: bool) -> Any:
+    results = await use_case.execute_many_async(domain, record_types)
+    changes = await store_result(incremental, result_store.dns_changes,
+                                 result_store.record_dns, domain, results)
+    return result_store.with_changes(encoders.dns_record.encode_many(results), changes)
+
+
+async def whois_scan(use_case: WhoisScanUseCase, domain: str, incremental: bool) -> Any:
+    result = await use_case.execute_async(domain)
+    changes = await store_result(incremental, result_store.whois_changes,
+                                 result_store.record_whois, domain, result)
+    return result_store.with_changes(encoders.whois_info.encode(result), changes)
+
+
+async def nmap_scan(use_case: NmapScanUseCase, target: str, ports: Optional[str], incremental: bool) -> Any:
+    if NmapScanView.SWEEP_TARGET.search(target.strip()):
+        results = await use_case.execute_sweep_async(target, ports)
+        changes = await store_result(incremental, result_store.port_changes,
+                                     result_store.record_ports, results)
+        return result_store.with_changes(encoders.nmap_result.encode_many(results), changes)
+    result = await use_case.execute_async(target, ports)
+    changes = await store_result(incremental, result_store.port_changes,
+                                 result_store.record_ports, [result])
+    return result_store.with_changes(encoders.nmap_result.encode(result), changes)
+
+
+def _request_data(request) -> Optional[Any]:
+    if request.content_type == 'application/json':
+        try:
+            return json.loads(request.body or b'{}')
+        except ValueError:
+            return None
+    return request.POST
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncScanView(View, ABC):
+    """Aplica el límite de tasa, valida la petición con el serializer de la vista síncrona y delega en `scan`."""
+    request_serializer_class = None
+    # Escáner cuyo límite de tasa se aplica (settings.SCAN_RATE_LIMITS)
+    throttle_scope = None
+
+    async def post(self, request):
+        data = _request_data(request)
+        if data is None:
+            return JsonResponse({'detail': 'JSON mal formado.'}, status=400)
+        if self.throttle_scope is not None:
+            cost = self.throttle_cost(data)
+            # Si no cabe en la ráfaga no se cobra: el serializer la rechaza con 400
+            if cost <= throttling.max_cost(self.throttle_scope):
+                wait = await throttling.acquire_async(
+                    throttling.client_ident(request), {self.throttle_scope: cost})
+                if wait:
+                    return throttling.throttled_response(wait)
+        serializer = self.request_serializer_class(data=data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=400)
+        return await self.scan(request, serializer.validated_data)
+
+    def throttle_cost(self, data) -> int:
+        """Tokens del límite de tasa que gasta la petición (los datos aún sin validar)."""
+        return 1
+
+    @abstractmethod
+    async def scan(self, request, data):
+        """Ejecuta el escaneo con los datos ya validados y devuelve la respuesta."""
+
+
+class AsyncGoogleDorkView(AsyncScanView):
+    throttle_scope = 'dork'
+    request_serializer_class = GoogleDorkRequestSerializer
+
+    async def scan(self, request, data):
+        result = await dork_scan(create_google_dork_use_case(), data['query'], data['incremental'])
+        return JsonResponse(result, safe=False)
+
+
+class AsyncDnsScanView(AsyncScanView):
+    throttle_scope = 'dns'
+    request_serializer_class = DnsScanRequestSerializer
+
+    async def scan(self, request, data):
+        # Todos los tipos se resuelven en paralelo en una sola respuesta
+        record_types = data.get('types') or [data['type']]
+        result = await dns_scan(create_dns_scan_use_case(), data['domain'], record_types, data['incremental'])
+        return JsonResponse(result, safe=False)
+
+
+class AsyncWhoisScanView(AsyncScanView):
+    throttle_scope = 'whois'
+    request_serializer_class = WhoisScanRequestSerializer
+
+    async def scan(self, request, data):
+        result = await whois_scan(create_whois_scan_use_case(), data['domain'], data['incremental'])
+        return JsonResponse(result, safe=False)
+
+
+class AsyncNmapScanView(AsyncScanView):
+    throttle_scope = 'nmap'
+    request_serializer_class = NmapScanRequestSerializer
+
+    def throttle_cost(self, data) -> int:
+        return nmap_cost(data.get('target') if hasattr(data, 'get') else None)
+
+    async def scan(self, request, data):
+        target = data['target']
+        if data['background']:
+            sweep = bool(NmapScanView.SWEEP_TARGET.search(target.strip()))
+            job = await sync_to_async(jobs.job_queue.submit)('nmap_sweep' if sweep else 'nmap', {
+                'target': target, 'ports': data['ports'], 'incremental': data['incremental']})
+            return JsonResponse(
+                {'job_id': str(job.id), 'status': job.status,
+                 'status_url': reverse('job-detail', args=[job.id])},
+                status=202)
+        result = await nmap_scan(create_nmap_scan_use_case(), target, data['ports'], data['incremental'])
+        return JsonResponse(result, safe=False)
+
+
+class BulkScanRequestSerializer(serializers.Serializer):
+    targets = serializers.ListField(child=serializers.CharField(), allow_empty=False)
+    scans = serializers.ListField(child=serializers.ChoiceField(choices=SCAN_TYPES), allow_empty=False,
+                                  default=lambda: list(SCAN_TYPES))
+    # Opciones de cada escáner, comunes a todos los objetivos
+    types = serializers.ListField(child=serializers.CharField(), allow_empty=False, default=lambda: ['A'])
+    ports = serializers.CharField(required=False, allow_blank=True, default=None)
+    dork = serializers.CharField(default='site:{target}')
+    incremental = serializers.BooleanField(default=False)
+
+    def validate(self, data):
+        data['requests'] = plan_requests(data['targets'], data['scans'])
+        if not data['requests']:
+            raise serializers.ValidationError({'targets': 'No hay objetivos válidos.'})
+        if len(data['requests']) > settings.BULK_SCAN_MAX_REQUESTS:
+            raise serializers.ValidationError(
+                f"Demasiadas subpeticiones ({len(data['requests'])}); "
+                f"el máximo es {settings.BULK_SCAN_MAX_REQUESTS}.")
+        for scan_request in data['requests']:
+            if scan_request.scan == 'nmap':
+                try:
+                    check_targets(scan_request.target, NMAP_SWEEP_MAX_HOSTS)
+                except ValueError as e:
+                    raise serializers.ValidationError({'targets': str(e)})
+        return data
+
+
+class BulkScanView(AsyncScanView):
+    """Varios escaneos de varios objetivos en una sola petición.
+
+    Responde {objetivo: {escaneo: resultado}}; con Accept: application/x-ndjson
+    envía una línea {"target", "scan", "result"} por subpetición según terminan.
+    Cada subpetición consume un token del límite de tasa de su escáner (las
+    de nmap, uno por shard del barrido).
+    """
+    request_serializer_class = BulkScanRequestSerializer
+
+    async def scan(self, request, data):
+        # Las subpeticiones nmap gastan un token por shard (ver nmap_cost)
+        costs = Counter()
+        for scan_request in data['requests']:
+            costs[scan_request.scan] += nmap_cost(scan_request.target) if scan_request.scan == 'nmap' else 1
+        for scan, cost in costs.items():
+            # Más subpeticiones que la ráfaga permitida no pasarían nunca: no tiene sentido reintentar
+            if cost > throttling.max_cost(scan):
+                return JsonResponse(
+                    {'detail': f"Demasiados escaneos '{scan}' ({cost}); el límite de tasa permite "
+                               f"{int(throttling.max_cost(scan))} por petición."}, status=400)
+        wait = await throttling.acquire_async(throttling.client_ident(request), dict(costs))
+        if wait:
+            return throttling.throttled_response(wait)
+        use_case = BulkScanUseCase(self.runners(data), bulk_scan_limiter)
+        if self.wants_stream(request):
+            return async_stream_response(
+                {'target': scan_request.target, 'scan': scan_request.scan, 'result': result}
+                async for scan_request, result in use_case.iter_results(data['requests']))
+        return JsonResponse(await use_case.execute(data['requests']))
+
+    @staticmethod
+    def wants_stream(request) -> bool:
+        return NDJSON_MEDIA_TYPE in request.headers.get('Accept', '') or request.GET.get('format') == 'ndjson'
+
+    @staticmethod
+    def runners(data) -> Dict[str, Callable[[str], Any]]:
+        # Un use case por escáner para toda la petición
+        incremental = data['incremental']
+        dns, whois = create_dns_scan_use_case(), create_whois_scan_use_case()
+        nmap, dork = create_nmap_scan_use_case(), create_google_dork_use_case()
+        return {
+            'dns': lambda target: dns_scan(dns, target, data['types'], incremental),
+            'whois': lambda target: whois_scan(whois, target, incremental),
+            'nmap': lambda target: nmap_scan(nmap, target, data['ports'], incremental),
+            'dork': lambda target: dork_scan(dork, data['dork'].replace('{target}', target), incremental),
+        }
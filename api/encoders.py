@@ -0,0 +1,72 @@
+# api/encoders.py
+"""Conversión directa de entidades a datos JSON para las respuestas de escaneo grandes.
+
+Un Serializer de DRF recorre sus campos y llama a get_attribute y
+to_representation de cada uno, para cada objeto. Con miles de registros DNS
+o puertos eso es la mayor parte del tiempo de CPU de la respuesta.
+`EntityEncoder` lee los campos del serializer una sola vez y construye una
+función por campo, así que genera el mismo JSON que `Serializer(...).data`
+(mismos campos y conversiones) sin el coste por objeto. Los campos que no
+sabe convertir se delegan en su propio to_representation.
+"""
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
+
+from rest_framework import serializers
+from rest_framework.fields import _UnvalidatedField
+
+from api.serializers import (
+    DNSRecordSerializer,
+    GoogleDorkResultSerializer,
+    NmapScanResultSerializer,
+    WhoisInfoSerializer,
+)
+
+
+def _converter(field: serializers.Field) -> Callable[[Any], Any]:
+    """Equivalente rápido de field.to_representation para los tipos de campo habituales."""
+    if isinstance(field, serializers.CharField):
+        return str
+    if isinstance(field, serializers.IntegerField):
+        return int
+    if isinstance(field, serializers.FloatField):
+        return float
+    if isinstance(field, serializers.DictField):
+        if type(field.child) is _UnvalidatedField:
+            # Copia sin convertir las claves: el JSON resultante es el mismo (json convierte las claves a texto)
+            return dict
+        child = _converter(field.child)
+        return lambda value: {str(key): None if item is None else child(item) for key, item in value.items()}
+    if isinstance(field, serializers.ListField):
+        child = _converter(field.child)
+        if child is str:
+            return lambda value: [None if item is None else str(item) for item in value]
+        return lambda value: [None if item is None else child(item) for item in value]
+    return field.to_representation
+
+
+class EntityEncoder:
+    def __init__(self, serializer_class: Type[serializers.Serializer]):
+        # source='*' pasa el objeto entero al campo
+        self.fields = [(name, (lambda instance: instance) if field.source == '*' else attrgetter(field.source),
+                        _converter(field))
+                       for name, field in serializer_class().fields.items() if not field.write_only]
+
+    def encode(self, instance: Any) -> Optional[Dict[str, Any]]:
+        if instance is None:
+            return None
+        data = {}
+        for name, getter, convert in self.fields:
+            value = getter(instance)
+            data[name] = None if value is None else convert(value)
+        return data
+
+    def encode_many(self, instances: Iterable[Any]) -> List[Optional[Dict[str, Any]]]:
+        encode = self.encode
+        return [encode(instance) for instance in instances]
+
+
+dork_result = EntityEncoder(GoogleDorkResultSerializer)
+dns_record = EntityEncoder(DNSRecordSerializer)
+whois_info = EntityEncoder(WhoisInfoSerializer)
+nmap_result = EntityEncoder(NmapScanResultSerializer)
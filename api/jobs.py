@@ -0,0 +1,185 @@
+# api/jobs.py
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+import logging
+import os
+import socket
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+from api import encoders, result_store
+from api.models import ScanJob
+from core.infrastructure.adapters.scanner_adapter import create_nmap_scan_use_case
+
+# Un handler recibe los parámetros del job y una función para informar el
+# progreso (0.0 - 1.0) y devuelve un resultado serializable a JSON.
+JobHandler = Callable[[Dict[str, Any], Callable[[float], None]], Any]
+
+logger = logging.getLogger(__name__)
+
+# Parte del progreso que corresponde al escaneo; el resto es guardar el resultado
+SCAN_PROGRESS = 0.9
+
+
+def nmap_job_handler(use_case_factory=create_nmap_scan_use_case) -> JobHandler:
+    """Handler que ejecuta un escaneo Nmap con el use case indicado."""
+    def handle(params: Dict[str, Any], report_progress: Callable[[float], None]) -> Any:
+        use_case = use_case_factory()
+        result = use_case.execute(params['target'], params.get('ports'))
+        # Un único host no informa de su avance: sólo se marca el fin del escaneo
+        report_progress(SCAN_PROGRESS)
+        changes = result_store.port_changes([result]) if params.get('incremental') else None
+        result_store.save(result_store.record_ports, [result])
+        return result_store.with_changes(encoders.nmap_result.encode(result), changes)
+    return handle
+
+
+def nmap_sweep_job_handler(use_case_factory=create_nmap_scan_use_case) -> JobHandler:
+    """Handler que ejecuta un barrido multi-host informando el progreso por shard."""
+    def handle(params: Dict[str, Any], report_progress: Callable[[float], None]) -> Any:
+        use_case = use_case_factory()
+        results = use_case.execute_sweep(
+            params['target'], params.get('ports'), lambda progress: report_progress(progress * SCAN_PROGRESS))
+        changes = result_store.port_changes(results) if params.get('incremental') else None
+        result_store.save(result_store.record_ports, results)
+        return result_store.with_changes(encoders.nmap_result.encode_many(results), changes)
+    return handle
+
+
+class JobQueue:
+    """Cola de escaneos persistida en la base de datos y ejecutada por un pool de hilos.
+
+    Cada proceso marca los jobs que ejecuta con su identificador (`owner`) y
+    renueva su `heartbeat_at` cada `heartbeat_interval` segundos. Los jobs en
+    ejecución que llevan más de `stale_after` segundos sin heartbeat (su
+    proceso murió o se reinició) y los pendientes de más de ese tiempo se
+    vuelven a encolar; los que ejecutan otros procesos vivos no se tocan.
+    Reclamar un job es atómico, así que aunque lo encolen varios procesos se
+    ejecuta una sola vez.
+    """
+
+    def __init__(self, max_workers: int, handlers: Dict[str, JobHandler],
+                 heartbeat_interval: float = 30.0, stale_after: float = 120.0):
+        self.handlers = handlers
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='scan-job')
+        # Jobs ya encolados en este proceso: recover no los vuelve a encolar
+        self._queued: Set[Any] = set()
+        self._started = False
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def owner(self) -> str:
+        # Se calcula en cada uso: el proceso puede ser un fork del que creó la cola
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def submit(self, kind: str, params: Dict[str, Any]) -> ScanJob:
+        if kind not in self.handlers:
+            raise ValueError(f"Tipo de job desconocido: {kind}")
+        self._start()
+        job = ScanJob.objects.create(kind=kind, params=params)
+        self._enqueue(job.pk)
+        return job
+
+    def get(self, job_id) -> Optional[ScanJob]:
+        self._start()
+        return ScanJob.objects.filter(pk=job_id).first()
+
+    def heartbeat(self) -> int:
+        """Renueva el heartbeat de los jobs que ejecuta este proceso."""
+        return ScanJob.objects.filter(owner=self.owner, status=ScanJob.STATUS_RUNNING).update(
+            heartbeat_at=timezone.now())
+
+    def recover(self) -> List[Any]:
+        """Vuelve a encolar los jobs abandonados y los pendientes antiguos; devuelve sus IDs."""
+        expired = timezone.now() - timedelta(seconds=self.stale_after)
+        jobs = ScanJob.objects.filter(kind__in=list(self.handlers))
+        # Los jobs anteriores al heartbeat sólo tienen started_at
+        abandoned = jobs.filter(status=ScanJob.STATUS_RUNNING).filter(
+            Q(heartbeat_at__lt=expired) | Q(heartbeat_at__isnull=True, started_at__lt=expired))
+        abandoned_ids = list(abandoned.values_list('pk', flat=True))
+        # El update repite el filtro: si el dueño renovó el heartbeat entretanto, el job
+        # sigue en ejecución y _run no lo reclama
+        abandoned.filter(pk__in=abandoned_ids).update(
+            status=ScanJob.STATUS_PENDING, progress=0.0, started_at=None, owner='', heartbeat_at=None)
+        job_ids = abandoned_ids + list(jobs.filter(status=ScanJob.STATUS_PENDING, created_at__lt=expired)
+                                       .exclude(pk__in=abandoned_ids).values_list('pk', flat=True))
+        with self._lock:
+            job_ids = [job_id for job_id in job_ids if job_id not in self._queued]
+        for job_id in job_ids:
+            self._enqueue(job_id)
+        return job_ids
+
+    def _start(self):
+        # La primera vez que se usa la cola en el proceso se recuperan los jobs
+        # pendientes y arranca el hilo de heartbeat
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.recover()
+        threading.Thread(target=self._heartbeat_loop, name='scan-job-heartbeat', daemon=True).start()
+
+    def _heartbeat_loop(self):
+        while not self._stopped.wait(self.heartbeat_interval):
+            try:
+                self.heartbeat()
+                self.recover()
+            except Exception:
+                logger.exception("Error al renovar o recuperar los jobs de escaneo")
+            finally:
+                close_old_connections()
+
+    def _enqueue(self, job_id):
+        with self._lock:
+            self._queued.add(job_id)
+        self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id):
+        with self._lock:
+            self._queued.discard(job_id)
+        close_old_connections()
+        try:
+            now = timezone.now()
+            claimed = ScanJob.objects.filter(pk=job_id, status=ScanJob.STATUS_PENDING).update(
+                status=ScanJob.STATUS_RUNNING, started_at=now, owner=self.owner, heartbeat_at=now)
+            if not claimed:
+                return
+            job = ScanJob.objects.get(pk=job_id)
+
+            def report_progress(progress: float):
+                ScanJob.objects.filter(pk=job_id).update(
+                    progress=min(max(progress, 0.0), 1.0), heartbeat_at=timezone.now())
+
+            try:
+                result = self.handlers[job.kind](job.params, report_progress)
+            except Exception as e:
+                ScanJob.objects.filter(pk=job_id).update(
+                    status=ScanJob.STATUS_FAILED, error=str(e), finished_at=timezone.now())
+                return
+            ScanJob.objects.filter(pk=job_id).update(
+                status=ScanJob.STATUS_DONE, progress=1.0, result=result, finished_at=timezone.now())
+        finally:
+            close_old_connections()
+
+    def shutdown(self, wait: bool = True):
+        self._stopped.set()
+        self._executor.shutdown(wait=wait)
+
+
+# Cola compartida por las vistas; en tests se usa una con un use case falso
+# (ver api/tests.py), p.ej. JobQueue(1, {'nmap': nmap_job_handler(lambda: fake_use_case)})
+job_queue = JobQueue(
+    max_workers=settings.SCAN_JOB_WORKERS,
+    handlers={'nmap': nmap_job_handler(), 'nmap_sweep': nmap_sweep_job_handler()},
+    heartbeat_interval=settings.SCAN_JOB_HEARTBEAT,
+    stale_after=settings.SCAN_JOB_STALE_AFTER,
+)
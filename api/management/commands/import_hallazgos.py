@@ -0,0 +1,46 @@
+import glob
+import json
+import os
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import result_store
+
+
+class Command(BaseCommand):
+    help = "Importa en el almacén de resultados los JSON generados por ReconBot (hallazgos/)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=['hallazgos'],
+                            help="Ficheros JSON o directorios con reconbot_*.json")
+
+    def handle(self, *args, **options):
+        files = []
+        for path in options['paths']:
+            if os.path.isdir(path):
+                files += sorted(glob.glob(os.path.join(path, 'reconbot_*.json')))
+            elif os.path.isfile(path):
+                files.append(path)
+            else:
+                raise CommandError(f"No existe: {path}")
+
+        for path in files:
+            with open(path, encoding='utf-8') as f:
+                results = json.load(f)
+            # Los ficheros antiguos no guardan el dominio: se deduce del nombre
+            domain = results.get('domain') or \
+                os.path.basename(path)[len('reconbot_'):-len('.json')].replace('_', '.')
+            observed_at = datetime.fromtimestamp(os.path.getmtime(path), tz=dt_timezone.utc)
+
+            # ReconBot guarda una lista vacía cuando la consulta falla: no se distingue de una baja
+            dns_values = {record_type: values
+                          for record_type, values in results.get('dns_records', {}).items() if values}
+            dns = result_store.record_dns_values(domain, dns_values, observed_at)
+            if results.get('whois_info'):
+                result_store.record_whois(domain, results['whois_info'], observed_at)
+            urls = sum(result_store.record_dork(query, found, observed_at)
+                       for query, found in results.get('dork_results', {}).items())
+            self.stdout.write(f"{domain}: {dns} registros DNS, {urls} URLs")
+
+        self.stdout.write(self.style.SUCCESS(f"Importados {len(files)} ficheros"))
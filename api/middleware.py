@@ -0,0 +1,72 @@
+# api/middleware.py
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.urls import Resolver404, resolve
+import time
+
+from core.infrastructure.metrics import registry
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Duración de las peticiones HTTP por endpoint", ("endpoint", "method"))
+REQUESTS = registry.counter(
+    "http_requests_total", "Peticiones HTTP por endpoint, método y código de estado",
+    ("endpoint", "method", "status"))
+IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "Peticiones HTTP en curso por endpoint", ("endpoint",))
+
+
+def endpoint_name(path: str) -> str:
+    """Nombre de la ruta (p.ej. 'dns-scan'): la URL concreta dispararía el número de series."""
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return "unmatched"
+    return match.url_name or match.route or "unnamed"
+
+
+class MetricsMiddleware:
+    """Mide latencia, número y códigos de estado de las peticiones por endpoint.
+
+    Admite vistas síncronas y asíncronas sin obligar a Django a adaptar la
+    cadena de middleware (las vistas de api/async_views.py siguen en el bucle).
+    Las excepciones no capturadas se cuentan como 500.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        endpoint, start = self._start(request)
+        status = 500
+        try:
+            response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            self._finish(request, endpoint, start, status)
+
+    async def _acall(self, request):
+        endpoint, start = self._start(request)
+        status = 500
+        try:
+            response = await self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            self._finish(request, endpoint, start, status)
+
+    def _start(self, request):
+        endpoint = endpoint_name(request.path_info)
+        IN_FLIGHT.inc(endpoint=endpoint)
+        return endpoint, time.perf_counter()
+
+    def _finish(self, request, endpoint: str, start: float, status: int):
+        # En las respuestas en streaming (NDJSON) se mide hasta que la vista entrega la respuesta
+        REQUEST_DURATION.observe(time.perf_counter() - start, endpoint=endpoint, method=request.method)
+        REQUESTS.inc(endpoint=endpoint, method=request.method, status=status)
+        IN_FLIGHT.dec(endpoint=endpoint)
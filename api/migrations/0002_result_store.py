@@ -0,0 +1,73 @@
+# Generated by Django 5.2 on 2026-10-18 07:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DnsRecordObservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain', models.CharField(max_length=253)),
+                ('record_type', models.CharField(max_length=16)),
+                ('value', models.TextField()),
+                ('change', models.CharField(choices=[('first', 'Primera observación'), ('same', 'Sin cambios'), ('added', 'Añadido'), ('removed', 'Eliminado')], default='first', max_length=8)),
+                ('observed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['domain', 'record_type', 'observed_at'], name='dns_domain_type_observed'), models.Index(fields=['record_type', 'change', 'observed_at'], name='dns_type_change_observed')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DorkUrlObservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.TextField()),
+                ('url', models.CharField(max_length=2048)),
+                ('title', models.TextField(blank=True, default='')),
+                ('observed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['url'], name='dork_url'), models.Index(fields=['observed_at'], name='dork_observed')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PortObservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('host', models.CharField(max_length=255)),
+                ('port', models.PositiveIntegerField()),
+                ('protocol', models.CharField(default='tcp', max_length=8)),
+                ('state', models.CharField(max_length=16)),
+                ('service', models.CharField(blank=True, default='', max_length=64)),
+                ('version', models.CharField(blank=True, default='', max_length=255)),
+                ('observed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['host', 'port'], name='port_host_port'), models.Index(fields=['port', 'state', 'observed_at'], name='port_port_state_observed')],
+            },
+        ),
+        migrations.CreateModel(
+            name='WhoisSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain', models.CharField(max_length=253)),
+                ('registrar', models.CharField(blank=True, default='', max_length=255)),
+                ('creation_date', models.CharField(blank=True, default='', max_length=64)),
+                ('expiration_date', models.CharField(blank=True, default='', max_length=64)),
+                ('name_servers', models.JSONField(default=list)),
+                ('status', models.JSONField(default=list)),
+                ('observed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['domain', 'observed_at'], name='whois_domain_observed')],
+            },
+        ),
+    ]
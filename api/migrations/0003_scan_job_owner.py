@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 08:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_result_store'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scanjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='scanjob',
+            name='owner',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
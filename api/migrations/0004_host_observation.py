@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-18 08:36
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_scan_job_owner'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HostObservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('host', models.CharField(max_length=255)),
+                ('observed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['host', 'observed_at'], name='host_host_observed')],
+            },
+        ),
+    ]
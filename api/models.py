@@ -1,3 +1,155 @@
+import uuid
+
 from django.db import models
+from django.utils import timezone
+
+
+class ScanJob(models.Model):
+    """Escaneo ejecutado en segundo plano y consultable por su ID."""
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendiente'),
+        (STATUS_RUNNING, 'En ejecución'),
+        (STATUS_DONE, 'Completado'),
+        (STATUS_FAILED, 'Fallido'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=32)
+    params = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    progress = models.FloatField(default=0.0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Proceso que lo ejecuta ("host:pid") y última señal de vida de ese proceso
+    owner = models.CharField(max_length=255, blank=True, default='')
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.kind} {self.id} ({self.status})"
+
+
+# Almacén de resultados: una fila por dato observado, para consultar el
+# histórico con índices en vez de recorrer los JSON de cada escaneo.
+
+class DnsRecordObservation(models.Model):
+    """Valor de un registro DNS observado en un escaneo.
+
+    `change` compara cada valor con la observación anterior del mismo
+    dominio y tipo; los valores que desaparecen se guardan como `removed`.
+    """
+
+    CHANGE_FIRST = 'first'
+    CHANGE_SAME = 'same'
+    CHANGE_ADDED = 'added'
+    CHANGE_REMOVED = 'removed'
+    CHANGE_CHOICES = [
+        (CHANGE_FIRST, 'Primera observación'),
+        (CHANGE_SAME, 'Sin cambios'),
+        (CHANGE_ADDED, 'Añadido'),
+        (CHANGE_REMOVED, 'Eliminado'),
+    ]
+
+    domain = models.CharField(max_length=253)
+    record_type = models.CharField(max_length=16)
+    value = models.TextField()
+    change = models.CharField(max_length=8, choices=CHANGE_CHOICES, default=CHANGE_FIRST)
+    observed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['domain', 'record_type', 'observed_at'], name='dns_domain_type_observed'),
+            models.Index(fields=['record_type', 'change', 'observed_at'], name='dns_type_change_observed'),
+        ]
+
+    def __str__(self):
+        return f"{self.domain} {self.record_type} {self.value}"
+
+
+class WhoisSnapshot(models.Model):
+    """Datos WHOIS de un dominio en un momento dado."""
+
+    domain = models.CharField(max_length=253)
+    registrar = models.CharField(max_length=255, blank=True, default='')
+    creation_date = models.CharField(max_length=64, blank=True, default='')
+    expiration_date = models.CharField(max_length=64, blank=True, default='')
+    name_servers = models.JSONField(default=list)
+    status = models.JSONField(default=list)
+    observed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['domain', 'observed_at'], name='whois_domain_observed'),
+        ]
+
+    def __str__(self):
+        return f"{self.domain} ({self.observed_at:%Y-%m-%d})"
+
+
+class PortObservation(models.Model):
+    """Puerto de un host observado en un escaneo Nmap."""
+
+    host = models.CharField(max_length=255)
+    port = models.PositiveIntegerField()
+    protocol = models.CharField(max_length=8, default='tcp')
+    state = models.CharField(max_length=16)
+    service = models.CharField(max_length=64, blank=True, default='')
+    version = models.CharField(max_length=255, blank=True, default='')
+    observed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['host', 'port'], name='port_host_port'),
+            models.Index(fields=['port', 'state', 'observed_at'], name='port_port_state_observed'),
+        ]
+
+    def __str__(self):
+        return f"{self.host}:{self.port}/{self.protocol} {self.state}"
+
+
+class HostObservation(models.Model):
+    """Host escaneado con Nmap sin errores, tenga o no puertos abiertos.
+
+    Marca la última observación del host aunque no haya filas en
+    PortObservation: así un escaneo sin puertos abiertos cierra los anteriores.
+    """
+
+    host = models.CharField(max_length=255)
+    observed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['host', 'observed_at'], name='host_host_observed'),
+        ]
+
+    def __str__(self):
+        return f"{self.host} ({self.observed_at:%Y-%m-%d %H:%M})"
+
+
+class DorkUrlObservation(models.Model):
+    """URL devuelta por una búsqueda con dorks."""
+
+    query = models.TextField()
+    url = models.CharField(max_length=2048)
+    title = models.TextField(blank=True, default='')
+    observed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['url'], name='dork_url'),
+            models.Index(fields=['observed_at'], name='dork_observed'),
+        ]
 
-# Create your models here.
+    def __str__(self):
+        return self.url
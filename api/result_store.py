@@ -0,0 +1,254 @@
+# api/result_store.py
+"""Persistencia de los resultados de escaneo y consultas sobre su histórico."""
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from api.models import (
+    DnsRecordObservation, DorkUrlObservation, HostObservation, PortObservation, WhoisSnapshot)
+from core.application import change_detection
+from core.domain.entities import DNSRecord, NmapScanResult
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def normalize_domain(domain: str) -> str:
+    return domain.strip().lower().rstrip('.')
+
+
+def save(writer: Callable[..., Any], *args, **kwargs) -> Any:
+    """Ejecuta un writer sin que un fallo al guardar afecte a la respuesta del escaneo."""
+    if not getattr(settings, 'RESULT_STORE_ENABLED', True):
+        return None
+    try:
+        return writer(*args, **kwargs)
+    except Exception:
+        logger.exception("Error al guardar los resultados del escaneo")
+        return None
+
+
+# --- Escritura ---
+
+def dns_values(records: Iterable[DNSRecord]) -> Dict[str, List[str]]:
+    """Valores por tipo de un escaneo DNS.
+
+    NXDOMAIN y NoAnswer cuentan como "sin registros" de ese tipo; los tipos
+    cuya consulta falló se omiten, para no confundir un timeout con una baja.
+    """
+    current: Dict[str, Dict[str, None]] = {}
+    failed: Set[str] = set()
+    for record in records:
+        values = current.setdefault(record.type.upper(), {})
+        if record.status == 'ok':
+            values[record.value] = None
+        elif record.status == 'error':
+            failed.add(record.type.upper())
+    return {record_type: list(values) for record_type, values in current.items()
+            if record_type not in failed}
+
+
+def record_dns(domain: str, records: Iterable[DNSRecord],
+               observed_at: Optional[datetime] = None) -> int:
+    """Guarda los registros de un escaneo DNS marcando qué cambió desde el anterior."""
+    return record_dns_values(domain, dns_values(records), observed_at)
+
+
+def record_dns_values(domain: str, values_by_type: Mapping[str, List[str]],
+                      observed_at: Optional[datetime] = None) -> int:
+    """Como record_dns, a partir de un diccionario tipo -> valores."""
+    if not values_by_type:
+        return 0
+    domain = normalize_domain(domain)
+    observed_at = observed_at or timezone.now()
+    with transaction.atomic():
+        previous = latest_dns_records(domain, list(values_by_type))
+        rows = []
+        for record_type, values in values_by_type.items():
+            values = list(dict.fromkeys(values))
+            before = previous.get(record_type)
+            for value in values:
+                if before is None:
+                    change = DnsRecordObservation.CHANGE_FIRST
+                elif value in before:
+                    change = DnsRecordObservation.CHANGE_SAME
+                else:
+                    change = DnsRecordObservation.CHANGE_ADDED
+                rows.append(DnsRecordObservation(
+                    domain=domain, record_type=record_type, value=value,
+                    change=change, observed_at=observed_at))
+            for value in sorted((before or set()) - set(values)):
+                rows.append(DnsRecordObservation(
+                    domain=domain, record_type=record_type, value=value,
+                    change=DnsRecordObservation.CHANGE_REMOVED, observed_at=observed_at))
+        DnsRecordObservation.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return len(rows)
+
+
+def _whois_data(info: Any) -> Dict[str, Any]:
+    return asdict(info) if is_dataclass(info) else dict(info or {})
+
+
+def _as_list(value) -> List[str]:
+    if not value:
+        return []
+    return [str(item) for item in value] if isinstance(value, (list, tuple, set)) else [str(value)]
+
+
+def record_whois(domain: str, info: Any, observed_at: Optional[datetime] = None) -> WhoisSnapshot:
+    """Guarda un WhoisInfo (o el diccionario equivalente de ReconBot)."""
+    data = _whois_data(info)
+    return WhoisSnapshot.objects.create(
+        domain=normalize_domain(domain),
+        registrar=str(data.get('registrar') or '')[:255],
+        creation_date=str(data.get('creation_date') or '')[:64],
+        expiration_date=str(data.get('expiration_date') or '')[:64],
+        name_servers=_as_list(data.get('name_servers')),
+        status=_as_list(data.get('status')),
+        observed_at=observed_at or timezone.now(),
+    )
+
+
+def record_ports(results: Iterable[NmapScanResult], observed_at: Optional[datetime] = None) -> int:
+    """Guarda los puertos de uno o varios hosts; los hosts cuyo escaneo falló se ignoran."""
+    observed_at = observed_at or timezone.now()
+    results = [result for result in results if not change_detection.failed(result)]
+    rows = [
+        PortObservation(
+            host=result.target, port=int(port['port']), protocol=port.get('protocol', 'tcp'),
+            state=port.get('state', ''), service=(port.get('service') or '')[:64],
+            version=(port.get('version') or '').strip()[:255], observed_at=observed_at)
+        for result in results for port in result.ports
+        if isinstance(port, dict) and 'port' in port
+    ]
+    with transaction.atomic():
+        HostObservation.objects.bulk_create(
+            [HostObservation(host=result.target, observed_at=observed_at) for result in results],
+            batch_size=BATCH_SIZE)
+        PortObservation.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return len(rows)
+
+
+def record_dork(query: str, results: Iterable[Any], observed_at: Optional[datetime] = None) -> int:
+    """Guarda las URLs de una búsqueda; acepta resultados {"title", "url"} o URLs sueltas."""
+    observed_at = observed_at or timezone.now()
+    rows = []
+    for result in results:
+        if isinstance(result, dict):
+            url, title = result.get('url'), result.get('title') or ''
+        else:
+            url, title = result, ''
+        if url:
+            rows.append(DorkUrlObservation(query=query, url=str(url)[:2048], title=title,
+                                           observed_at=observed_at))
+    DorkUrlObservation.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return len(rows)
+
+
+# --- Consultas ---
+
+def latest_dns_records(domain: str, record_types: Optional[List[str]] = None) -> Dict[str, Set[str]]:
+    """Valores vigentes en la última observación de cada tipo de registro del dominio."""
+    observations = DnsRecordObservation.objects.filter(domain=normalize_domain(domain))
+    if record_types is not None:
+        observations = observations.filter(record_type__in=record_types)
+    latest = list(observations.values('record_type').annotate(last=Max('observed_at')).order_by())
+    if not latest:
+        return {}
+    condition = Q()
+    for row in latest:
+        condition |= Q(record_type=row['record_type'], observed_at=row['last'])
+    snapshot: Dict[str, Set[str]] = {row['record_type']: set() for row in latest}
+    current = observations.filter(condition).exclude(change=DnsRecordObservation.CHANGE_REMOVED)
+    for record_type, value in current.values_list('record_type', 'value'):
+        snapshot[record_type].add(value)
+    return snapshot
+
+
+def hosts_with_open_port(port: int, since: Optional[datetime] = None) -> List[str]:
+    """Hosts en los que se ha visto el puerto abierto (desde `since`, si se indica)."""
+    observations = PortObservation.objects.filter(port=port, state='open')
+    if since is not None:
+        observations = observations.filter(observed_at__gte=since)
+    return list(observations.order_by('host').values_list('host', flat=True).distinct())
+
+
+def domains_with_dns_changes(record_type: str, since: datetime) -> List[str]:
+    """Dominios cuyos registros del tipo indicado cambiaron desde `since`."""
+    observations = DnsRecordObservation.objects.filter(
+        record_type=record_type.upper(),
+        change__in=[DnsRecordObservation.CHANGE_ADDED, DnsRecordObservation.CHANGE_REMOVED],
+        observed_at__gte=since)
+    return list(observations.order_by('domain').values_list('domain', flat=True).distinct())
+
+
+def latest_whois(domain: str) -> Optional[Dict[str, Any]]:
+    snapshot = WhoisSnapshot.objects.filter(
+        domain=normalize_domain(domain)).order_by('-observed_at').first()
+    if snapshot is None:
+        return None
+    return {field: getattr(snapshot, field) for field in change_detection.WHOIS_FIELDS}
+
+
+def latest_open_ports(hosts: Iterable[str]) -> Dict[str, Set[int]]:
+    """Puertos abiertos de cada host en su última observación (vacío si no tenía ninguno)."""
+    hosts = list(hosts)
+    observations = PortObservation.objects.filter(host__in=hosts)
+    # Los escaneos sin puertos sólo dejan un HostObservation; el histórico anterior, sólo puertos
+    latest: Dict[str, datetime] = {}
+    for model in (PortObservation, HostObservation):
+        rows = model.objects.filter(host__in=hosts).values('host').annotate(last=Max('observed_at'))
+        for row in rows.order_by():
+            latest[row['host']] = max(latest.get(row['host'], row['last']), row['last'])
+    if not latest:
+        return {}
+    condition = Q()
+    for host, last in latest.items():
+        condition |= Q(host=host, observed_at=last)
+    ports: Dict[str, Set[int]] = {host: set() for host in latest}
+    for host, port in observations.filter(condition, state='open').values_list('host', 'port'):
+        ports[host].add(port)
+    return ports
+
+
+def known_urls(query: str, urls: Iterable[str]) -> Set[str]:
+    """URLs de la lista que ya había devuelto la misma búsqueda."""
+    return set(DorkUrlObservation.objects.filter(
+        query=query, url__in=list(urls)).values_list('url', flat=True))
+
+
+# --- Cambios respecto a la última observación (escaneos incrementales) ---
+# Deben llamarse antes de guardar el resultado nuevo.
+
+def with_changes(data: Any, changes: Optional[Dict[str, Any]]) -> Any:
+    """Resultado serializado, acompañado de sus cambios en modo incremental."""
+    if changes is None:
+        return data
+    return {'result': data, 'changed': change_detection.has_changes(changes), 'changes': changes}
+
+
+def dns_changes(domain: str, records: Iterable[DNSRecord]) -> Dict[str, Any]:
+    after = dns_values(records)
+    return change_detection.diff_dns(latest_dns_records(domain, list(after)), after)
+
+
+def whois_changes(domain: str, info: Any) -> Dict[str, Any]:
+    return change_detection.diff_whois(latest_whois(domain), _whois_data(info))
+
+
+def port_changes(results: Iterable[NmapScanResult]) -> Dict[str, Any]:
+    after = change_detection.open_ports(results)
+    return change_detection.diff_ports(latest_open_ports(after), after)
+
+
+def dork_changes(query: str, results: Iterable[Any]) -> Dict[str, Any]:
+    urls = [result.get('url') if isinstance(result, dict) else result for result in results]
+    urls = [str(url) for url in urls if url]
+    return change_detection.diff_urls(known_urls(query, urls), urls)
@@ -1,11 +1,13 @@
 # api/serializers.py
 from rest_framework import serializers
 from core.domain.entities import GoogleDorkResult, DNSRecord, WhoisInfo, NmapScanResult
+from api.models import ScanJob
 
 
 class GoogleDorkResultSerializer(serializers.Serializer):
     query = serializers.CharField()
-    results = serializers.ListField(child=serializers.CharField())
+    # Cada resultado es un dict {"title", "url"} (o {"error"}), no un texto
+    results = serializers.ListField(child=serializers.DictField())
 
 
 class DNSRecordSerializer(serializers.Serializer):
@@ -14,6 +16,7 @@ class DNSRecordSerializer(serializers.Serializer):
 
 
 class WhoisInfoSerializer(serializers.Serializer):
+    domain = serializers.CharField(allow_null=True)
     registrar = serializers.CharField()
     creation_date = serializers.CharField()
     expiration_date = serializers.CharField()
@@ -30,7 +33,7 @@ class NmapPortSerializer(serializers.Serializer):
 
 class NmapScanResultSerializer(serializers.Serializer):
     target = serializers.CharField()
-    ports = serializers.ListField(child=serializers.CharField())
+    ports = serializers.ListField(child=serializers.DictField())
     services = serializers.ListField(child=serializers.CharField())
 
 
@@ -42,3 +45,10 @@ class AIAnalysisResponseSerializer(serializers.Serializer):
     classification = serializers.CharField()
     confidence = serializers.FloatField()
     details = serializers.DictField()
+
+
+class ScanJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ScanJob
+        fields = ['id', 'kind', 'status', 'progress', 'params', 'result', 'error',
+                  'created_at', 'started_at', 'finished_at']
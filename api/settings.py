@@ -35,9 +35,12 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'api',
 ]
 
 MIDDLEWARE = [
+    # Primero, para que la latencia incluya al resto de middleware
+    'api.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -65,6 +68,50 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'api.wsgi.application'
+ASGI_APPLICATION = 'api.asgi.application'
+
+# Número de hilos que ejecutan escaneos en segundo plano (ver api/jobs.py)
+SCAN_JOB_WORKERS = int(os.getenv('SCAN_JOB_WORKERS', '4'))
+# Cada proceso renueva cada SCAN_JOB_HEARTBEAT segundos los jobs que ejecuta; los que
+# llevan más de SCAN_JOB_STALE_AFTER sin renovarse se dan por abandonados y se repiten
+SCAN_JOB_HEARTBEAT = float(os.getenv('SCAN_JOB_HEARTBEAT', '30'))
+SCAN_JOB_STALE_AFTER = float(os.getenv('SCAN_JOB_STALE_AFTER', '120'))
+
+# Guardar los resultados de los escaneos en la base de datos (ver api/result_store.py)
+RESULT_STORE_ENABLED = os.getenv('RESULT_STORE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+# Construir y preparar los escáneres al arrancar el servidor (api/wsgi.py, api/asgi.py)
+SCANNER_WARM_UP = os.getenv('SCANNER_WARM_UP', 'true').lower() in ('1', 'true', 'yes')
+
+# /api/bulk-scan/: subpeticiones simultáneas por escáner y máximo de subpeticiones por petición
+BULK_SCAN_CONCURRENCY = {
+    'dns': int(os.getenv('BULK_SCAN_DNS_CONCURRENCY', '50')),
+    'whois': int(os.getenv('BULK_SCAN_WHOIS_CONCURRENCY', '8')),
+    'nmap': int(os.getenv('BULK_SCAN_NMAP_CONCURRENCY', '4')),
+    'dork': int(os.getenv('BULK_SCAN_DORK_CONCURRENCY', '2')),
+}
+BULK_SCAN_MAX_REQUESTS = int(os.getenv('BULK_SCAN_MAX_REQUESTS', '1000'))
+
+# Límites de peticiones por escáner ('N/s', 'N/min', 'N/h' o 'N/día'; vacío = sin límite):
+# 'client' por cliente (IP) y 'total' para todos los clientes. Ver api/throttling.py
+SCAN_RATE_LIMITS = {
+    'nmap': {'client': os.getenv('RATE_LIMIT_NMAP_CLIENT', '10/min'),
+             'total': os.getenv('RATE_LIMIT_NMAP_TOTAL', '60/min')},
+    'dork': {'client': os.getenv('RATE_LIMIT_DORK_CLIENT', '10/min'),
+             'total': os.getenv('RATE_LIMIT_DORK_TOTAL', '30/min')},
+    'whois': {'client': os.getenv('RATE_LIMIT_WHOIS_CLIENT', '60/min'),
+              'total': os.getenv('RATE_LIMIT_WHOIS_TOTAL', '300/min')},
+    'dns': {'client': os.getenv('RATE_LIMIT_DNS_CLIENT', '600/min'),
+            'total': os.getenv('RATE_LIMIT_DNS_TOTAL', '')},
+}
+# Fichero SQLite con los buckets, compartido por todos los workers
+RATE_LIMIT_FILE = os.getenv('RATE_LIMIT_FILE', str(BASE_DIR / 'rate_limits.sqlite3'))
+
+REST_FRAMEWORK = {
+    'DEFAULT_THROTTLE_CLASSES': ['api.throttling.ScanRateThrottle'],
+    # Proxies inversos delante de la API: la IP del cliente se toma de X-Forwarded-For
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES')) if os.getenv('NUM_PROXIES') else None,
+}
 
 
 # Database
@@ -0,0 +1,85 @@
+# api/streaming.py
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Union
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Renderer para respuestas no streaming (p.ej. errores) pedidas como NDJSON."""
+    media_type = NDJSON_MEDIA_TYPE
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        items = data if isinstance(data, list) else [data]
+        return ''.join(json.dumps(item, ensure_ascii=False) + '\n' for item in items).encode(self.charset)
+
+
+class NDJSONStreamMixin:
+    """Permite a una APIView responder en streaming con Accept: application/x-ndjson."""
+    renderer_classes = list(api_settings.DEFAULT_RENDERER_CLASSES) + [NDJSONRenderer]
+
+    def wants_stream(self, request) -> bool:
+        return isinstance(getattr(request, 'accepted_renderer', None), NDJSONRenderer)
+
+    def stream_response(self, items: Iterable[Any]) -> StreamingHttpResponse:
+        lines = _ndjson_lines(items)
+        if isinstance(getattr(self.request, '_request', self.request), ASGIRequest):
+            # Bajo ASGI Django acumula los iteradores síncronos en una lista antes de enviarlos
+            return ndjson_response(iterate_in_thread(lines))
+        return ndjson_response(lines)
+
+
+def _ndjson_lines(items: Iterable[Any]) -> Iterable[str]:
+    iterator = iter(items)
+    try:
+        for item in iterator:
+            yield json.dumps(item, ensure_ascii=False) + '\n'
+    finally:
+        # Cerrar la respuesta cierra también el generador del escáner
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            close()
+
+
+async def iterate_in_thread(iterable: Iterable[Any]) -> AsyncIterator[Any]:
+    """Recorre un iterable bloqueante desde el bucle ASGI, un elemento por salto a un hilo."""
+    iterator = iter(iterable)
+    done = object()
+    next_item = sync_to_async(next, thread_sensitive=False)
+    try:
+        while True:
+            item = await next_item(iterator, done)
+            if item is done:
+                return
+            yield item
+    finally:
+        # Si el cliente corta la conexión se cierra el generador (p.ej. cancela los shards de nmap)
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=False)()
+
+
+def ndjson_response(lines: Union[Iterable[str], AsyncIterable[str]]) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(lines, content_type=NDJSON_MEDIA_TYPE)
+    # Evita que un proxy intermedio acumule la respuesta completa
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def async_stream_response(items: AsyncIterable[Any]) -> StreamingHttpResponse:
+    """Respuesta NDJSON para vistas asíncronas (el iterable se consume desde el bucle ASGI)."""
+    async def lines():
+        async for item in items:
+            yield json.dumps(item, ensure_ascii=False) + '\n'
+    return ndjson_response(lines())
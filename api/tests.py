@@ -1,3 +1,1300 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
+import argparse
+import asyncio
+import contextlib
+import functools
+import importlib.util
+import io
+import itertools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
 
-# Create your tests here.
+import dns.exception
+import dns.message
+import dns.name
+import dns.resolver
+import dns.rrset
+from django.test import (
+    AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings)
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api import encoders, result_store
+from benchmarks import bench_scanners
+from benchmarks.stubs import StubProcess, fake_nmap
+from benchmarks.stubs.dns_server import DnsStubServer
+from benchmarks.stubs.search_server import SearchStubServer
+from benchmarks.stubs.whois_server import WhoisStubServer
+from api.async_views import AsyncScanView, BulkScanRequestSerializer
+from api.jobs import SCAN_PROGRESS, JobQueue, nmap_job_handler, nmap_sweep_job_handler
+from api.models import DnsRecordObservation, ScanJob
+from api.serializers import (
+    DNSRecordSerializer, GoogleDorkResultSerializer, NmapScanResultSerializer, WhoisInfoSerializer)
+from api.streaming import NDJSONStreamMixin, iterate_in_thread
+from api.throttling import ScanRateThrottle
+from api.views import DnsScanView, NmapScanRequestSerializer, NmapScanView, nmap_cost
+from core.application.bulk_scan import BulkScanUseCase, ScanLimiter, ScanRequest, plan_requests
+from core.application.single_flight import SingleFlight
+from core.domain.entities import DNSRecord, GoogleDorkResult, NmapScanResult, WhoisInfo
+from core.infrastructure.adapters.container import ScannerContainer
+from core.infrastructure.adapters.scanner_adapter import create_dns_scan_use_case
+from core.infrastructure.analyzers.url_rules import CompiledRuleSet, RuleRegistry, UrlRule
+from core.infrastructure.analyzers.url_sensitivity import UrlSensitivityAnalyzer
+from core.infrastructure.cache.dns_cache import DnsAnswerCache
+from core.infrastructure.cache.summary_cache import SummaryCache
+from core.infrastructure.llm.chat_client import CachedChatClient, OpenAIChatClient, StubChatClient
+from core.infrastructure.metrics import MetricsRegistry
+from core.infrastructure.rate_limit import RateLimitExceeded, TokenBucket
+from core.infrastructure.scanners.dns_scan import DEFAULT_NEGATIVE_TTL, DnsScannerImpl
+from core.infrastructure.scanners.nmap_scan import NmapScannerImpl, check_targets, count_hosts, expand_targets
+from core.infrastructure.scanners.whois_scan import WhoisScannerImpl
+from core.infrastructure.whois.client import WhoisClient
+from reconbot.pipeline import Stage, StageScheduler
+from reconbot.report_html import render_html_report
+
+
+class StubNmapUseCase:
+    """Use case de Nmap sin red: devuelve el puerto 22 abierto en cada host."""
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.calls = []
+
+    def _result(self, target):
+        return NmapScanResult(target=target, ports=[{"port": 22, "state": "open", "service": "ssh",
+                                                     "version": "OpenSSH 9.6"}], services=["ssh"])
+
+    def execute(self, target, ports=None):
+        self.calls.append(target)
+        if self.error:
+            raise self.error
+        return self._result(target)
+
+    def execute_sweep(self, targets, ports=None, progress=None):
+        self.calls.append(targets)
+        hosts = targets.split(',')
+        for done, _ in enumerate(hosts, 1):
+            if progress is not None:
+                progress(done / len(hosts))
+        return [self._result(host) for host in hosts]
+
+
+@override_settings(RESULT_STORE_ENABLED=False)
+class JobQueueTests(TransactionTestCase):
+    def make_queue(self, use_case, **kwargs):
+        queue = JobQueue(1, {'nmap': nmap_job_handler(lambda: use_case),
+                             'nmap_sweep': nmap_sweep_job_handler(lambda: use_case)},
+                         heartbeat_interval=3600, **kwargs)
+        self.addCleanup(queue.shutdown)
+        return queue
+
+    def test_submit_runs_job(self):
+        use_case = StubNmapUseCase()
+        queue = self.make_queue(use_case)
+        job = queue.submit('nmap', {'target': '10.0.0.1', 'ports': '22'})
+        queue.shutdown()
+        job.refresh_from_db()
+        self.assertEqual(job.status, ScanJob.STATUS_DONE)
+        self.assertEqual(job.progress, 1.0)
+        self.assertEqual(job.result['ports'][0]['port'], 22)
+        self.assertEqual(job.owner, queue.owner)
+        self.assertEqual(use_case.calls, ['10.0.0.1'])
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            self.make_queue(StubNmapUseCase()).submit('dns', {'target': 'example.com'})
+
+    def test_failed_job(self):
+        queue = self.make_queue(StubNmapUseCase(error=RuntimeError("nmap no encontrado")))
+        job = queue.submit('nmap', {'target': '10.0.0.1'})
+        queue.shutdown()
+        job.refresh_from_db()
+        self.assertEqual(job.status, ScanJob.STATUS_FAILED)
+        self.assertEqual(job.error, "nmap no encontrado")
+        self.assertIsNotNone(job.finished_at)
+
+    def test_progress_is_reported(self):
+        progress = []
+        handler = nmap_sweep_job_handler(lambda: StubNmapUseCase())
+        handler({'target': '10.0.0.1,10.0.0.2'}, progress.append)
+        self.assertEqual(progress, [SCAN_PROGRESS / 2, SCAN_PROGRESS])
+        progress.clear()
+        nmap_job_handler(lambda: StubNmapUseCase())({'target': '10.0.0.1'}, progress.append)
+        self.assertEqual(progress, [SCAN_PROGRESS])
+
+    def test_recover_reruns_abandoned_jobs_only(self):
+        long_ago = timezone.now() - timedelta(minutes=10)
+        abandoned = ScanJob.objects.create(kind='nmap', params={'target': '10.0.0.1'},
+                                           status=ScanJob.STATUS_RUNNING, owner='muerto:1',
+                                           started_at=long_ago, heartbeat_at=long_ago)
+        live = ScanJob.objects.create(kind='nmap', params={'target': '10.0.0.2'},
+                                      status=ScanJob.STATUS_RUNNING, owner='vivo:2',
+                                      started_at=long_ago, heartbeat_at=timezone.now())
+        orphan = ScanJob.objects.create(kind='nmap', params={'target': '10.0.0.3'})
+        ScanJob.objects.filter(pk=orphan.pk).update(created_at=long_ago)
+        recent = ScanJob.objects.create(kind='nmap', params={'target': '10.0.0.4'})
+
+        use_case = StubNmapUseCase()
+        queue = self.make_queue(use_case, stale_after=60)
+        self.assertCountEqual(queue.recover(), [abandoned.pk, orphan.pk])
+        queue.shutdown()
+
+        self.assertCountEqual(use_case.calls, ['10.0.0.1', '10.0.0.3'])
+        for job in (abandoned, orphan):
+            job.refresh_from_db()
+            self.assertEqual(job.status, ScanJob.STATUS_DONE)
+        live.refresh_from_db()
+        self.assertEqual((live.status, live.owner), (ScanJob.STATUS_RUNNING, 'vivo:2'))
+        recent.refresh_from_db()
+        self.assertEqual(recent.status, ScanJob.STATUS_PENDING)
+
+    def test_recover_does_not_enqueue_twice(self):
+        queue = self.make_queue(StubNmapUseCase(), stale_after=0)
+        queue._queued.add(ScanJob.objects.create(kind='nmap', params={'target': '10.0.0.1'}).pk)
+        self.assertEqual(queue.recover(), [])
+
+    def test_heartbeat_renews_own_jobs(self):
+        queue = self.make_queue(StubNmapUseCase())
+        long_ago = timezone.now() - timedelta(minutes=10)
+        own = ScanJob.objects.create(kind='nmap', status=ScanJob.STATUS_RUNNING, owner=queue.owner,
+                                     heartbeat_at=long_ago)
+        other = ScanJob.objects.create(kind='nmap', status=ScanJob.STATUS_RUNNING, owner='otro:1',
+                                       heartbeat_at=long_ago)
+        self.assertEqual(queue.heartbeat(), 1)
+        own.refresh_from_db()
+        other.refresh_from_db()
+        self.assertGreater(own.heartbeat_at, long_ago)
+        self.assertEqual(other.heartbeat_at, long_ago)
+
+
+class NmapTargetTests(SimpleTestCase):
+    def test_count_hosts(self):
+        self.assertEqual(count_hosts('10.0.0.0/24'), 256)
+        self.assertEqual(count_hosts('fd00::/64'), 2 ** 64)
+        self.assertEqual(count_hosts('10.0.0.1-20'), 20)
+        self.assertEqual(count_hosts('10.0.*.1'), 256)
+        self.assertEqual(count_hosts('example.com/28'), 16)
+        self.assertEqual(count_hosts('example.com'), 1)
+
+    def test_check_targets(self):
+        self.assertEqual(check_targets('10.0.0.0/30, example.com', max_hosts=5), 5)
+        with self.assertRaises(ValueError):
+            check_targets('10.0.0.0/8', max_hosts=4096)
+        with self.assertRaises(ValueError):
+            check_targets('10.0.0.1 -iL/etc/passwd', max_hosts=None)
+
+    def test_check_targets_rejects_quoted_options(self):
+        # shlex.split (python-nmap) quitaría las comillas y nmap recibiría la opción
+        for target in ('127.0.0.1 "--script=http-title"', "127.0.0.1 '-oN/tmp/x'", '127.0.0.1 \\-sV',
+                       'example.com;id'):
+            with self.subTest(target=target), self.assertRaises(ValueError):
+                check_targets(target, max_hosts=None)
+        self.assertFalse(NmapScanRequestSerializer(data={'target': '127.0.0.1 "--script=http-title"'}).is_valid())
+        self.assertEqual(check_targets('fd00::1, 10.0.0.*, host_1.example.com', max_hosts=None), 258)
+
+    def test_expand_targets_checks_before_iterating(self):
+        self.assertEqual(expand_targets('10.0.0.0/30', max_hosts=4), ['10.0.0.1', '10.0.0.2'])
+        with self.assertRaises(ValueError):
+            expand_targets('fd00::/64', max_hosts=4096)
+
+    def test_scan_rejects_option_like_target(self):
+        result = NmapScannerImpl().scan('--script=evil')
+        self.assertIn('error', result.ports[0])
+
+    def test_serializers_reject_oversized_targets(self):
+        serializer = NmapScanRequestSerializer(data={'target': '10.0.0.0/8'})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('target', serializer.errors)
+        self.assertFalse(NmapScanRequestSerializer(data={'target': '-oN/tmp/x'}).is_valid())
+        self.assertTrue(NmapScanRequestSerializer(data={'target': '10.0.0.0/24'}).is_valid())
+        serializer = BulkScanRequestSerializer(data={'targets': ['example.com', '10.0.0.0/8'], 'scans': ['nmap']})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('targets', serializer.errors)
+        # Sin escaneo nmap el CIDR no se valida como objetivo de nmap
+        self.assertTrue(BulkScanRequestSerializer(
+            data={'targets': ['10.0.0.0/8'], 'scans': ['dns']}).is_valid())
+
+
+class CompiledRuleSetTests(SimpleTestCase):
+    def test_patterns_matching_at_the_same_position_are_all_reported(self):
+        rules = CompiledRuleSet([UrlRule(id='adm', section='admin', confidence=0.5, patterns=['adm']),
+                                 UrlRule(id='admin', section='admin', confidence=0.9, patterns=['admin']),
+                                 UrlRule(id='panel', section='admin', confidence=0.9, patterns=[r'admin/\w+'])],
+                                {})
+        self.assertEqual(rules.match('https://example.com/admin/panel'), {0, 1, 2})
+        self.assertEqual(rules.match('https://example.com/adm'), {0})
+        self.assertEqual(rules.match('https://example.com/'), set())
+
+    def test_overlapping_globs(self):
+        rules = CompiledRuleSet([UrlRule(id='a', section='s', confidence=0.5, globs=['/admin*']),
+                                 UrlRule(id='b', section='s', confidence=0.5, globs=['/admin/*.php'])], {})
+        self.assertEqual(rules.match('https://example.com/admin/index.php'), {0, 1})
+
+
+class RuleRegistryTests(SimpleTestCase):
+    def test_missing_file_falls_back_to_default_rules(self):
+        default_rules = RuleRegistry().current()
+        with self.assertLogs('core.infrastructure.analyzers.url_rules', 'ERROR'):
+            registry = RuleRegistry('/no/existe/url_rules.json')
+        self.assertEqual(len(registry.current().rules), len(default_rules.rules))
+
+    def test_file_created_later_is_loaded(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'url_rules.json')
+            with self.assertLogs('core.infrastructure.analyzers.url_rules', 'ERROR'):
+                registry = RuleRegistry(path, check_interval=0)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'sections': {}}, f)
+            self.assertEqual(len(registry.current().rules), 0)
+
+
+class FailingOpenAI:
+    """Imita openai.chat.completions.create fallando siempre."""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = self
+        self.completions = self
+
+    def create(self, **kwargs):
+        self.calls += 1
+        raise RuntimeError("rate limit")
+
+
+class ChatClientTests(SimpleTestCase):
+    MESSAGES = [{"role": "user", "content": "Resume los hallazgos"}]
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache_file = os.path.join(directory.name, 'summaries.sqlite3')
+
+    def test_without_retries_the_error_is_raised(self):
+        openai = FailingOpenAI()
+        sleeps = []
+        with self.assertRaises(RuntimeError):
+            OpenAIChatClient(openai, retries=0, sleep=sleeps.append).complete(self.MESSAGES, 'gpt-4')
+        self.assertEqual((openai.calls, sleeps), (1, []))
+
+    def test_retries_then_raises(self):
+        openai = FailingOpenAI()
+        sleeps = []
+        with self.assertRaises(RuntimeError), contextlib.redirect_stdout(io.StringIO()):
+            OpenAIChatClient(openai, retries=3, sleep=sleeps.append).complete(self.MESSAGES, 'gpt-4')
+        self.assertEqual((openai.calls, len(sleeps)), (3, 2))
+
+    def test_cached_client_calls_model_once(self):
+        stub = StubChatClient(lambda messages: messages[-1]["content"].upper())
+        cache = SummaryCache(self.cache_file)
+        client = CachedChatClient(stub, cache)
+        self.assertEqual(client.complete(self.MESSAGES, 'gpt-4', temperature=0), "RESUME LOS HALLAZGOS")
+        self.assertEqual(client.complete(self.MESSAGES, 'gpt-4', temperature=0), "RESUME LOS HALLAZGOS")
+        self.assertEqual(len(stub.calls), 1)
+        # Otro modelo u otros parámetros son otra entrada
+        client.complete(self.MESSAGES, 'gpt-4', temperature=0.5)
+        self.assertEqual(len(stub.calls), 2)
+        self.assertEqual(cache.stats()["entries"], 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_cached_client_without_cache(self):
+        stub = StubChatClient()
+        client = CachedChatClient(stub, None)
+        client.complete(self.MESSAGES, 'gpt-4')
+        client.complete(self.MESSAGES, 'gpt-4')
+        self.assertEqual(len(stub.calls), 2)
+
+    def test_summary_cache_evicts_least_recently_used(self):
+        cache = SummaryCache(self.cache_file, max_bytes=10)
+        with mock.patch('core.infrastructure.cache.summary_cache.time.time', side_effect=itertools.count()):
+            cache.set('a', 'aaaa')
+            cache.set('b', 'bbbb')
+            self.assertEqual(cache.get('a'), 'aaaa')
+            cache.set('c', 'cccc')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c')), ('aaaa', 'cccc'))
+        self.assertEqual(cache.stats()["bytes"], 8)
+
+
+class NDJSONStreamTests(SimpleTestCase):
+    def items(self, produced, closed):
+        try:
+            for index in range(3):
+                produced.append((index, threading.current_thread()))
+                yield {'index': index}
+        finally:
+            closed.append(True)
+
+    async def test_asgi_stream_is_not_buffered(self):
+        produced, closed = [], []
+        view = NDJSONStreamMixin()
+        view.request = AsyncRequestFactory().post('/api/dns-scan/')
+        response = view.stream_response(self.items(produced, closed))
+        self.assertTrue(response.is_async)
+        lines = aiter(response.streaming_content)
+        self.assertEqual(await anext(lines), b'{"index": 0}\n')
+        # Sólo se ha generado el primer elemento, y fuera del hilo del bucle
+        self.assertEqual(len(produced), 1)
+        self.assertIsNot(produced[0][1], threading.current_thread())
+        self.assertEqual(closed, [])
+
+    def test_wsgi_stream_stays_synchronous(self):
+        view = NDJSONStreamMixin()
+        view.request = RequestFactory().post('/api/dns-scan/')
+        response = view.stream_response(self.items([], []))
+        self.assertFalse(response.is_async)
+        self.assertEqual(b''.join(response.streaming_content).count(b'\n'), 3)
+
+    async def test_iterate_in_thread(self):
+        self.assertEqual([item async for item in iterate_in_thread(iter([1, 2, 3]))], [1, 2, 3])
+        # Abandonar el iterador asíncrono cierra el generador síncrono
+        closed = []
+        items = iterate_in_thread(self.items([], closed))
+        self.assertEqual(await anext(items), {'index': 0})
+        await items.aclose()
+        self.assertEqual(closed, [True])
+
+
+class AsyncScanViewTests(SimpleTestCase):
+    def test_subclasses_must_implement_scan(self):
+        class IncompleteView(AsyncScanView):
+            throttle_scope = 'dns'
+
+        with self.assertRaises(TypeError):
+            IncompleteView()
+
+
+class WhoisRateLimitTests(SimpleTestCase):
+    def test_bucket_wait_is_bounded(self):
+        bucket = TokenBucket(rate=0.01, capacity=1)
+        bucket.acquire(timeout=0)
+        with self.assertRaises(RateLimitExceeded) as raised:
+            bucket.acquire(timeout=1)
+        self.assertGreater(raised.exception.retry_after, 1)
+
+    def test_client_gives_up_instead_of_sleeping(self):
+        queries = []
+        client = WhoisClient(tld_rate=0.01, tld_burst=1, max_wait=0.1,
+                             query=lambda domain: queries.append(domain) or {"registrar": "Example"})
+        self.assertEqual(client.lookup('example.com')["registrar"], "Example")
+        with self.assertRaises(RateLimitExceeded):
+            client.lookup('example2.com')
+        # Otro TLD tiene su propio bucket
+        client.lookup('example.org')
+        self.assertEqual(queries, ['example.com', 'example.org'])
+        # El escáner lo devuelve como entidad de error
+        info = WhoisScannerImpl(client).scan('example3.com')
+        self.assertEqual(info.registrar, "Error")
+        self.assertIn("WHOIS", info.creation_date)
+
+
+NMAP_LIMITS = {'nmap': {'client': '10/min', 'total': ''}}
+
+
+class NmapThrottleCostTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(SCAN_RATE_LIMITS=NMAP_LIMITS,
+                                     RATE_LIMIT_FILE=os.path.join(directory.name, 'rate_limits.sqlite3'))
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def allow(self, target):
+        request = Request(APIRequestFactory().post('/api/nmap-scan/', {'target': target}, format='json'),
+                          parsers=[JSONParser()])
+        return ScanRateThrottle().allow_request(request, NmapScanView())
+
+    def test_cost_is_one_token_per_shard(self):
+        self.assertEqual(nmap_cost('10.0.0.1'), 1)
+        self.assertEqual(nmap_cost('10.0.0.0/26'), 1)
+        self.assertEqual(nmap_cost('10.0.0.0/24'), 4)
+        self.assertEqual(nmap_cost('-oN/tmp/x'), 1)
+        # 16 shards: se cobra como mucho la ráfaga
+        self.assertEqual(nmap_cost('10.0.0.0/22'), 10)
+
+    def test_sweep_consumes_its_shards(self):
+        self.assertTrue(self.allow('10.0.0.0/24'))
+        self.assertTrue(self.allow('10.0.0.0/24'))
+        # Quedan 2 tokens de 10: otro /24 (4 shards) no cabe, un host sí
+        self.assertFalse(self.allow('10.0.0.0/24'))
+        self.assertTrue(self.allow('10.0.0.1'))
+
+    def test_sweep_larger_than_burst_is_accepted(self):
+        for background in (False, True):
+            self.assertTrue(NmapScanRequestSerializer(
+                data={'target': '10.0.0.0/22', 'background': background}).is_valid())
+        # Agota el presupuesto del cliente: la siguiente petición espera
+        self.assertTrue(self.allow('10.0.0.0/22'))
+        self.assertFalse(self.allow('10.0.0.1'))
+
+    def test_bulk_rejects_more_shards_than_burst(self):
+        # Dos /24 son 8 shards; tres superan la ráfaga de 10
+        response = self.client.post('/api/bulk-scan/', {
+            'targets': ['10.0.0.0/24', '10.0.1.0/24', '10.0.2.0/24'], 'scans': ['nmap']},
+            content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('(12)', response.json()['detail'])
+
+
+def nmap_result(target, *ports):
+    return NmapScanResult(target=target, services=[],
+                          ports=[{"port": port, "state": "open", "service": "", "version": ""} for port in ports])
+
+
+class PortChangesTests(TestCase):
+    def setUp(self):
+        self.first_scan = timezone.now() - timedelta(hours=1)
+        result_store.record_ports([nmap_result('10.0.0.1', 22, 80)], observed_at=self.first_scan)
+
+    def test_failed_scan_does_not_close_ports(self):
+        error = NmapScanResult(target='10.0.0.1', ports=[{"error": "nmap no encontrado"}], services=[])
+        for _ in range(2):
+            self.assertEqual(result_store.port_changes([error]), {})
+            result_store.record_ports([error])
+        self.assertEqual(result_store.latest_open_ports(['10.0.0.1']), {'10.0.0.1': {22, 80}})
+
+    def test_scan_without_open_ports_moves_the_baseline(self):
+        empty = nmap_result('10.0.0.1')
+        self.assertEqual(result_store.port_changes([empty]),
+                         {'closed': [{'host': '10.0.0.1', 'port': 22}, {'host': '10.0.0.1', 'port': 80}]})
+        result_store.record_ports([empty])
+        # El cierre se informa una sola vez
+        self.assertEqual(result_store.latest_open_ports(['10.0.0.1']), {'10.0.0.1': set()})
+        self.assertEqual(result_store.port_changes([empty]), {})
+        self.assertEqual(result_store.port_changes([nmap_result('10.0.0.1', 443)]),
+                         {'opened': [{'host': '10.0.0.1', 'port': 443}]})
+
+
+class BulkScanTests(SimpleTestCase):
+    def test_plan_deduplicates_targets_and_scans(self):
+        self.assertEqual(plan_requests(['Example.com.', 'example.com', ' ', 'example.org'], ['dns', 'dns', 'whois']),
+                         [ScanRequest('dns', 'example.com'), ScanRequest('whois', 'example.com'),
+                          ScanRequest('dns', 'example.org'), ScanRequest('whois', 'example.org')])
+
+    async def test_identical_subrequests_run_once(self):
+        calls = []
+
+        async def dns(target):
+            calls.append(target)
+            return [target]
+
+        use_case = BulkScanUseCase({'dns': dns}, ScanLimiter({'dns': 5}))
+        results = await use_case.execute([ScanRequest('dns', 'a.com'), ScanRequest('dns', 'a.com'),
+                                          ScanRequest('dns', 'b.com')])
+        self.assertEqual(results, {'a.com': {'dns': ['a.com']}, 'b.com': {'dns': ['b.com']}})
+        self.assertEqual(sorted(calls), ['a.com', 'b.com'])
+
+    @override_settings(BULK_SCAN_MAX_REQUESTS=4)
+    def test_request_count_limit(self):
+        data = {'targets': ['a.com', 'b.com'], 'scans': ['dns', 'whois']}
+        self.assertTrue(BulkScanRequestSerializer(data=data).is_valid())
+        data['targets'].append('c.com')
+        serializer = BulkScanRequestSerializer(data=data)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('6', str(serializer.errors))
+
+    async def test_concurrency_cap_is_shared_by_requests(self):
+        running, peak = 0, 0
+
+        async def nmap(target):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {}
+
+        limiter = ScanLimiter({'nmap': 2})
+        requests = [[ScanRequest('nmap', f'10.0.{batch}.{host}') for host in range(5)] for batch in range(3)]
+        # Tres peticiones en bloque a la vez: el límite es del proceso, no de cada petición
+        await asyncio.gather(*(BulkScanUseCase({'nmap': nmap}, limiter).execute(batch) for batch in requests))
+        self.assertEqual(peak, 2)
+
+
+def soa_response(domain, minimum):
+    response = dns.message.make_response(dns.message.make_query(domain, 'SOA'))
+    response.authority.append(dns.rrset.from_text(
+        domain, 3600, 'IN', 'SOA', f'ns1.{domain} admin.{domain} 1 7200 900 1209600 {minimum}'))
+    return response
+
+
+class FakeAnswer(list):
+    def __init__(self, domain, record_type, values, ttl):
+        super().__init__(values)
+        self.rrset = dns.rrset.from_text_list(domain, ttl, 'IN', record_type, values)
+
+
+class FakeResolver:
+    """Resolver asíncrono sin red: responde con `answers` y cuenta las consultas."""
+
+    nameservers = ['127.0.0.1']
+    port = 53
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.queries = []
+
+    async def resolve(self, domain, record_type, lifetime=None):
+        self.queries.append((domain, record_type))
+        answer = self.answers[(domain, record_type)]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+class DnsAnswerCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.cache = DnsAnswerCache(clock=lambda: self.now)
+
+    def scanner(self, answers):
+        self.resolver = FakeResolver(answers)
+        return DnsScannerImpl(cache=self.cache, resolver=self.resolver)
+
+    async def test_hit_skips_resolver(self):
+        scanner = self.scanner({('example.com', 'A'): FakeAnswer('example.com.', 'A', ['192.0.2.1'], 300)})
+        first = await scanner.scan_async('example.com', 'A')
+        second = await scanner.scan_async('Example.com.', 'A')
+        self.assertEqual(first, second)
+        self.assertEqual([record.value for record in second], ['192.0.2.1'])
+        self.assertEqual(self.resolver.queries, [('example.com', 'A')])
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    async def test_entry_expires_with_ttl(self):
+        scanner = self.scanner({('example.com', 'A'): FakeAnswer('example.com.', 'A', ['192.0.2.1'], 300)})
+        await scanner.scan_async('example.com', 'A')
+        self.now = 299.0
+        await scanner.scan_async('example.com', 'A')
+        self.assertEqual(len(self.resolver.queries), 1)
+        self.now = 300.0
+        await scanner.scan_async('example.com', 'A')
+        self.assertEqual(len(self.resolver.queries), 2)
+
+    async def test_nxdomain_is_cached_with_soa_minimum(self):
+        name = dns.name.from_text('missing.example.com')
+        error = dns.resolver.NXDOMAIN(qnames=[name], responses={name: soa_response('example.com.', 30)})
+        scanner = self.scanner({('missing.example.com', 'A'): error})
+        records = await scanner.scan_async('missing.example.com', 'A')
+        self.assertEqual(records[0].status, 'nxdomain')
+        self.now = 29.0
+        self.assertEqual(await scanner.scan_async('missing.example.com', 'A'), records)
+        self.assertEqual(len(self.resolver.queries), 1)
+        self.now = 30.0
+        await scanner.scan_async('missing.example.com', 'A')
+        self.assertEqual(len(self.resolver.queries), 2)
+
+    async def test_no_answer_is_cached(self):
+        error = dns.resolver.NoAnswer(response=soa_response('example.com.', 120))
+        scanner = self.scanner({('example.com', 'MX'): error})
+        records = await scanner.scan_async('example.com', 'MX')
+        self.assertEqual(records[0].status, 'no_answer')
+        self.now = 119.0
+        await scanner.scan_async('example.com', 'MX')
+        self.assertEqual(len(self.resolver.queries), 1)
+
+    async def test_negative_answer_without_soa_uses_default_ttl(self):
+        scanner = self.scanner({('example.com', 'TXT'): dns.resolver.NoAnswer()})
+        await scanner.scan_async('example.com', 'TXT')
+        self.now = DEFAULT_NEGATIVE_TTL - 1
+        await scanner.scan_async('example.com', 'TXT')
+        self.assertEqual(len(self.resolver.queries), 1)
+
+    async def test_errors_are_not_cached(self):
+        scanner = self.scanner({('example.com', 'A'): dns.exception.Timeout()})
+        records = await scanner.scan_async('example.com', 'A')
+        self.assertEqual(records[0].status, 'error')
+        await scanner.scan_async('example.com', 'A')
+        self.assertEqual(len(self.resolver.queries), 2)
+
+
+class SingleFlightTests(SimpleTestCase):
+    def test_concurrent_calls_run_once(self):
+        flight = SingleFlight()
+        calls = []
+        started, release = threading.Event(), threading.Event()
+
+        def fn():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'ok'
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do('key', fn)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(flight.do('key', fn))) for _ in range(4)]
+        for thread in followers:
+            thread.start()
+        while flight.coalesced < 4:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+        self.assertEqual(results, ['ok'] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_every_caller_gets_the_error(self):
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def fn():
+            started.set()
+            release.wait(5)
+            raise ValueError('fallo')
+
+        errors = []
+
+        def call():
+            try:
+                flight.do('key', fn)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call)]
+        threads[0].start()
+        started.wait(5)
+        threads += [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads[1:]:
+            thread.start()
+        while flight.coalesced < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(len(errors), 4)
+        self.assertTrue(all(error is errors[0] for error in errors))
+
+    async def test_async_concurrent_calls_run_once(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'ok'
+
+        results = await asyncio.gather(*(flight.do_async('key', fn) for _ in range(5)))
+        self.assertEqual(results, ['ok'] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.coalesced, 4)
+        self.assertEqual(flight.in_flight(), 0)
+
+    async def test_async_every_caller_gets_the_error(self):
+        flight = SingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            raise ValueError('fallo')
+
+        results = await asyncio.gather(*(flight.do_async('key', fn) for _ in range(3)), return_exceptions=True)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertTrue(all(result is results[0] for result in results))
+
+    async def test_async_cancelling_one_waiter_keeps_the_others(self):
+        flight = SingleFlight()
+        calls = []
+        release = asyncio.Event()
+
+        async def fn():
+            calls.append(1)
+            await release.wait()
+            return 'ok'
+
+        waiters = [asyncio.ensure_future(flight.do_async('key', fn)) for _ in range(3)]
+        await asyncio.sleep(0)
+        # Se cancela quien inició la llamada: los demás deben seguir recibiendo el resultado
+        waiters[0].cancel()
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        self.assertIsInstance(results[0], asyncio.CancelledError)
+        self.assertEqual(results[1:], ['ok', 'ok'])
+        self.assertEqual(len(calls), 1)
+
+    async def test_async_call_is_cancelled_when_nobody_waits(self):
+        flight = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def fn():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.ensure_future(flight.do_async('key', fn))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        self.assertEqual(flight.in_flight(), 0)
+
+
+class EncoderEquivalenceTests(SimpleTestCase):
+    """Los encoders deben producir el mismo JSON que los serializers de DRF."""
+
+    def assertSameJson(self, encoder, serializer_class, instances):
+        renderer = JSONRenderer()
+        for instance in instances:
+            with self.subTest(instance=instance):
+                self.assertEqual(renderer.render(encoder.encode(instance)),
+                                 renderer.render(serializer_class(instance).data))
+        self.assertEqual(renderer.render(encoder.encode_many(instances)),
+                         renderer.render(serializer_class(instances, many=True).data))
+
+    def test_dork_result(self):
+        self.assertSameJson(encoders.dork_result, GoogleDorkResultSerializer, [
+            GoogleDorkResult(query='site:example.com', results=[
+                {'title': 'Inicio', 'url': 'https://example.com/'}, {'title': None, 'url': 'https://example.com/a'}]),
+            GoogleDorkResult(query='site:example.com', results=[{'error': 'Límite de peticiones'}]),
+            GoogleDorkResult(query='', results=[]),
+        ])
+
+    def test_dns_record(self):
+        self.assertSameJson(encoders.dns_record, DNSRecordSerializer, [
+            DNSRecord(type='A', value='192.0.2.1'),
+            DNSRecord(type='MX', value='Dominio no encontrado: example.invalid', status='nxdomain'),
+            DNSRecord(type='TXT', value='Error al realizar la consulta DNS: timeout', status='error'),
+        ])
+
+    def test_whois_info(self):
+        self.assertSameJson(encoders.whois_info, WhoisInfoSerializer, [
+            WhoisInfo(domain='example.com', registrar='Registrar', creation_date='1995-08-14 04:00:00',
+                      expiration_date='2030-08-13 04:00:00', name_servers=['A.IANA-SERVERS.NET', None],
+                      status=['clientTransferProhibited']),
+            WhoisInfo(domain='example.com', registrar='Error', creation_date=None, expiration_date=None),
+            WhoisInfo(),
+        ])
+
+    def test_nmap_result(self):
+        self.assertSameJson(encoders.nmap_result, NmapScanResultSerializer, [
+            NmapScanResult(target='192.0.2.1', ports=[
+                {'port': 22, 'protocol': 'tcp', 'state': 'open', 'service': 'ssh', 'version': 'OpenSSH 9.6'},
+                {'port': 80, 'state': 'closed', 'service': None, 'version': None}], services=['ssh', None]),
+            NmapScanResult(target='192.0.2.2', ports=[{'error': 'Host caído'}]),
+            NmapScanResult(target='192.0.2.3', ports=[]),
+        ])
+
+    def test_none_instance(self):
+        self.assertIsNone(encoders.whois_info.encode(None))
+
+
+class MetricsTests(SimpleTestCase):
+    def test_render_prometheus_text_format(self):
+        metrics = MetricsRegistry()
+        metrics.counter('scans_total', 'Escaneos "realizados"\ncon \\ barra', ('scanner',)).inc(scanner='dns')
+        histogram = metrics.histogram('scan_seconds', 'Duración', ('scanner',), buckets=(0.1, 1.0))
+        histogram.observe(0.05, scanner='nmap "rápido"\n\\')
+        histogram.observe(0.5, scanner='nmap "rápido"\n\\')
+        histogram.observe(3.0, scanner='nmap "rápido"\n\\')
+        labels = 'scanner="nmap \\"rápido\\"\\n\\\\"'
+        self.assertEqual(metrics.render().splitlines(), [
+            '# HELP scan_seconds Duración',
+            '# TYPE scan_seconds histogram',
+            f'scan_seconds_bucket{{{labels},le="0.1"}} 1',
+            f'scan_seconds_bucket{{{labels},le="1"}} 2',
+            f'scan_seconds_bucket{{{labels},le="+Inf"}} 3',
+            f'scan_seconds_sum{{{labels}}} 3.55',
+            f'scan_seconds_count{{{labels}}} 3',
+            '# HELP scans_total Escaneos \\"realizados\\"\\ncon \\\\ barra',
+            '# TYPE scans_total counter',
+            'scans_total{scanner="dns"} 1',
+        ])
+
+    def test_collector_samples_are_described_once(self):
+        metrics = MetricsRegistry()
+        metrics.register_collector(lambda: [
+            ('cache_entries', 'gauge', 'Entradas en caché', {'cache': 'dns'}, 3),
+            ('cache_entries', 'gauge', 'Entradas en caché', {'cache': 'whois'}, 1),
+        ])
+        metrics.register_collector(lambda: 1 / 0)
+        self.assertEqual(metrics.render().splitlines(), [
+            '# HELP cache_entries Entradas en caché',
+            '# TYPE cache_entries gauge',
+            'cache_entries{cache="dns"} 3',
+            'cache_entries{cache="whois"} 1',
+        ])
+
+    def test_metrics_endpoint(self):
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertIn('# TYPE ', response.content.decode())
+
+
+class StageSchedulerTests(SimpleTestCase):
+    def run_stages(self, *stages, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return StageScheduler(list(stages), **kwargs).run()
+
+    def test_independent_stages_run_in_parallel(self):
+        # Si se ejecutaran una tras otra, la barrera no se alcanzaría nunca
+        barrier = threading.Barrier(2, timeout=5)
+        order = []
+        timings = self.run_stages(
+            Stage('dns', barrier.wait), Stage('whois', barrier.wait),
+            Stage('report', lambda: order.append('report'), depends_on=('dns', 'whois')))
+        self.assertEqual(timings['dns']['status'], 'ok')
+        self.assertEqual(timings['whois']['status'], 'ok')
+        self.assertEqual(order, ['report'])
+        self.assertGreaterEqual(timings['report']['start'], max(timings['dns']['end'], timings['whois']['end']))
+
+    def test_skip_if(self):
+        calls = []
+        timings = self.run_stages(
+            Stage('dns', lambda: calls.append('dns')),
+            Stage('nmap', lambda: calls.append('nmap'), depends_on=('dns',), skip_if=lambda: 'dns' in calls),
+            Stage('report', lambda: calls.append('report'), depends_on=('nmap',)))
+        self.assertEqual(calls, ['dns', 'report'])
+        self.assertEqual(timings['nmap']['status'], 'skipped')
+
+    def test_failing_stage_lets_dependents_run(self):
+        calls = []
+
+        def fail():
+            raise RuntimeError('sin red')
+
+        timings = self.run_stages(Stage('dns', fail),
+                                  Stage('report', lambda: calls.append('report'), depends_on=('dns',)))
+        self.assertEqual(timings['dns']['status'], 'error: sin red')
+        self.assertEqual(timings['report']['status'], 'ok')
+        self.assertEqual(calls, ['report'])
+
+    def test_rejects_missing_dependency(self):
+        with self.assertRaisesMessage(ValueError, "'whois'"):
+            StageScheduler([Stage('report', lambda: None, depends_on=('whois',))])
+
+    def test_rejects_cycles(self):
+        with self.assertRaisesMessage(ValueError, 'circulares'):
+            StageScheduler([Stage('a', lambda: None, depends_on=('c',)),
+                            Stage('b', lambda: None, depends_on=('a',)),
+                            Stage('c', lambda: None, depends_on=('b',)),
+                            Stage('d', lambda: None)])
+
+
+class HtmlReportTests(SimpleTestCase):
+    def test_values_are_escaped(self):
+        script = '<script>alert(1)</script>'
+        results = {
+            'dns_records': {'TXT': [script]},
+            'whois_info': {'registrar': script, 'name_servers': [script]},
+            'dork_results': {f'site:example.com {script}': [f'https://example.com/?q={script}', 'javascript:alert(1)']},
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            output_file = render_html_report(os.path.join(directory, 'report.html'), script, results,
+                                             f'Resumen\n{script}', timestamp='2024-01-01 00:00:00')
+            with open(output_file, encoding='utf-8') as f:
+                html = f.read()
+        self.assertNotIn('<script>', html)
+        self.assertEqual(html.count('&lt;script&gt;alert(1)&lt;/script&gt;'), 9)
+        self.assertIn('Resumen<br>&lt;script&gt;', html)
+        self.assertIn('<a href="#" class="url" target="_blank">javascript:alert(1)</a>', html)
+
+
+class StubDnsUseCase:
+    def __init__(self):
+        self.streamed = []
+
+    def stream(self, domain, record_types):
+        for record_type in record_types:
+            self.streamed.append(record_type)
+            yield DNSRecord(type=record_type, value='192.0.2.1')
+
+
+class StreamingScanTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(RATE_LIMIT_FILE=os.path.join(directory.name, 'rate_limits.sqlite3'))
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.use_case = StubDnsUseCase()
+        patcher = mock.patch('api.views.create_dns_scan_use_case', return_value=self.use_case)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, data):
+        request = APIRequestFactory().post('/api/dns-scan/', data, format='json',
+                                           HTTP_ACCEPT='application/x-ndjson')
+        return DnsScanView.as_view()(request)
+
+    def test_streams_one_line_per_record(self):
+        with mock.patch('api.views.result_store.save') as save:
+            response = self.post({'domain': 'example.com', 'types': ['A', 'MX']})
+            lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([json.loads(line) for line in lines],
+                         [{'type': 'A', 'value': '192.0.2.1'}, {'type': 'MX', 'value': '192.0.2.1'}])
+        save.assert_not_called()
+
+    def test_incremental_stream_is_rejected(self):
+        response = self.post({'domain': 'example.com', 'types': ['A'], 'incremental': True})
+        response.render()
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('incremental', json.loads(response.content))
+        self.assertEqual(self.use_case.streamed, [])
+
+
+class SlowResolver(FakeResolver):
+    """FakeResolver que tarda `delay` segundos y registra cuántas consultas hay en curso."""
+
+    def __init__(self, answers, delay=0.05):
+        super().__init__(answers)
+        self.delay = delay
+        self.running = self.peak = 0
+
+    async def resolve(self, domain, record_type, lifetime=None):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            return await super().resolve(domain, record_type, lifetime)
+        finally:
+            self.running -= 1
+
+
+class DnsBatchScanTests(SimpleTestCase):
+    answers = {
+        ('example.com', 'A'): FakeAnswer('example.com.', 'A', ['192.0.2.1'], 300),
+        ('example.com', 'MX'): FakeAnswer('example.com.', 'MX', ['10 mail.example.com.'], 300),
+        ('example.com', 'NS'): FakeAnswer('example.com.', 'NS', ['ns1.example.com.', 'ns2.example.com.'], 300),
+        ('example.com', 'TXT'): dns.exception.Timeout(),
+        ('example.org', 'A'): FakeAnswer('example.org.', 'A', ['192.0.2.2'], 300),
+    }
+
+    async def test_record_types_resolve_concurrently_in_order(self):
+        resolver = SlowResolver(self.answers)
+        scanner = DnsScannerImpl(resolver=resolver)
+        started = time.perf_counter()
+        records = await scanner.scan_many_async('example.com', ['NS', 'A', 'TXT', 'MX', 'A'])
+        self.assertLess(time.perf_counter() - started, 4 * resolver.delay)
+        self.assertEqual(resolver.peak, 4)
+        # Orden de los tipos pedidos, sin repetir A; el fallo de TXT no afecta al resto
+        self.assertEqual([(record.type, record.status) for record in records], [
+            ('NS', 'ok'), ('NS', 'ok'), ('A', 'ok'), ('TXT', 'error'), ('MX', 'ok')])
+
+    async def test_concurrency_cap(self):
+        resolver = SlowResolver(self.answers, delay=0.01)
+        results = await DnsScannerImpl(max_concurrency=2, resolver=resolver).scan_batch_async(
+            [('example.com', 'A'), ('example.com', 'MX'), ('example.com', 'NS'), ('example.org', 'A')])
+        self.assertEqual(resolver.peak, 2)
+        self.assertEqual(results[('example.org', 'A')][0].value, '192.0.2.2')
+
+    def test_dns_view_accepts_record_types(self):
+        use_case = mock.Mock()
+        use_case.execute_many.return_value = [DNSRecord(type='A', value='192.0.2.1'),
+                                              DNSRecord(type='MX', value='10 mail.example.com.')]
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        with override_settings(RESULT_STORE_ENABLED=False,
+                               RATE_LIMIT_FILE=os.path.join(directory.name, 'rate_limits.sqlite3')), \
+                mock.patch('api.views.create_dns_scan_use_case', return_value=use_case):
+            response = self.client.post('/api/dns-scan/', {'domain': 'example.com', 'types': ['A', 'MX']},
+                                        content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([record['type'] for record in response.json()], ['A', 'MX'])
+        use_case.execute_many.assert_called_once_with('example.com', ['A', 'MX'])
+
+
+class UrlSensitivityAnalyzerTests(SimpleTestCase):
+    def test_overlapping_keywords(self):
+        rules = CompiledRuleSet([UrlRule(id='log', section='logs', confidence=0.5, keywords=['log']),
+                                 UrlRule(id='logs', section='logs', confidence=0.6, keywords=['logs']),
+                                 UrlRule(id='login', section='admin', confidence=0.8, keywords=['login']),
+                                 UrlRule(id='gin', section='other', confidence=0.1, keywords=['gin'])], {})
+        # "log", "logs", "login" y "gin" se solapan entre sí
+        self.assertEqual(rules.match('https://example.com/login/logs'), {0, 1, 2, 3})
+        self.assertEqual(rules.match('https://example.com/LOGIN'), {0, 2, 3})
+
+    def test_url_matching_several_rules_is_reported_once_per_section(self):
+        url = 'https://example.com/api/admin/logs/site.backup'
+        result = UrlSensitivityAnalyzer().analyze([url, url, 'https://example.com/index.html'])
+        self.assertEqual(result.classification, 'potentially_sensitive')
+        # admin_pages (0.8) y backup_files (high) ganan a api_endpoints y sensitive_dirs
+        self.assertEqual(result.confidence, 0.8)
+        self.assertEqual(result.details['severity'], 'high')
+        self.assertEqual(result.details['sensitive_files'], [url])
+        self.assertEqual(result.details['potential_vulnerabilities'], [url])
+        self.assertEqual(len(result.details['recommendations']), 2)
+
+    def test_dork_mapping_input(self):
+        result = UrlSensitivityAnalyzer().analyze({
+            'site:example.com': ['https://example.com/'],
+            'site:example.com ext:env': ['https://example.com/.env', 'https://example.com/'],
+        })
+        self.assertEqual(result.details['sensitive_files'], ['https://example.com/.env'])
+        self.assertEqual(result.details['potential_vulnerabilities'], [])
+
+
+RECONBOT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'reconbot')
+
+
+@functools.lru_cache(maxsize=None)
+def reconbot_script():
+    """reconbot/reconbot.py, que se ejecuta como script e importa sus módulos hermanos sin paquete."""
+    if RECONBOT_DIR not in sys.path:
+        sys.path.append(RECONBOT_DIR)
+    spec = importlib.util.spec_from_file_location('reconbot_script', os.path.join(RECONBOT_DIR, 'reconbot.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeReconBot:
+    """ReconBot sin red: falla con los dominios que empiezan por "error"."""
+
+    analyzed = []
+
+    def __init__(self, domain, **kwargs):
+        self.domain = domain
+
+    def run_analysis(self):
+        self.analyzed.append(self.domain)
+        if self.domain.startswith('error'):
+            raise RuntimeError('sin respuesta')
+        return {'dns_records': {'A': ['192.0.2.1'], 'MX': []}, 'whois_info': {},
+                'dork_results': {'site:x': ['https://a', 'https://b']},
+                'ai_analysis': {'classification': 'neutral'}}
+
+
+class ReconBotBatchTests(SimpleTestCase):
+    def setUp(self):
+        self.script = reconbot_script()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        cwd = os.getcwd()
+        # Los resultados se guardan en hallazgos/, relativo al directorio actual
+        os.chdir(self.directory)
+        self.addCleanup(os.chdir, cwd)
+        os.makedirs('hallazgos')
+        FakeReconBot.analyzed = []
+        patcher = mock.patch.object(self.script, 'ReconBot', FakeReconBot)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_batch(self, domains, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.script.run_batch(domains, 3, {}, os.path.join('hallazgos', 'batch.ndjson'),
+                                         whois_client=mock.Mock(), **kwargs)
+
+    def summary(self):
+        with open(os.path.join('hallazgos', 'batch.ndjson'), encoding='utf-8') as f:
+            return {entry['domain']: entry for entry in map(json.loads, f)}
+
+    def test_read_domains(self):
+        path = os.path.join(self.directory, 'domains.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('# cartera\nexample.com\n\n  example.org \nexample.com\n')
+        self.assertEqual(self.script.read_domains(path), ['example.com', 'example.org'])
+
+    def test_parse_rate_limits(self):
+        self.assertEqual(self.script.parse_rate_limits(['whois=0.5'])['whois'].rate, 0.5)
+        with self.assertRaises(argparse.ArgumentTypeError):
+            self.script.parse_rate_limits(['whois'])
+
+    def test_writes_results_and_summary(self):
+        counts = self.run_batch(['example.com', 'error.example', 'example.org'])
+        self.assertEqual(counts, {'total': 3, 'skipped': 0, 'ok': 2, 'error': 1})
+        summary = self.summary()
+        self.assertEqual(summary['example.com']['dns_records'], 1)
+        self.assertEqual(summary['example.com']['dork_urls'], 2)
+        self.assertEqual(summary['error.example'], {'domain': 'error.example', 'status': 'error',
+                                                    'error': 'sin respuesta',
+                                                    'duration': summary['error.example']['duration']})
+        with open(self.script.results_file('example.org'), encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['domain'], 'example.org')
+
+    def test_resumes_skipping_analyzed_domains(self):
+        self.run_batch(['example.com', 'error.example'])
+        FakeReconBot.analyzed = []
+        counts = self.run_batch(['example.com', 'error.example', 'example.org'])
+        # Los dominios con error no dejan resultados, así que se reintentan
+        self.assertEqual(sorted(FakeReconBot.analyzed), ['error.example', 'example.org'])
+        self.assertEqual(counts['skipped'], 1)
+        FakeReconBot.analyzed = []
+        self.run_batch(['example.com'], force=True)
+        self.assertEqual(FakeReconBot.analyzed, ['example.com'])
+
+
+class ResultStoreTests(TestCase):
+    def setUp(self):
+        self.week_ago = timezone.now() - timedelta(days=7)
+        self.yesterday = timezone.now() - timedelta(days=1)
+
+    def test_dns_observations_record_changes(self):
+        result_store.record_dns_values('Example.com.', {'NS': ['ns1.a.net', 'ns2.a.net'], 'A': ['192.0.2.1']},
+                                       observed_at=self.week_ago)
+        result_store.record_dns('example.com', [
+            DNSRecord(type='NS', value='ns1.a.net'), DNSRecord(type='NS', value='ns3.b.net'),
+            DNSRecord(type='A', value='timeout', status='error')], observed_at=self.yesterday)
+        changes = dict(DnsRecordObservation.objects.filter(observed_at=self.yesterday)
+                       .values_list('value', 'change'))
+        self.assertEqual(changes, {'ns1.a.net': 'same', 'ns3.b.net': 'added', 'ns2.a.net': 'removed'})
+        # El A que falló no se guarda: sigue vigente la observación anterior
+        self.assertEqual(result_store.latest_dns_records('example.com'),
+                         {'NS': {'ns1.a.net', 'ns3.b.net'}, 'A': {'192.0.2.1'}})
+
+    def test_domains_with_dns_changes(self):
+        result_store.record_dns_values('a.com', {'NS': ['ns1.x.net']}, observed_at=self.week_ago)
+        result_store.record_dns_values('b.com', {'NS': ['ns1.x.net']}, observed_at=self.week_ago)
+        result_store.record_dns_values('a.com', {'NS': ['ns2.x.net']}, observed_at=self.yesterday)
+        result_store.record_dns_values('b.com', {'NS': ['ns1.x.net']}, observed_at=self.yesterday)
+        since = self.yesterday - timedelta(hours=1)
+        self.assertEqual(result_store.domains_with_dns_changes('ns', since), ['a.com'])
+        self.assertEqual(result_store.domains_with_dns_changes('MX', since), [])
+
+    def test_hosts_with_open_port(self):
+        result_store.record_ports([nmap_result('10.0.0.2', 3306), nmap_result('10.0.0.1', 22, 3306)],
+                                  observed_at=self.week_ago)
+        result_store.record_ports([nmap_result('10.0.0.3', 3306)], observed_at=self.yesterday)
+        self.assertEqual(result_store.hosts_with_open_port(3306), ['10.0.0.1', '10.0.0.2', '10.0.0.3'])
+        self.assertEqual(result_store.hosts_with_open_port(3306, since=self.yesterday), ['10.0.0.3'])
+        response = self.client.get('/api/history/open-ports/22/')
+        self.assertEqual(response.json(), {'port': 22, 'hosts': ['10.0.0.1']})
+
+    def test_whois_and_dork_history(self):
+        result_store.record_whois('example.com', WhoisInfo(
+            domain='example.com', registrar='Old', name_servers=['NS1.A.NET']), observed_at=self.week_ago)
+        result_store.record_whois('example.com', {'registrar': 'New', 'creation_date': None})
+        self.assertEqual(result_store.latest_whois('EXAMPLE.com')['registrar'], 'New')
+        self.assertIsNone(result_store.latest_whois('example.org'))
+
+        result_store.record_dork('site:example.com', [{'title': 'A', 'url': 'https://example.com/a'},
+                                                      'https://example.com/b', {'error': 'bloqueado'}])
+        self.assertEqual(result_store.known_urls('site:example.com', ['https://example.com/a', 'https://x']),
+                         {'https://example.com/a'})
+        self.assertEqual(result_store.dork_changes('site:example.com', ['https://example.com/b', 'https://x']),
+                         {'new': ['https://x']})
+
+    @override_settings(RESULT_STORE_ENABLED=False)
+    def test_store_can_be_disabled(self):
+        self.assertIsNone(result_store.save(result_store.record_dns_values, 'example.com', {'A': ['192.0.2.1']}))
+        self.assertEqual(result_store.latest_dns_records('example.com'), {})
+
+
+class WarmComponent:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.warm = False
+
+    def warm_up(self):
+        if self.fail:
+            raise RuntimeError('nmap no encontrado')
+        self.warm = True
+
+    def health(self):
+        if not self.warm:
+            raise RuntimeError('sin preparar')
+        return {'warm': True}
+
+
+class ScannerContainerTests(SimpleTestCase):
+    def test_components_are_built_once_across_threads(self):
+        built = []
+        barrier = threading.Barrier(8, timeout=5)
+
+        def factory():
+            built.append(1)
+            time.sleep(0.01)
+            return object()
+
+        container = ScannerContainer()
+        container.register('scanner', factory)
+        container.register('use_case', lambda: ('use_case', container.get('scanner')))
+        instances = []
+
+        def get():
+            barrier.wait()
+            instances.append(container.get('use_case'))
+
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(len(built), 1)
+        self.assertTrue(all(instance is instances[0] for instance in instances))
+
+    def test_peek_and_reset(self):
+        container = ScannerContainer()
+        container.register('scanner', object)
+        self.assertIsNone(container.peek('scanner'))
+        first = container.get('scanner')
+        self.assertIs(container.peek('scanner'), first)
+        container.reset()
+        self.assertIsNot(container.get('scanner'), first)
+
+    def test_warm_up_and_health(self):
+        container = ScannerContainer()
+        container.register('dns', WarmComponent)
+        container.register('nmap', lambda: WarmComponent(fail=True))
+        container.register('plain', object)
+        with self.assertLogs('core.infrastructure.adapters.container', 'WARNING'):
+            self.assertEqual(set(container.warm_up()), {'dns', 'nmap', 'plain'})
+        self.assertEqual(container.health(), {
+            'dns': {'status': 'ok', 'warm': True},
+            'nmap': {'status': 'error', 'error': 'sin preparar'},
+        })
+
+    def test_use_cases_are_process_singletons(self):
+        self.assertIs(create_dns_scan_use_case(), create_dns_scan_use_case())
+
+
+class ScannerBenchmarkTests(SimpleTestCase):
+    def test_percentile(self):
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(bench_scanners.percentile(values, 0.50), 50.0)
+        self.assertEqual(bench_scanners.percentile(values, 0.99), 99.0)
+        self.assertEqual(bench_scanners.percentile(values, 1.0), 100.0)
+        self.assertEqual(bench_scanners.percentile([3.0], 0.99), 3.0)
+        self.assertEqual(bench_scanners.percentile([], 0.5), 0.0)
+
+    def test_compare_flags_regressions(self):
+        baseline = {'meta': {'date': '2026-01-01'}, 'scenarios': {
+            'dns.scan': {'ops_per_sec': 100.0, 'p99_ms': 10.0},
+            'whois.scan': {'ops_per_sec': 100.0, 'p99_ms': 10.0},
+            'dork.scan': {'ops_per_sec': 100.0, 'p99_ms': 10.0},
+        }}
+        results = {
+            'dns.scan': {'ops_per_sec': 85.0, 'p99_ms': 11.0},     # dentro de la tolerancia
+            'whois.scan': {'ops_per_sec': 70.0, 'p99_ms': 10.0},   # más lento
+            'dork.scan': {'ops_per_sec': 100.0, 'p99_ms': 13.0},   # peor cola
+            'nmap.scan': {'ops_per_sec': 1.0, 'p99_ms': 999.0},    # sin línea base
+        }
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(bench_scanners.compare(results, baseline, 0.2), ['whois.scan', 'dork.scan'])
+
+    def test_smoke_run_against_stubs(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as workdir, StubProcess(DnsStubServer) as dns_stub, \
+                StubProcess(WhoisStubServer) as whois_stub, StubProcess(SearchStubServer) as search_stub, \
+                mock.patch.dict(os.environ, {'PATH': workdir + os.pathsep + os.environ.get('PATH', '')}):
+            fake_nmap.install(workdir)
+            stubs = {'dns': dns_stub, 'whois': whois_stub, 'search': search_stub}
+            selected = {'dns.scan', 'dns.scan_many_async', 'whois.scan', 'dork.scan', 'nmap.scan',
+                        'reconbot.run_analysis'}
+            try:
+                for scenario in bench_scanners.scenarios(stubs, 0.001, workdir):
+                    if scenario.name not in selected:
+                        continue
+                    with self.subTest(scenario=scenario.name):
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            result = bench_scanners.measure(scenario, 2, memory=True)
+                        self.assertEqual(result.errors, 0)
+                        self.assertGreater(result.ops_per_sec, 0)
+                        self.assertLessEqual(result.p50_ms, result.p99_ms)
+                        self.assertIsNotNone(result.peak_mib)
+            finally:
+                # El escenario de ReconBot cambia al directorio de trabajo
+                os.chdir(cwd)
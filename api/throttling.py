@@ -0,0 +1,125 @@
+# api/throttling.py
+"""Límites de peticiones por cliente y por escáner (token buckets compartidos entre procesos).
+
+Cada escáner tiene dos presupuestos en settings.SCAN_RATE_LIMITS, con el
+formato de DRF ('10/min'): uno por cliente y otro para todos los clientes
+juntos (protege nuestras IPs de salida frente a buscadores y redes
+escaneadas). Una petición se acepta sólo si ambos tienen tokens; si no, se
+responde 429 con Retry-After. La ráfaga máxima es el número de peticiones
+del periodo.
+
+Los buckets viven en un fichero SQLite (settings.RATE_LIMIT_FILE) que
+comparten todos los workers; si no se puede usar, las peticiones pasan.
+"""
+from typing import Dict, Optional, Tuple
+import logging
+import math
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from rest_framework.throttling import BaseThrottle
+
+from core.infrastructure.metrics import registry
+from core.infrastructure.rate_limit import SqliteTokenBucketStore
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+THROTTLED = registry.counter(
+    "http_requests_throttled_total", "Peticiones rechazadas por el límite de tasa", ("scope",))
+
+_store: Optional[SqliteTokenBucketStore] = None
+_store_lock = threading.Lock()
+
+
+def parse_rate(rate: str) -> Tuple[float, float]:
+    """'10/min' -> (tokens por segundo, capacidad): 10 peticiones por minuto con ráfagas de 10."""
+    requests, period = rate.split('/')
+    requests = float(requests)
+    if requests <= 0:
+        raise ValueError(f"Límite de tasa no válido: {rate}")
+    return requests / PERIODS[period.strip()[0]], requests
+
+
+def get_store() -> SqliteTokenBucketStore:
+    global _store
+    with _store_lock:
+        if _store is None or _store.path != settings.RATE_LIMIT_FILE:
+            _store = SqliteTokenBucketStore(settings.RATE_LIMIT_FILE)
+        return _store
+
+
+def budgets(scope: str) -> Dict[str, Tuple[float, float]]:
+    """Presupuestos ('client' y/o 'total') de un escáner; vacío si no está limitado."""
+    limits = settings.SCAN_RATE_LIMITS.get(scope) or {}
+    return {name: parse_rate(rate) for name, rate in limits.items() if rate}
+
+
+def max_cost(scope: str) -> float:
+    """Tokens que puede consumir como máximo una sola petición (la menor capacidad)."""
+    return min((capacity for _, capacity in budgets(scope).values()), default=math.inf)
+
+
+def acquire(ident: str, costs: Dict[str, float]) -> float:
+    """Consume los tokens de cada escáner de `costs` para el cliente; devuelve la espera si no hay."""
+    buckets = []
+    for scope, tokens in costs.items():
+        for name, (rate, capacity) in budgets(scope).items():
+            key = f"{scope}:client:{ident}" if name == 'client' else f"{scope}:total"
+            buckets.append((key, rate, capacity, tokens))
+    if not buckets:
+        return 0.0
+    try:
+        wait = get_store().try_acquire(buckets)
+    except Exception as e:
+        # Mejor sin límite que sin API: el fallo queda en el log
+        logger.warning("No se pudo consultar el límite de tasa: %s", e)
+        return 0.0
+    if wait:
+        for scope in costs:
+            THROTTLED.inc(scope=scope)
+    return wait
+
+
+acquire_async = sync_to_async(acquire, thread_sensitive=False)
+
+
+def client_ident(request) -> str:
+    # La misma identificación que DRF (IP, con settings NUM_PROXIES para X-Forwarded-For)
+    return BaseThrottle().get_ident(request)
+
+
+def throttled_response(wait: float) -> JsonResponse:
+    """429 equivalente al de DRF para las vistas que no son APIView."""
+    seconds = math.ceil(wait)
+    response = JsonResponse(
+        {'detail': f'Demasiadas peticiones. Vuelva a intentarlo en {seconds} segundos.'}, status=429)
+    response['Retry-After'] = str(seconds)
+    return response
+
+
+class ScanRateThrottle(BaseThrottle):
+    """Throttle de DRF para las vistas con `throttle_scope` (el nombre del escáner).
+
+    Una petición gasta un token, o los que indique `view.throttle_cost(request.data)`.
+    """
+
+    def __init__(self):
+        self._wait = 0.0
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if scope is None:
+            return True
+        cost = view.throttle_cost(request.data) if hasattr(view, 'throttle_cost') else 1
+        if cost > max_cost(scope):
+            # No pasaría nunca: la validación de la vista la rechaza con 400
+            return True
+        self._wait = acquire(self.get_ident(request), {scope: cost})
+        return not self._wait
+
+    def wait(self):
+        return self._wait
@@ -5,11 +5,23 @@ from .views import (
     WhoisScanView,
     NmapScanView,
     AIAnalysisView,
+    JobDetailView,
+    OpenPortHistoryView,
+    DnsChangeHistoryView,
+    HealthView,
+    metrics_view,
     home_page,
     custom_page_not_found,
     custom_server_error,
     trigger_error_500
 )
+from .async_views import (
+    AsyncGoogleDorkView,
+    AsyncDnsScanView,
+    AsyncWhoisScanView,
+    AsyncNmapScanView,
+    BulkScanView,
+)
 from django.conf.urls import handler404, handler500
 from django.views.generic import TemplateView
 
@@ -37,6 +49,29 @@ urlpatterns = [
     path('api/whois-scan/', WhoisScanView.as_view(), name='whois-scan'),
     path('api/nmap-scan/', NmapScanView.as_view(), name='nmap-scan'),
     path('api/analyze/', AIAnalysisView.as_view(), name='ai-analyze'),
+
+    # Versiones asíncronas de los escaneos (servidas con ASGI, ver api/asgi.py)
+    path('api/async/google-dork/', AsyncGoogleDorkView.as_view(), name='async-google-dork'),
+    path('api/async/dns-scan/', AsyncDnsScanView.as_view(), name='async-dns-scan'),
+    path('api/async/whois-scan/', AsyncWhoisScanView.as_view(), name='async-whois-scan'),
+    path('api/async/nmap-scan/', AsyncNmapScanView.as_view(), name='async-nmap-scan'),
+
+    # Varios objetivos y escaneos en una sola petición
+    path('api/bulk-scan/', BulkScanView.as_view(), name='bulk-scan'),
+
+    # Estado de la base de datos y de los escáneres
+    path('api/health/', HealthView.as_view(), name='health'),
+
+    # Métricas del proceso en formato Prometheus
+    path('metrics', metrics_view, name='metrics'),
+
+    # Estado de los escaneos ejecutados en segundo plano
+    path('api/jobs/<uuid:job_id>/', JobDetailView.as_view(), name='job-detail'),
+
+    # Consultas sobre el histórico de resultados (GET)
+    path('api/history/open-ports/<int:port>/', OpenPortHistoryView.as_view(),
+         name='history-open-ports'),
+    path('api/history/dns-changes/', DnsChangeHistoryView.as_view(), name='history-dns-changes'),
 ]
 
 # Configuración de manejadores de errores
@@ -3,22 +3,32 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, serializers
 from api.serializers import (
-    GoogleDorkResultSerializer,
-    DNSRecordSerializer,
-    WhoisInfoSerializer,
-    NmapScanResultSerializer,
     AIAnalysisRequestSerializer,
-    AIAnalysisResponseSerializer
+    AIAnalysisResponseSerializer,
+    ScanJobSerializer
 )
+from api import encoders, jobs, result_store, throttling
+from api.streaming import NDJSONStreamMixin
+from core.infrastructure.metrics import registry as metrics_registry
 from core.infrastructure.adapters.scanner_adapter import (
     create_google_dork_use_case,
     create_dns_scan_use_case,
     create_whois_scan_use_case,
     create_nmap_scan_use_case,
+    create_ai_analysis_use_case,
+    container,
+    NMAP_SWEEP_MAX_HOSTS,
+    NMAP_SWEEP_SHARD_SIZE,
 )
+from core.infrastructure.scanners.nmap_scan import check_targets
 from django.shortcuts import render
-from django.http import HttpResponseServerError
+from django.urls import reverse
+from django.http import HttpResponse, HttpResponseServerError
+from django.db import connection
+from django.utils import timezone
+from datetime import timedelta
 import json
+import math
 import re
 
 
@@ -39,37 +49,75 @@ def custom_server_error(request):
     return render(request, '500.html', status=500)
 
 
+def scan_response(data, changes=None):
+    return Response(result_store.with_changes(data, changes))
+
+
+def incremental_stream_error():
+    # Los cambios se calculan sobre el resultado completo y las respuestas NDJSON no se guardan
+    return Response({'incremental': ["El modo incremental no admite respuestas en streaming (NDJSON)."]},
+                    status=status.HTTP_400_BAD_REQUEST)
+
+
 class GoogleDorkRequestSerializer(serializers.Serializer):
     query = serializers.CharField(required=True)
+    incremental = serializers.BooleanField(default=False)
+
 
+class GoogleDorkView(NDJSONStreamMixin, APIView):
+    throttle_scope = 'dork'
 
-class GoogleDorkView(APIView):
     def post(self, request):
         serializer = GoogleDorkRequestSerializer(data=request.data)
         if serializer.is_valid():
             query = serializer.validated_data['query']
             use_case = create_google_dork_use_case()
+            if self.wants_stream(request):
+                if serializer.validated_data['incremental']:
+                    return incremental_stream_error()
+                return self.stream_response(use_case.stream(query))
             result = use_case.execute(query)
-            result_serializer = GoogleDorkResultSerializer(result)
-            return Response(result_serializer.data)
+            changes = None
+            if serializer.validated_data['incremental']:
+                changes = result_store.dork_changes(query, result.results)
+            result_store.save(result_store.record_dork, query, result.results)
+            return scan_response(encoders.dork_result.encode(result), changes)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class DnsScanRequestSerializer(serializers.Serializer):
     domain = serializers.CharField(required=True)
     type = serializers.CharField(default='A')
+    types = serializers.ListField(
+        child=serializers.CharField(), required=False, allow_empty=False)
+    incremental = serializers.BooleanField(default=False)
+
 
+class DnsScanView(NDJSONStreamMixin, APIView):
+    throttle_scope = 'dns'
 
-class DnsScanView(APIView):
     def post(self, request):
         serializer = DnsScanRequestSerializer(data=request.data)
         if serializer.is_valid():
             domain = serializer.validated_data['domain']
             record_type = serializer.validated_data['type']
+            record_types = serializer.validated_data.get('types')
             use_case = create_dns_scan_use_case()
-            results = use_case.execute(domain, record_type)
-            result_serializer = DNSRecordSerializer(results, many=True)
-            return Response(result_serializer.data)
+            if self.wants_stream(request):
+                if serializer.validated_data['incremental']:
+                    return incremental_stream_error()
+                records = use_case.stream(domain, record_types or [record_type])
+                return self.stream_response(encoders.dns_record.encode(record) for record in records)
+            if record_types:
+                # Todos los tipos se resuelven en paralelo en una sola respuesta
+                results = use_case.execute_many(domain, record_types)
+            else:
+                results = use_case.execute(domain, record_type)
+            changes = None
+            if serializer.validated_data['incremental']:
+                changes = result_store.dns_changes(domain, results)
+            result_store.save(result_store.record_dns, domain, results)
+            return scan_response(encoders.dns_record.encode_many(results), changes)
         # Corrected status code
         return Response(serializer.errors, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -77,101 +125,163 @@ class DnsScanView(APIView):
 
 class WhoisScanRequestSerializer(serializers.Serializer):
     domain = serializers.CharField(required=True)
+    incremental = serializers.BooleanField(default=False)
 
 
 class WhoisScanView(APIView):
+    throttle_scope = 'whois'
+
     def post(self, request):
         serializer = WhoisScanRequestSerializer(data=request.data)
         if serializer.is_valid():
             domain = serializer.validated_data['domain']
             use_case = create_whois_scan_use_case()
             result = use_case.execute(domain)
-            result_serializer = WhoisInfoSerializer(result)
-            return Response(result_serializer.data)
+            changes = None
+            if serializer.validated_data['incremental']:
+                changes = result_store.whois_changes(domain, result)
+            result_store.save(result_store.record_whois, domain, result)
+            return scan_response(encoders.whois_info.encode(result), changes)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def nmap_cost(target) -> int:
+    """Tokens del límite de nmap que gasta un objetivo: uno por shard (invocación de nmap).
+
+    Un barrido con más shards que la ráfaga gasta la ráfaga entera: se admite
+    (hasta NMAP_SWEEP_MAX_HOSTS), pero agota el presupuesto del cliente en el periodo.
+    """
+    try:
+        hosts = check_targets(str(target or ''), None)
+    except ValueError:
+        return 1  # la validación rechaza el objetivo
+    shards = math.ceil(hosts / NMAP_SWEEP_SHARD_SIZE)
+    return max(1, int(min(shards, throttling.max_cost('nmap'))))
+
+
 class NmapScanRequestSerializer(serializers.Serializer):
     target = serializers.CharField(required=True)
     ports = serializers.CharField(
         required=False, allow_blank=True, default=None)
+    background = serializers.BooleanField(default=False)
+    incremental = serializers.BooleanField(default=False)
+
+    def validate_target(self, value):
+        # Antes de encolar o escanear: un CIDR enorme o una opción de nmap no llegan al escáner
+        try:
+            check_targets(value, NMAP_SWEEP_MAX_HOSTS)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
 
+class NmapScanView(NDJSONStreamMixin, APIView):
+    throttle_scope = 'nmap'
+    # Un CIDR o una lista de hosts se escanea como barrido multi-host
+    SWEEP_TARGET = re.compile(r'[/,\s]')
+
+    def throttle_cost(self, data) -> int:
+        # Un barrido gasta un token por shard, no uno por petición
+        return nmap_cost(data.get('target') if hasattr(data, 'get') else None)
 
-class NmapScanView(APIView):
     def post(self, request):
         serializer = NmapScanRequestSerializer(data=request.data)
         if serializer.is_valid():
             target = serializer.validated_data['target']
             ports = serializer.validated_data['ports']
+            incremental = serializer.validated_data['incremental']
+            sweep = bool(self.SWEEP_TARGET.search(target.strip()))
+            if serializer.validated_data['background']:
+                # Se encola el escaneo y se responde de inmediato con el ID del job
+                job = jobs.job_queue.submit('nmap_sweep' if sweep else 'nmap', {
+                    'target': target, 'ports': ports, 'incremental': incremental})
+                return Response(
+                    {'job_id': str(job.id), 'status': job.status,
+                     'status_url': reverse('job-detail', args=[job.id])},
+                    status=status.HTTP_202_ACCEPTED)
             use_case = create_nmap_scan_use_case()
+            if self.wants_stream(request):
+                if incremental:
+                    return incremental_stream_error()
+                return self.stream_response(use_case.stream(target, ports))
+            if sweep:
+                results = use_case.execute_sweep(target, ports)
+                changes = result_store.port_changes(results) if incremental else None
+                result_store.save(result_store.record_ports, results)
+                return scan_response(encoders.nmap_result.encode_many(results), changes)
             result = use_case.execute(target, ports)
-            result_serializer = NmapScanResultSerializer(result)
-            return Response(result_serializer.data)
+            changes = result_store.port_changes([result]) if incremental else None
+            result_store.save(result_store.record_ports, [result])
+            return scan_response(encoders.nmap_result.encode(result), changes)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class JobDetailView(APIView):
+    def get(self, request, job_id):
+        job = jobs.job_queue.get(job_id)
+        if job is None:
+            return Response({'detail': 'Job no encontrado.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(ScanJobSerializer(job).data)
+
+
+class OpenPortHistoryRequestSerializer(serializers.Serializer):
+    since = serializers.DateTimeField(required=False)
+
+
+class OpenPortHistoryView(APIView):
+    def get(self, request, port):
+        serializer = OpenPortHistoryRequestSerializer(data=request.query_params)
+        if serializer.is_valid():
+            hosts = result_store.hosts_with_open_port(port, serializer.validated_data.get('since'))
+            return Response({'port': port, 'hosts': hosts})
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class DnsChangeHistoryRequestSerializer(serializers.Serializer):
+    type = serializers.CharField(default='NS')
+    since = serializers.DateTimeField(required=False)
+
+
+class DnsChangeHistoryView(APIView):
+    def get(self, request):
+        serializer = DnsChangeHistoryRequestSerializer(data=request.query_params)
+        if serializer.is_valid():
+            record_type = serializer.validated_data['type'].upper()
+            # Por defecto, cambios de la última semana
+            since = serializer.validated_data.get('since') or timezone.now() - timedelta(days=7)
+            domains = result_store.domains_with_dns_changes(record_type, since)
+            return Response({'type': record_type, 'since': since, 'domains': domains})
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class HealthView(APIView):
+    """Estado de la base de datos y de los escáneres; 503 si alguno falla."""
+
+    def get(self, request):
+        components = container.health()
+        try:
+            connection.ensure_connection()
+            components['database'] = {'status': 'ok'}
+        except Exception as e:
+            components['database'] = {'status': 'error', 'error': str(e)}
+        healthy = all(component['status'] == 'ok' for component in components.values())
+        return Response({'status': 'ok' if healthy else 'error', 'components': components},
+                        status=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+def metrics_view(request):
+    # Formato de texto de Prometheus; sin DRF para que el scrape no pase por la negociación
+    return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 class AIAnalysisView(APIView):
     def post(self, request):
         serializer = AIAnalysisRequestSerializer(data=request.data)
         if serializer.is_valid():
             text = serializer.validated_data['text']
-
-            # Análisis básico de seguridad
-            sensitive_patterns = {
-                'config_files': r'\.(env|xml|conf|config|ini|yaml|yml)$',
-                'backup_files': r'\.(bak|backup|old|tmp|temp)$',
-                'admin_pages': r'(admin|login|dashboard|control|manage)',
-                'sensitive_dirs': r'(backup|db|database|sql|logs|log)',
-                'api_endpoints': r'(api|rest|graphql|soap)',
-            }
-
             results = json.loads(text)
-            analysis = {
-                'classification': 'neutral',
-                'confidence': 0.0,
-                'details': {
-                    'sensitive_files': [],
-                    'potential_vulnerabilities': [],
-                    'recommendations': []
-                }
-            }
-
-            for dork, urls in results.items():
-                for url in urls:
-                    # Analizar cada URL
-                    for pattern_name, pattern in sensitive_patterns.items():
-                        if re.search(pattern, url, re.IGNORECASE):
-                            if pattern_name in ['config_files', 'backup_files']:
-                                analysis['details']['sensitive_files'].append(
-                                    url)
-                                analysis['classification'] = 'potentially_sensitive'
-                                analysis['confidence'] = max(
-                                    analysis['confidence'], 0.7)
-                            elif pattern_name in ['admin_pages', 'sensitive_dirs']:
-                                analysis['details']['potential_vulnerabilities'].append(
-                                    url)
-                                analysis['classification'] = 'potentially_sensitive'
-                                analysis['confidence'] = max(
-                                    analysis['confidence'], 0.8)
-                            elif pattern_name == 'api_endpoints':
-                                analysis['details']['potential_vulnerabilities'].append(
-                                    url)
-                                analysis['classification'] = 'potentially_sensitive'
-                                analysis['confidence'] = max(
-                                    analysis['confidence'], 0.6)
-
-            # Generar recomendaciones basadas en los hallazgos
-            if analysis['details']['sensitive_files']:
-                analysis['details']['recommendations'].append(
-                    "Se encontraron archivos de configuración o respaldo expuestos. "
-                    "Considere restringir el acceso a estos archivos."
-                )
-            if analysis['details']['potential_vulnerabilities']:
-                analysis['details']['recommendations'].append(
-                    "Se detectaron páginas administrativas o directorios sensibles. "
-                    "Verifique que estos recursos estén adecuadamente protegidos."
-                )
-
+            use_case = create_ai_analysis_use_case()
+            analysis = use_case.execute(results)
             result_serializer = AIAnalysisResponseSerializer(analysis)
             return Response(result_serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -12,3 +12,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.SCANNER_WARM_UP:
+    # Los escáneres quedan listos antes de la primera petición
+    from core.infrastructure.adapters.scanner_adapter import container  # noqa: E402
+    container.warm_up()
@@ -0,0 +1,6 @@
+"""Benchmarks de rendimiento del proyecto.
+
+Cada módulo se ejecuta por separado, p.ej.::
+
+    python -m benchmarks.bench_url_analyzer
+"""
@@ -0,0 +1,259 @@
+"""Prueba de carga de los endpoints POST de la API con escáneres falsos.
+
+    python -m benchmarks.bench_api_load [--transport asgi|wsgi|http] [--requests 500]
+        [--concurrency 32] [--latency 0.0] [--only dns async] [--no-rate-limits]
+        [--no-result-store] [--save-baseline [FICHERO]] [--baseline [FICHERO]]
+
+La aplicación completa (middleware, límites de tasa, vistas, histórico de
+resultados) se ejecuta con los escáneres de benchmarks/fake_scanners, que
+responden siempre lo mismo y esperan `--latency` segundos por operación:
+
+- asgi: en este proceso, como con uvicorn (las vistas síncronas comparten un hilo).
+- wsgi: en este proceso, cada petición en un hilo, como con gunicorn --threads.
+- http: servidor WSGI con hilos (el de runserver) en otro proceso, por sockets.
+
+Cada endpoint recibe `--requests` peticiones con `--concurrency` a la vez,
+con objetivos distintos en cada una. Se muestra req/s, latencias p50/p99 y
+máxima, y porcentaje de errores (códigos >= 400 o excepciones). Los límites
+de tasa se elevan para que no rechacen nada, pero se siguen consultando; la
+base de datos y los ficheros de los límites y de la caché WHOIS son
+temporales. `--save-baseline` y `--baseline` funcionan como en
+bench_scanners.
+"""
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks import fake_scanners
+from benchmarks.bench_scanners import compare, percentile
+from benchmarks.stubs import StubProcess
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'api_load.json')
+SCAN_SCOPES = ['nmap', 'dork', 'whois', 'dns']
+# Límite alto para que ninguna petición se rechace sin dejar de consultar los buckets
+UNLIMITED_RATE = '1000000/s'
+DNS_TYPES = ['A', 'AAAA', 'MX', 'NS', 'TXT']
+BULK_TARGETS = 10
+
+
+@dataclass
+class Endpoint:
+    # Nombre de la ruta en api/urls.py
+    name: str
+    payload: Callable[[int], Dict[str, Any]]
+
+
+def _host(index: int) -> str:
+    return f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}"
+
+
+def _urls(index: int) -> str:
+    return json.dumps({f"site:bench{index}.test": [
+        f"https://bench{index}.test/{path}" for path in ('admin/login', 'backup/db.sql', '.env', 'index.html')]})
+
+
+ENDPOINTS = [
+    Endpoint('google-dork', lambda i: {"query": f"site:bench{i}.test admin"}),
+    Endpoint('dns-scan', lambda i: {"domain": f"host{i}.bench.test", "types": DNS_TYPES}),
+    Endpoint('whois-scan', lambda i: {"domain": f"domain{i}.com"}),
+    Endpoint('nmap-scan', lambda i: {"target": _host(i), "ports": "22,80,443"}),
+    Endpoint('ai-analyze', lambda i: {"text": _urls(i)}),
+    Endpoint('async-google-dork', lambda i: {"query": f"site:bench{i}.test admin"}),
+    Endpoint('async-dns-scan', lambda i: {"domain": f"host{i}.bench.test", "types": DNS_TYPES}),
+    Endpoint('async-whois-scan', lambda i: {"domain": f"domain{i}.com"}),
+    Endpoint('async-nmap-scan', lambda i: {"target": _host(i), "ports": "22,80,443"}),
+    Endpoint('bulk-scan', lambda i: {"targets": [f"bulk{i}-{k}.bench.test" for k in range(BULK_TARGETS)],
+                                     "scans": ["dns", "whois", "nmap", "dork"], "ports": "22,80,443"}),
+]
+
+
+def configure(workdir: str, rate_limits: bool, result_store: bool, latency: float) -> None:
+    """Prepara Django con ficheros temporales y los escáneres falsos (antes de importar la aplicación)."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
+    for scope in SCAN_SCOPES:
+        for budget in ('CLIENT', 'TOTAL'):
+            os.environ[f'RATE_LIMIT_{scope.upper()}_{budget}'] = UNLIMITED_RATE if rate_limits else ''
+    os.environ['RATE_LIMIT_FILE'] = os.path.join(workdir, 'rate_limits.sqlite3')
+    os.environ['WHOIS_CACHE_FILE'] = os.path.join(workdir, 'whois_cache.sqlite3')
+    os.environ['RESULT_STORE_ENABLED'] = 'true' if result_store else 'false'
+
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = os.path.join(workdir, 'db.sqlite3')
+    # Con decenas de peticiones escribiendo el histórico a la vez, SQLite falla con
+    # "database is locked" al pasar de lectura a escritura: las transacciones toman el
+    # bloqueo al empezar y esperan su turno (sólo en la base de datos temporal de la prueba)
+    settings.DATABASES['default']['OPTIONS'] = {
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': 20,
+        'init_command': 'PRAGMA journal_mode=WAL;',
+    }
+    import django
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+    from core.infrastructure.adapters.scanner_adapter import container
+    fake_scanners.install(container, latency)
+
+
+def api_server(address):
+    """Servidor WSGI con un hilo por petición, el mismo que usa runserver."""
+    from django.core.servers.basehttp import ThreadedWSGIServer
+    from django.test.testcases import QuietWSGIRequestHandler
+    from api.wsgi import application
+
+    server = ThreadedWSGIServer(address, QuietWSGIRequestHandler)
+    server.set_app(application)
+    return server
+
+
+async def run_endpoint(post: Callable[[str, Dict[str, Any]], Awaitable[int]], path: str, endpoint: Endpoint,
+                       requests: int, concurrency: int, offset: int) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(index: int):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                status = await post(path, endpoint.payload(offset + index))
+            except Exception as e:
+                status = type(e).__name__
+            return time.perf_counter() - start, status
+
+    start = time.perf_counter()
+    samples = await asyncio.gather(*(timed(index) for index in range(requests)))
+    seconds = time.perf_counter() - start
+    latencies = sorted(latency for latency, _ in samples)
+    statuses = Counter(str(status) for _, status in samples)
+    errors = sum(count for status, count in statuses.items() if not status.isdigit() or int(status) >= 400)
+    return {
+        'requests': requests, 'seconds': round(seconds, 3), 'ops_per_sec': round(requests / seconds, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2), 'errors': errors,
+        'error_rate': round(errors / requests, 4), 'status': dict(statuses),
+    }
+
+
+async def run(args, base_url: str, transport) -> Dict[str, Dict[str, Any]]:
+    from django.urls import reverse
+
+    if args.transport == 'wsgi':
+        # Cliente síncrono: cada petición ocupa un hilo, como en un servidor WSGI con hilos
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=args.concurrency))
+        client = httpx.Client(transport=transport, base_url=base_url, timeout=60)
+
+        async def post(path: str, payload: Dict[str, Any]) -> int:
+            return (await asyncio.to_thread(client.post, path, json=payload)).status_code
+    else:
+        client = httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60,
+                                   limits=httpx.Limits(max_connections=args.concurrency))
+
+        async def post(path: str, payload: Dict[str, Any]) -> int:
+            return (await client.post(path, json=payload)).status_code
+
+    selected = [endpoint for endpoint in ENDPOINTS
+                if not args.only or any(text in endpoint.name for text in args.only)]
+    print(f"{'endpoint':<20} {'peticiones':>10} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'máx ms':>9} "
+          f"{'errores':>8}  códigos")
+    results = {}
+    try:
+        for endpoint in selected:
+            path = reverse(endpoint.name)
+            # Las primeras peticiones cargan módulos, rutas y conexiones: no se miden
+            await run_endpoint(post, path, endpoint, args.warmup, args.concurrency, offset=10**6)
+            result = results[endpoint.name] = await run_endpoint(
+                post, path, endpoint, args.requests, args.concurrency, offset=0)
+            codes = ' '.join(f"{status}:{count}" for status, count in sorted(result['status'].items()))
+            print(f"{endpoint.name:<20} {result['requests']:>10} {result['ops_per_sec']:>9,.1f} "
+                  f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['max_ms']:>9.2f} "
+                  f"{result['error_rate']:>8.1%}  {codes}")
+    finally:
+        if isinstance(client, httpx.AsyncClient):
+            await client.aclose()
+        else:
+            client.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--transport', choices=['asgi', 'wsgi', 'http'], default='asgi')
+    parser.add_argument('--requests', type=int, default=500, help='Peticiones medidas por endpoint')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--warmup', type=int, default=20, help='Peticiones previas sin medir por endpoint')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Espera simulada de cada operación de los escáneres (segundos)')
+    parser.add_argument('--only', nargs='+', metavar='TEXTO',
+                        help='Sólo los endpoints cuyo nombre contiene alguno de los textos (p.ej. dns async)')
+    parser.add_argument('--no-rate-limits', action='store_true',
+                        help='Desactivar los límites de tasa en lugar de elevarlos')
+    parser.add_argument('--no-result-store', action='store_true',
+                        help='No guardar los resultados en el histórico (RESULT_STORE_ENABLED=false)')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, metavar='FICHERO')
+    parser.add_argument('--baseline', nargs='?', const=DEFAULT_BASELINE, metavar='FICHERO')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Empeoramiento admitido frente a la línea base (por defecto 0.2 = 20%%)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        configure(workdir, not args.no_rate_limits, not args.no_result_store, args.latency)
+        if args.transport == 'http':
+            from django.db import connections
+            # El proceso del servidor abre sus propias conexiones a la base de datos
+            connections.close_all()
+            with StubProcess(api_server) as server:
+                results = asyncio.run(run(args, 'http://%s:%d' % server.address, None))
+        elif args.transport == 'wsgi':
+            from api.wsgi import application
+            results = asyncio.run(run(args, 'http://testserver', httpx.WSGITransport(app=application)))
+        else:
+            from api.asgi import application
+            results = asyncio.run(run(args, 'http://testserver', httpx.ASGITransport(app=application)))
+
+    report = {
+        'meta': {'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                 'python': platform.python_version(), 'platform': platform.platform(),
+                 'cpus': os.cpu_count(), 'transport': args.transport, 'requests': args.requests,
+                 'concurrency': args.concurrency, 'latency': args.latency,
+                 'rate_limits': not args.no_rate_limits, 'result_store': not args.no_result_store},
+        'scenarios': results,
+    }
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        # Sólo tiene sentido comparar ejecuciones con las mismas condiciones
+        different = [key for key in ('transport', 'concurrency', 'latency', 'rate_limits', 'result_store')
+                     if baseline['meta'].get(key) != report['meta'][key]]
+        if different:
+            print(f"\nAviso: la línea base se midió con otro valor de {', '.join(different)}")
+        regressions = compare(results, baseline, args.tolerance)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResultados guardados en: {args.save_baseline}")
+    errors = [name for name, result in results.items() if result['errors']]
+    if errors:
+        print(f"\nCon errores: {', '.join(errors)}")
+    if regressions:
+        print(f"\nEmpeoran: {', '.join(regressions)}")
+    if regressions or errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Informe HTML de ReconBot: plantilla de Django frente al f-string original.
+
+    python -m benchmarks.bench_html_report [--urls 50000] [--dns 10000] [--repeat 3]
+
+Genera un informe sintético con muchas URLs de dorks y registros DNS, y
+mide tiempo y pico de memoria de cada implementación (tracemalloc).
+"""
+from functools import partial
+import argparse
+import html
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from reconbot.report_html import render_html_report
+
+DNS_TYPES = ['A', 'AAAA', 'MX', 'NS', 'TXT']
+
+
+def synthetic_results(url_count: int, dns_count: int, seed: int):
+    rng = random.Random(seed)
+    dorks = [f'site:example.com inurl:{word} "<{index}>"'
+             for index, word in enumerate(['admin', 'backup', 'login', 'api', 'config'] * 20)]
+    dork_results = {dork: [] for dork in dorks}
+    for index in range(url_count):
+        dork_results[dorks[index % len(dorks)]].append(
+            f"https://www{rng.randint(1, 50)}.example.com/{rng.choice(['a', 'b', 'c'])}/{index}?q=x&y=<z>")
+    dns_records = {record_type: [] for record_type in DNS_TYPES}
+    for index in range(dns_count):
+        dns_records[DNS_TYPES[index % len(DNS_TYPES)]].append(
+            f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}")
+    return {
+        "dns_records": dns_records,
+        "whois_info": {"registrar": "Example & Co", "creation_date": "2001-01-01",
+                       "name_servers": ["ns1.example.com", "ns2.example.com"], "status": ["ok"]},
+        "dork_results": dork_results,
+    }
+
+
+# Página de la versión anterior sin la hoja de estilos (su coste es constante)
+LEGACY_PAGE = """<!DOCTYPE html>
+<html lang="es">
+<head><meta charset="UTF-8"><title>Informe de Seguridad - {domain}</title></head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Informe de Seguridad</h1>
+            <h2>Dominio: {domain}</h2>
+            <p class="timestamp">Fecha: {timestamp}</p>
+        </div>
+        <div class="section"><h2>Resumen del Análisis</h2><div class="summary">{summary}</div></div>
+        <div class="section"><h2>Registros DNS</h2>{dns_records}</div>
+        <div class="section"><h2>Información WHOIS</h2>{whois_info}</div>
+        <div class="section"><h2>Resultados de Búsquedas Dork</h2>{dork_results}</div>
+    </div>
+</body>
+</html>
+"""
+
+
+def legacy_render(output_file, domain, results, summary, escape=lambda value: value):
+    """Equivalente a la versión anterior: concatenación con += y un único f-string.
+
+    La versión anterior no escapaba los valores; con `escape=html.escape` la
+    comparación con la plantilla hace el mismo trabajo.
+    """
+    dns_html = ""
+    for record_type, records in results['dns_records'].items():
+        dns_html += f'<div class="dns-record">'
+        dns_html += f'<h3>{escape(record_type)}</h3>'
+        for record in records:
+            dns_html += f'<p>  - {escape(record)}</p>'
+        dns_html += '</div>'
+    whois_html = ""
+    for key, value in results['whois_info'].items():
+        whois_html += f'<div class="whois-info">'
+        if isinstance(value, list):
+            whois_html += f'<h3>{escape(key)}</h3>'
+            for item in value:
+                whois_html += f'<p>  - {escape(item)}</p>'
+        else:
+            whois_html += f'<p><strong>{escape(key)}:</strong> {escape(str(value))}</p>'
+        whois_html += '</div>'
+    dork_html = ""
+    for dork, urls in results['dork_results'].items():
+        dork_html += f'<div class="dork-result">'
+        dork_html += f'<h3>Búsqueda: {escape(dork)}</h3>'
+        for url in urls:
+            dork_html += f'<p><a href="{escape(url)}" class="url" target="_blank">{escape(url)}</a></p>'
+        dork_html += '</div>'
+
+    html_content = LEGACY_PAGE.format(
+        domain=domain, timestamp='2024-01-01 00:00:00', summary=escape(summary).replace('\n', '<br>'),
+        dns_records=dns_html, whois_info=whois_html, dork_results=dork_html)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+
+
+def template_render(output_file, domain, results, summary):
+    render_html_report(output_file, domain, results, summary, timestamp='2024-01-01 00:00:00')
+
+
+def measure(render, output_file, results, summary, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render(output_file, 'example.com', results, summary)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    render(output_file, 'example.com', results, summary)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, os.path.getsize(output_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--urls', type=int, default=50000)
+    parser.add_argument('--dns', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    results = synthetic_results(args.urls, args.dns, args.seed)
+    summary = "Resumen ejecutivo\n" * 200
+    print(f"Informe sintético: {args.urls} URLs, {args.dns} registros DNS")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, render in [('f-string + concatenación', legacy_render),
+                             ('f-string con escape', partial(legacy_render, escape=html.escape)),
+                             ('plantilla de Django', template_render)]:
+            seconds, peak, size = measure(
+                render, os.path.join(directory, 'report.html'), results, summary, args.repeat)
+            print(f"  {name:<26} {seconds * 1000:8.1f} ms   pico {peak / 2 ** 20:7.2f} MiB   "
+                  f"salida {size / 2 ** 20:6.2f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+"""Rendimiento de los escáneres y de ReconBot contra servidores locales.
+
+    python -m benchmarks.bench_scanners [--scale 1.0] [--concurrency 16] [--only dns whois]
+        [--delay 0.0] [--no-memory] [--save-baseline [FICHERO]] [--baseline [FICHERO]]
+
+Arranca los sustitutos de benchmarks/stubs (DNS, WHOIS, buscador y `nmap`),
+así que no sale nada a Internet y los resultados se pueden repetir. Cada
+escenario hace `--scale` veces su número de operaciones con `--concurrency`
+hilos o corrutinas y muestra ops/s, latencias p50/p99, errores y el pico de
+memoria de Python (una segunda pasada con tracemalloc de hasta 200
+operaciones). `--delay` añade esa latencia a cada respuesta de los
+servidores, para parecerse más a la red real.
+
+Con `--save-baseline` se guardan los resultados en JSON; con `--baseline`
+se comparan con unos guardados y se termina con código 1 si algún escenario
+pierde más de `--tolerance` en ops/s o en p99.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.stubs import StubProcess, fake_nmap
+from benchmarks.stubs.dns_server import DnsStubServer, resolver
+from benchmarks.stubs.search_server import SearchStubServer
+from benchmarks.stubs.whois_server import WhoisStubServer, whois_query
+from core.infrastructure.cache.dns_cache import DnsAnswerCache
+from core.infrastructure.cache.whois_cache import WhoisCache
+from core.infrastructure.scanners.dns_scan import DnsScannerImpl
+from core.infrastructure.scanners.google_dorks import GoogleDorkScannerImpl
+from core.infrastructure.scanners.nmap_scan import NmapScannerImpl
+from core.infrastructure.scanners.whois_scan import WhoisScannerImpl
+from core.infrastructure.whois.client import WhoisClient
+
+RECONBOT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'reconbot')
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'scanners.json')
+DNS_TYPES = ['A', 'AAAA', 'MX', 'NS', 'TXT']
+MEMORY_OPS = 200
+# Dominios distintos de los escenarios con caché: todas las operaciones después del calentamiento son aciertos
+CACHED_DOMAINS = 100
+
+
+@dataclass
+class Scenario:
+    name: str
+    ops: int
+    # op(i) hace la operación i; con `asynchronous` devuelve una corrutina
+    op: Callable[[int], Any]
+    # failed(resultado) indica si la operación devolvió un error
+    failed: Callable[[Any], bool]
+    asynchronous: bool = False
+    # Sin `concurrent` las operaciones se hacen de una en una
+    concurrent: bool = True
+    setup: Optional[Callable[[], None]] = None
+
+
+@dataclass
+class Result:
+    ops: int
+    seconds: float
+    ops_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    errors: int
+    peak_mib: Optional[float] = None
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Percentil por rango más cercano de una lista ordenada."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(q * len(values))) - 1))]
+
+
+def run_threads(scenario: Scenario, ops: int, concurrency: int):
+    def timed(index: int):
+        start = time.perf_counter()
+        try:
+            failed = scenario.failed(scenario.op(index))
+        except Exception:
+            failed = True
+        return time.perf_counter() - start, failed
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(timed, range(ops)))
+
+
+def run_async(scenario: Scenario, ops: int, concurrency: int):
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def timed(index: int):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    failed = scenario.failed(await scenario.op(index))
+                except Exception:
+                    failed = True
+                return time.perf_counter() - start, failed
+
+        return await asyncio.gather(*(timed(index) for index in range(ops)))
+
+    return asyncio.run(main())
+
+
+def measure(scenario: Scenario, concurrency: int, memory: bool) -> Result:
+    run = run_async if scenario.asynchronous else run_threads
+    workers = concurrency if scenario.concurrent else 1
+    if scenario.setup is not None:
+        scenario.setup()
+    start = time.perf_counter()
+    samples = run(scenario, scenario.ops, workers)
+    seconds = time.perf_counter() - start
+    latencies = sorted(latency for latency, _ in samples)
+    result = Result(ops=scenario.ops, seconds=round(seconds, 3),
+                    ops_per_sec=round(scenario.ops / seconds, 1),
+                    p50_ms=round(percentile(latencies, 0.50) * 1000, 2),
+                    p99_ms=round(percentile(latencies, 0.99) * 1000, 2),
+                    errors=sum(failed for _, failed in samples))
+    if memory:
+        tracemalloc.start()
+        try:
+            run(scenario, min(scenario.ops, MEMORY_OPS), workers)
+            result.peak_mib = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def dns_failed(records) -> bool:
+    return any(record.status != 'ok' for record in records)
+
+
+def whois_failed(info) -> bool:
+    return info.registrar in (None, 'Error')
+
+
+def dork_failed(result) -> bool:
+    return not result.results or any('error' in item for item in result.results)
+
+
+def nmap_failed(result) -> bool:
+    results = result if isinstance(result, list) else [result]
+    return not results or any(not item.ports or 'error' in item.ports[0] for item in results)
+
+
+def reconbot_failed(results) -> bool:
+    stages = results['stage_timings']
+    return (any(str(timing.get('status', 'ok')) != 'ok' for name, timing in stages.items() if name != 'total')
+            or not results['dns_records'].get('A') or not results['whois_info']
+            or not any(results['dork_results'].values()) or not results['ai_analysis'])
+
+
+def scenarios(stubs: Dict[str, StubProcess], scale: float, workdir: str) -> List[Scenario]:
+    def count(base: int) -> int:
+        return max(1, int(base * scale))
+
+    dns = DnsScannerImpl(resolver=resolver(stubs['dns'].address))
+    cached_dns = DnsScannerImpl(resolver=resolver(stubs['dns'].address), cache=DnsAnswerCache())
+    whois_cold = WhoisScannerImpl(client=WhoisClient(
+        cache=None, tld_rate=0, query=whois_query(stubs['whois'].address)))
+    whois_cached = WhoisScannerImpl(client=WhoisClient(
+        cache=WhoisCache(os.path.join(workdir, 'whois_cache.sqlite3')), tld_rate=0,
+        query=whois_query(stubs['whois'].address)))
+    search_url = 'http://%s:%d' % stubs['search'].address
+    dork = GoogleDorkScannerImpl(search_url=f'{search_url}/search', num_results=30)
+    nmap = NmapScannerImpl(arguments='-sV', shard_size=64, max_workers=4)
+
+    def warm(scan: Callable[[int], Any]) -> Callable[[], None]:
+        return lambda: [scan(index) for index in range(CACHED_DOMAINS)]
+
+    return [
+        Scenario('dns.scan', count(2000), lambda i: dns.scan(f'host{i}.bench.test', DNS_TYPES[i % 5]), dns_failed),
+        Scenario('dns.scan_many_async', count(1000),
+                 lambda i: dns.scan_many_async(f'host{i}.bench.test', DNS_TYPES), dns_failed, asynchronous=True),
+        Scenario('dns.cached', count(50000),
+                 lambda i: cached_dns.scan(f'host{i % CACHED_DOMAINS}.bench.test', 'A'), dns_failed,
+                 setup=warm(lambda i: cached_dns.scan(f'host{i}.bench.test', 'A'))),
+        Scenario('whois.scan', count(1000), lambda i: whois_cold.scan(f'domain{i}.com'), whois_failed),
+        Scenario('whois.cached', count(10000),
+                 lambda i: whois_cached.scan(f'domain{i % CACHED_DOMAINS}.com'), whois_failed,
+                 setup=warm(lambda i: whois_cached.scan(f'domain{i}.com'))),
+        Scenario('dork.scan', count(300), lambda i: dork.scan(f'site:bench{i}.test admin'), dork_failed),
+        Scenario('dork.scan_async', count(300),
+                 lambda i: dork.scan_async(f'site:bench{i}.test admin'), dork_failed, asynchronous=True),
+        Scenario('nmap.scan', count(100), lambda i: nmap.scan(f'10.0.{i >> 8 & 255}.{i & 255}', '22,80,443'),
+                 nmap_failed),
+        Scenario('nmap.scan_async', count(100),
+                 lambda i: nmap.scan_async(f'10.1.{i >> 8 & 255}.{i & 255}', '22,80,443'), nmap_failed,
+                 asynchronous=True),
+        # Cada barrido de una /22 son 16 invocaciones de nmap repartidas en el pool de procesos
+        Scenario('nmap.sweep', count(5), lambda i: nmap.sweep(f'10.2.{i * 4 & 255}.0/22', '1-1024'),
+                 nmap_failed, concurrent=False),
+        Scenario('reconbot.run_analysis', count(20), reconbot_analysis(stubs, workdir), reconbot_failed),
+    ]
+
+
+def load_reconbot():
+    """Carga reconbot/reconbot.py por su ruta: `import reconbot` daría el paquete si ya se importó."""
+    if RECONBOT_DIR not in sys.path:
+        sys.path.insert(0, RECONBOT_DIR)
+    spec = importlib.util.spec_from_file_location('reconbot_script', os.path.join(RECONBOT_DIR, 'reconbot.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def reconbot_analysis(stubs: Dict[str, StubProcess], workdir: str) -> Callable[[int], Dict[str, Any]]:
+    """Análisis completo de ReconBot (sin caché WHOIS ni de resúmenes y con el modelo local)."""
+    reconbot = load_reconbot()
+
+    search_url = 'http://%s:%d' % stubs['search'].address
+    os.environ['API_URL'] = f'{search_url}/api/analyze/'
+    llm_client = reconbot.build_llm_client(stub=True, cache_file=None)
+    whois_client = WhoisClient(cache=None, tld_rate=0, query=whois_query(stubs['whois'].address))
+    # hallazgos/ (resultados e informes) se crea en el directorio actual
+    os.chdir(workdir)
+
+    def analyze(index: int) -> Dict[str, Any]:
+        return reconbot.ReconBot(
+            f'site{index}.com', llm_client=llm_client, whois_client=whois_client,
+            resolver=resolver(stubs['dns'].address), search_url=f'{search_url}/html/').run_analysis()
+    return analyze
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Escenarios que empeoran más de `tolerance` en ops/s o en p99 respecto a la línea base."""
+    print(f"\nComparación con la línea base del {baseline['meta']['date']}")
+    regressions = []
+    for name, result in results.items():
+        before = baseline['scenarios'].get(name)
+        if before is None:
+            continue
+        speed = result['ops_per_sec'] / before['ops_per_sec'] - 1 if before['ops_per_sec'] else 0.0
+        tail = result['p99_ms'] / before['p99_ms'] - 1 if before['p99_ms'] else 0.0
+        worse = speed < -tolerance or tail > tolerance
+        if worse:
+            regressions.append(name)
+        print(f"  {name:<24} ops/s {speed:+7.1%}   p99 {tail:+7.1%}{'   <-- peor' if worse else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiplica el número de operaciones de cada escenario')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--only', nargs='+', metavar='PREFIJO',
+                        help='Sólo los escenarios que empiezan así (p.ej. dns whois.cached)')
+    parser.add_argument('--delay', type=float, default=0.0,
+                        help='Latencia añadida a cada respuesta de los servidores locales (segundos)')
+    parser.add_argument('--no-memory', action='store_true', help='No medir el pico de memoria')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, metavar='FICHERO')
+    parser.add_argument('--baseline', nargs='?', const=DEFAULT_BASELINE, metavar='FICHERO')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Empeoramiento admitido frente a la línea base (por defecto 0.2 = 20%%)')
+    args = parser.parse_args()
+    baseline_file = os.path.abspath(args.baseline) if args.baseline else None
+    save_file = os.path.abspath(args.save_baseline) if args.save_baseline else None
+
+    with tempfile.TemporaryDirectory() as workdir, \
+            StubProcess(DnsStubServer, delay=args.delay) as dns_stub, \
+            StubProcess(WhoisStubServer, delay=args.delay) as whois_stub, \
+            StubProcess(SearchStubServer, delay=args.delay) as search_stub:
+        # Antes de crear el primer PortScanner, que busca `nmap` en PATH
+        fake_nmap.install(workdir, delay=args.delay)
+        os.environ['PATH'] = workdir + os.pathsep + os.environ.get('PATH', '')
+        stubs = {'dns': dns_stub, 'whois': whois_stub, 'search': search_stub}
+        selected = [scenario for scenario in scenarios(stubs, args.scale, workdir)
+                    if not args.only or any(scenario.name.startswith(prefix) for prefix in args.only)]
+
+        print(f"{'escenario':<24} {'ops':>7} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errores':>8} {'MiB':>8}")
+        results = {}
+        cwd = os.getcwd()
+        try:
+            for scenario in selected:
+                # ReconBot y los escáneres escriben su progreso por pantalla
+                with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+                    result = measure(scenario, args.concurrency, not args.no_memory)
+                results[scenario.name] = asdict(result)
+                peak = '-' if result.peak_mib is None else f'{result.peak_mib:.1f}'
+                print(f"{scenario.name:<24} {result.ops:>7} {result.ops_per_sec:>10,.1f} {result.p50_ms:>9.2f} "
+                      f"{result.p99_ms:>9.2f} {result.errors:>8} {peak:>8}")
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        'meta': {'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                 'python': platform.python_version(), 'platform': platform.platform(),
+                 'cpus': os.cpu_count(), 'scale': args.scale, 'concurrency': args.concurrency,
+                 'delay': args.delay},
+        'scenarios': results,
+    }
+    regressions = []
+    if baseline_file:
+        with open(baseline_file, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+    if save_file:
+        os.makedirs(os.path.dirname(save_file), exist_ok=True)
+        with open(save_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResultados guardados en: {save_file}")
+    if regressions:
+        print(f"\nEmpeoran: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
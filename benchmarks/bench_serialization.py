@@ -0,0 +1,107 @@
+"""Serialización de respuestas grandes: EntityEncoder frente a los serializers de DRF.
+
+    python -m benchmarks.bench_serialization [--records 100000] [--hosts 1000] [--repeat 3]
+
+Mide una respuesta DNS de `--records` registros y una de Nmap con el mismo
+número de puertos repartidos entre `--hosts` hosts: datos (`.data` o
+encode) y datos más JSON (JSONRenderer, como hace la vista). También compara
+la memoria de las entidades con slots frente a un dataclass normal.
+"""
+from dataclasses import dataclass
+import argparse
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api import encoders  # noqa: E402
+from api.serializers import DNSRecordSerializer, NmapScanResultSerializer  # noqa: E402
+from core.domain.entities import DNSRecord, NmapScanResult  # noqa: E402
+
+DNS_TYPES = ['A', 'AAAA', 'MX', 'NS', 'TXT']
+
+
+@dataclass
+class LegacyDNSRecord:
+    """DNSRecord tal como era antes (con __dict__ por instancia)."""
+    type: str
+    value: str
+    status: str = "ok"
+
+
+def dns_records(count: int, cls=DNSRecord):
+    return [cls(type=DNS_TYPES[index % len(DNS_TYPES)],
+                value=f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}")
+            for index in range(count)]
+
+
+def nmap_results(port_count: int, hosts: int):
+    per_host = max(1, port_count // hosts)
+    return [NmapScanResult(
+        target=f"10.0.{host >> 8 & 255}.{host & 255}",
+        ports=[{"port": port, "state": "open", "service": "http", "version": "nginx 1.25"}
+               for port in range(1, per_host + 1)],
+        services=["http"])
+        for host in range(hosts)]
+
+
+def best_of(repeat: int, func):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def compare(label: str, items, count: int, serializer_class, encoder, repeat: int):
+    renderer = JSONRenderer()
+    print(f"\n{label}")
+    drf_time, drf_data = best_of(repeat, lambda: serializer_class(items, many=True).data)
+    fast_time, fast_data = best_of(repeat, lambda: encoder.encode_many(items))
+    assert renderer.render(drf_data) == renderer.render(fast_data)
+    drf_total, _ = best_of(repeat, lambda: renderer.render(serializer_class(items, many=True).data))
+    fast_total, _ = best_of(repeat, lambda: renderer.render(encoder.encode_many(items)))
+    for name, data_time, total in [('DRF', drf_time, drf_total), ('encoder', fast_time, fast_total)]:
+        print(f"  {name:<8} datos {data_time:7.3f} s ({count / data_time:11,.0f}/s)"
+              f"   datos+JSON {total:7.3f} s ({count / total:11,.0f}/s)")
+    print(f"  aceleración: datos x{drf_time / fast_time:.1f}, datos+JSON x{drf_total / fast_total:.1f}")
+
+
+def entity_memory(count: int, cls) -> int:
+    tracemalloc.start()
+    records = dns_records(count, cls)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=100_000)
+    parser.add_argument('--hosts', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    compare(f"DNS: {args.records:,} registros", dns_records(args.records), args.records,
+            DNSRecordSerializer, encoders.dns_record, args.repeat)
+    results = nmap_results(args.records, args.hosts)
+    ports = sum(len(result.ports) for result in results)
+    compare(f"Nmap: {ports:,} puertos en {args.hosts:,} hosts", results, ports,
+            NmapScanResultSerializer, encoders.nmap_result, args.repeat)
+
+    print(f"\nMemoria de {args.records:,} DNSRecord")
+    legacy, slotted = entity_memory(args.records, LegacyDNSRecord), entity_memory(args.records, DNSRecord)
+    print(f"  dataclass      {legacy / 2**20:7.1f} MiB")
+    print(f"  slots, frozen  {slotted / 2**20:7.1f} MiB  ({1 - slotted / legacy:.0%} menos)")
+
+
+if __name__ == '__main__':
+    main()
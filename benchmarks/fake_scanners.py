@@ -0,0 +1,159 @@
+"""Escáneres falsos y deterministas para medir la API sin salir a la red.
+
+Implementan los mismos Protocols que los reales (versiones síncronas, en
+streaming y asíncronas) y devuelven siempre los mismos resultados para el
+mismo objetivo. `latency` simula la espera de la red de cada operación:
+time.sleep en las síncronas y asyncio.sleep en las asíncronas, así que las
+vistas se comportan como con los escáneres reales (hilo ocupado o no).
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Union
+import asyncio
+import time
+import zlib
+
+from core.domain.entities import DNSRecord, GoogleDorkResult, NmapScanResult, WhoisInfo
+from core.infrastructure.adapters.container import ScannerContainer
+from core.infrastructure.scanners.nmap_scan import expand_targets
+
+DNS_VALUES = {
+    'A': lambda domain, h: [f"10.{h >> 16 & 255}.{h >> 8 & 255}.{h & 255}"],
+    'AAAA': lambda domain, h: [f"fd00::{h & 0xffff:x}"],
+    'MX': lambda domain, h: [f"10 mail.{domain}.", f"20 mail2.{domain}."],
+    'NS': lambda domain, h: [f"ns1.{domain}.", f"ns2.{domain}."],
+    'TXT': lambda domain, h: ['"v=spf1 -all"'],
+}
+PORTS = {22: ('ssh', 'OpenSSH 9.6'), 80: ('http', 'nginx 1.25.3'), 443: ('https', 'nginx 1.25.3')}
+
+
+def _seed(value: str) -> int:
+    return zlib.crc32(value.lower().encode())
+
+
+class _Latency:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def _wait(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    async def _wait_async(self) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+class FakeGoogleDorkScanner(_Latency):
+    def __init__(self, latency: float = 0.0, num_results: int = 10):
+        super().__init__(latency)
+        self.num_results = num_results
+
+    def _results(self, query: str) -> List[Dict[str, Any]]:
+        site = _seed(query) % 97
+        return [{"title": f"Resultado {index}", "url": f"https://site{site}.bench.test/admin/{index}.env"}
+                for index in range(self.num_results)]
+
+    def scan(self, query: str) -> GoogleDorkResult:
+        self._wait()
+        return GoogleDorkResult(query=query, results=self._results(query))
+
+    def iter_scan(self, query: str) -> Iterator[Dict[str, Any]]:
+        self._wait()
+        yield from self._results(query)
+
+    async def scan_async(self, query: str) -> GoogleDorkResult:
+        await self._wait_async()
+        return GoogleDorkResult(query=query, results=self._results(query))
+
+
+class FakeDnsScanner(_Latency):
+    @staticmethod
+    def _records(domain: str, record_type: str) -> List[DNSRecord]:
+        values = DNS_VALUES.get(record_type.upper())
+        if values is None:
+            return [DNSRecord(type=record_type, value="The DNS response does not contain an answer",
+                              status="no_answer")]
+        return [DNSRecord(type=record_type, value=value) for value in values(domain, _seed(domain))]
+
+    def scan(self, domain: str, record_type: str) -> List[DNSRecord]:
+        self._wait()
+        return self._records(domain, record_type)
+
+    def scan_many(self, domain: str, record_types: Iterable[str]) -> List[DNSRecord]:
+        # Como el escáner real, todos los tipos se resuelven a la vez: una sola espera
+        self._wait()
+        return [record for record_type in record_types for record in self._records(domain, record_type)]
+
+    def iter_scan(self, domain: str, record_types: Iterable[str]) -> Iterator[DNSRecord]:
+        self._wait()
+        for record_type in record_types:
+            yield from self._records(domain, record_type)
+
+    async def scan_async(self, domain: str, record_type: str) -> List[DNSRecord]:
+        await self._wait_async()
+        return self._records(domain, record_type)
+
+    async def scan_many_async(self, domain: str, record_types: Iterable[str]) -> List[DNSRecord]:
+        await self._wait_async()
+        return [record for record_type in record_types for record in self._records(domain, record_type)]
+
+
+class FakeWhoisScanner(_Latency):
+    @staticmethod
+    def _info(domain: str) -> WhoisInfo:
+        year = 1995 + _seed(domain) % 25
+        domain = domain.strip().lower()
+        return WhoisInfo(domain=domain, registrar="Bench Registrar, Inc.",
+                         creation_date=f"{year}-08-14 04:00:00", expiration_date=f"{year + 30}-08-13 04:00:00",
+                         name_servers=[f"ns1.{domain}", f"ns2.{domain}"], status=["clientTransferProhibited"])
+
+    def scan(self, domain: str) -> WhoisInfo:
+        self._wait()
+        return self._info(domain)
+
+    async def scan_async(self, domain: str) -> WhoisInfo:
+        await self._wait_async()
+        return self._info(domain)
+
+
+class FakeNmapScanner(_Latency):
+    @staticmethod
+    def _result(target: str, ports: str = None) -> NmapScanResult:
+        wanted = [int(port) for port in ports.split(',') if port.isdigit()] if ports else list(PORTS)
+        found = [port for port in wanted if port in PORTS]
+        return NmapScanResult(
+            target=target,
+            ports=[{"port": port, "state": "open", "service": PORTS[port][0], "version": PORTS[port][1]}
+                   for port in found],
+            services=[PORTS[port][0] for port in found])
+
+    def scan(self, target: str, ports: str = None) -> NmapScanResult:
+        self._wait()
+        return self._result(target, ports)
+
+    def sweep(self, targets: Union[str, Iterable[str]], ports: str = None, progress=None) -> List[NmapScanResult]:
+        self._wait()
+        if progress is not None:
+            progress(1.0)
+        return [self._result(host, ports) for host in expand_targets(targets)]
+
+    def iter_scan(self, target: str, ports: str = None) -> Iterator[Dict[str, Any]]:
+        for result in self.sweep(target, ports):
+            for port in result.ports:
+                yield {"host": result.target, **port}
+
+    async def scan_async(self, target: str, ports: str = None) -> NmapScanResult:
+        await self._wait_async()
+        return self._result(target, ports)
+
+    async def sweep_async(self, targets: Union[str, Iterable[str]], ports: str = None) -> List[NmapScanResult]:
+        await self._wait_async()
+        return [self._result(host, ports) for host in expand_targets(targets)]
+
+
+def install(container: ScannerContainer, latency: float = 0.0) -> None:
+    """Sustituye los escáneres del contenedor; los use cases se reconstruyen con ellos."""
+    container.register("google_dork_scanner", lambda: FakeGoogleDorkScanner(latency))
+    container.register("dns_scanner", lambda: FakeDnsScanner(latency))
+    container.register("whois_scanner", lambda: FakeWhoisScanner(latency))
+    container.register("nmap_scanner", lambda: FakeNmapScanner(latency))
+    container.reset()
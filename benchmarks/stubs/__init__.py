@@ -0,0 +1,59 @@
+"""Servidores locales que sustituyen a Internet en los benchmarks.
+
+- `dns_server`: servidor DNS autoritativo (UDP) para cualquier dominio.
+- `whois_server`: servidor WHOIS (TCP, RFC 3912) con respuestas al estilo de .com.
+- `search_server`: páginas de resultados de Google y DuckDuckGo, y /api/analyze/.
+- `fake_nmap`: ejecutable `nmap` que devuelve XML como `nmap -oX -`.
+
+Cada servidor corre en su propio proceso (`StubProcess`) para que su CPU no
+se mezcle con la del código medido ni compita por el GIL.
+"""
+from typing import Any, Callable, Optional, Tuple
+import multiprocessing
+import socketserver
+
+
+def _serve(factory: Callable[..., socketserver.BaseServer], kwargs: dict, conn) -> None:
+    server = factory(("127.0.0.1", 0), **kwargs)
+    conn.send(server.server_address[1])
+    try:
+        server.serve_forever(poll_interval=0.2)
+    finally:
+        server.server_close()
+
+
+class StubProcess:
+    """Arranca `factory(("127.0.0.1", 0), **kwargs)` en otro proceso; usable con `with`."""
+
+    def __init__(self, factory: Callable[..., socketserver.BaseServer], **kwargs: Any):
+        self.factory = factory
+        self.kwargs = kwargs
+        self.port: Optional[int] = None
+        self._process: Optional[multiprocessing.Process] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return "127.0.0.1", self.port
+
+    def start(self) -> "StubProcess":
+        parent, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(self.factory, self.kwargs, child), daemon=True)
+        self._process.start()
+        if not parent.poll(10):
+            self.stop()
+            raise RuntimeError(f"El servidor {self.factory.__name__} no arrancó")
+        self.port = parent.recv()
+        return self
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join(5)
+            self._process = None
+
+    def __enter__(self) -> "StubProcess":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
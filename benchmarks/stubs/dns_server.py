@@ -0,0 +1,82 @@
+"""Servidor DNS autoritativo mínimo (UDP) para cualquier nombre.
+
+Las respuestas son deterministas: cada nombre tiene siempre las mismas
+direcciones. Los nombres cuya primera etiqueta empieza por "nx" no existen
+(NXDOMAIN) y los tipos sin datos responden sin registros (NoAnswer); ambas
+respuestas negativas llevan el SOA en la sección de autoridad, como las de
+un servidor real, para que la caché negativa del escáner funcione.
+"""
+import socketserver
+import time
+import zlib
+
+import dns.asyncresolver
+import dns.flags
+import dns.message
+import dns.name
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+
+# Todos los tipos que consulta el escáner, más SOA
+RECORDS = {
+    "A": lambda name, h: [f"10.{h >> 16 & 255}.{h >> 8 & 255}.{h & 255}", f"10.{h >> 8 & 255}.{h & 255}.1"],
+    "AAAA": lambda name, h: [f"fd00::{h & 0xffff:x}"],
+    "MX": lambda name, h: [f"10 mail.{name}.", f"20 mail2.{name}."],
+    "NS": lambda name, h: [f"ns1.{name}.", f"ns2.{name}."],
+    "TXT": lambda name, h: ['"v=spf1 -all"', f'"bench-verification={h}"'],
+    "SOA": lambda name, h: [f"ns1.{name}. hostmaster.{name}. 1 7200 3600 1209600 300"],
+}
+
+
+class DnsHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        data, sock = self.request
+        try:
+            query = dns.message.from_wire(data)
+        except Exception:
+            return
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        sock.sendto(self.server.answer(query).to_wire(), self.client_address)
+
+
+class DnsStubServer(socketserver.ThreadingUDPServer):
+    daemon_threads = True
+
+    def __init__(self, address, ttl: int = 300, delay: float = 0.0):
+        super().__init__(address, DnsHandler)
+        self.ttl = ttl
+        # Latencia añadida a cada respuesta (segundos), para simular la red
+        self.delay = delay
+
+    def answer(self, query: dns.message.Message) -> dns.message.Message:
+        response = dns.message.make_response(query)
+        response.flags |= dns.flags.AA
+        if not query.question:
+            response.set_rcode(dns.rcode.FORMERR)
+            return response
+        question = query.question[0]
+        name = question.name
+        text = name.to_text(omit_final_dot=True)
+        rdtype = dns.rdatatype.to_text(question.rdtype)
+        if text.split(".", 1)[0].startswith("nx"):
+            response.set_rcode(dns.rcode.NXDOMAIN)
+            response.authority.append(self._soa(name, text))
+        elif rdtype in RECORDS:
+            values = RECORDS[rdtype](text, zlib.crc32(text.encode()))
+            response.answer.append(dns.rrset.from_text(name, self.ttl, "IN", rdtype, *values))
+        else:
+            response.authority.append(self._soa(name, text))
+        return response
+
+    def _soa(self, name: dns.name.Name, text: str) -> dns.rrset.RRset:
+        return dns.rrset.from_text(name, self.ttl, "IN", "SOA", *RECORDS["SOA"](text, 0))
+
+
+def resolver(address):
+    """Resolver asíncrono de dnspython que pregunta sólo al servidor de `address`."""
+    result = dns.asyncresolver.Resolver(configure=False)
+    result.nameservers = [address[0]]
+    result.port = address[1]
+    return result
@@ -0,0 +1,125 @@
+"""Sustituto del ejecutable `nmap` que escribe XML como `nmap -oX -`.
+
+No envía ningún paquete: cada host de la línea de órdenes (IPs, CIDRs o
+nombres) aparece activo con los puertos pedidos con -p abiertos. De los
+rangos (p.ej. 1-1024) sólo se abren los puertos habituales de SERVICES, y
+sin -p se usan esos mismos. BENCH_NMAP_DELAY añade una espera por host
+(segundos) para simular la duración de un escaneo real.
+
+`install(directorio)` crea allí un `nmap` que lanza este script; basta con
+ponerlo al principio de PATH antes de crear el primer PortScanner.
+"""
+from typing import List
+from xml.sax.saxutils import quoteattr
+import ipaddress
+import os
+import stat
+import sys
+import time
+import zlib
+
+VERSION = "7.94"
+SERVICES = {21: ("ftp", "vsftpd", "3.0.5"), 22: ("ssh", "OpenSSH", "9.6"), 25: ("smtp", "Postfix", ""),
+            53: ("domain", "ISC BIND", "9.18"), 80: ("http", "nginx", "1.25.3"),
+            443: ("https", "nginx", "1.25.3"), 3306: ("mysql", "MySQL", "8.0.36"),
+            5432: ("postgresql", "PostgreSQL DB", "16.2"), 8080: ("http-proxy", "Apache Tomcat", "10.1")}
+# Opciones de nmap cuyo valor va en el argumento siguiente
+VALUE_OPTIONS = {"-p", "-oX", "-oN", "-oG", "-oA", "-iL", "-e", "-S", "-g", "-T", "--exclude",
+                 "--max-retries", "--host-timeout", "--min-rate", "--max-rate", "--scan-delay",
+                 "--script", "--script-args", "--top-ports", "--version-intensity"}
+MAX_HOSTS = 65536
+
+
+def parse_args(argv: List[str]):
+    hosts, ports, skip = [], None, False
+    for index, arg in enumerate(argv):
+        if skip:
+            skip = False
+        elif arg in VALUE_OPTIONS:
+            skip = True
+            if arg == "-p" and index + 1 < len(argv):
+                ports = argv[index + 1]
+        elif arg.startswith("-p") and len(arg) > 2:
+            ports = arg[2:]
+        elif not arg.startswith("-"):
+            hosts.extend(expand(arg))
+    return hosts, ports
+
+
+def expand(token: str) -> List[str]:
+    try:
+        network = ipaddress.ip_network(token, strict=False)
+    except ValueError:
+        return [token]
+    if network.num_addresses == 1:
+        return [str(network.network_address)]
+    return [str(address) for _, address in zip(range(MAX_HOSTS), network.hosts())]
+
+
+def open_ports(spec) -> List[int]:
+    if not spec:
+        return sorted(SERVICES)
+    ports = set()
+    for part in spec.replace("T:", "").split(","):
+        if "-" in part:
+            low, _, high = part.partition("-")
+            ports.update(port for port in SERVICES if int(low or 1) <= port <= int(high or 65535))
+        elif part:
+            ports.add(int(part))
+    return sorted(ports)
+
+
+def address_of(host: str) -> str:
+    try:
+        return str(ipaddress.ip_address(host))
+    except ValueError:
+        # Los nombres se "resuelven" siempre a la misma IP
+        seed = zlib.crc32(host.lower().encode())
+        return f"10.{seed >> 16 & 255}.{seed >> 8 & 255}.{seed & 255}"
+
+
+def host_xml(host: str, ports: List[int]) -> str:
+    address = address_of(host)
+    hostname = f'<hostname name={quoteattr(host)} type="user"/>' if address != host else ""
+    port_xml = "".join(
+        f'<port protocol="tcp" portid="{port}"><state state="open" reason="syn-ack" reason_ttl="64"/>'
+        f'<service name="{name}" product="{product}" version="{version}" method="probed" conf="10"/></port>'
+        for port in ports
+        for name, product, version in [SERVICES.get(port, ("unknown", "", ""))])
+    return (f'<host starttime="1" endtime="1"><status state="up" reason="syn-ack" reason_ttl="64"/>'
+            f'<address addr="{address}" addrtype="ipv{6 if ":" in address else 4}"/>'
+            f'<hostnames>{hostname}</hostnames><ports>{port_xml}</ports></host>')
+
+
+def main(argv: List[str]) -> int:
+    if "-V" in argv or "--version" in argv:
+        print(f"Nmap version {VERSION} ( https://nmap.org )")
+        return 0
+    hosts, spec = parse_args(argv)
+    ports = open_ports(spec)
+    delay = float(os.getenv("BENCH_NMAP_DELAY", "0"))
+    if delay:
+        time.sleep(delay * len(hosts))
+    args = quoteattr(" ".join(["nmap"] + argv))
+    services = ",".join(map(str, ports))
+    out = [f'<?xml version="1.0" encoding="UTF-8"?>'
+           f'<nmaprun scanner="nmap" args={args} start="1" startstr="" version="{VERSION}" xmloutputversion="1.05">'
+           f'<scaninfo type="syn" protocol="tcp" numservices="{len(ports)}" services="{services}"/>']
+    out.extend(host_xml(host, ports) for host in hosts)
+    out.append(f'<runstats><finished time="1" timestr="" elapsed="{delay * len(hosts):.2f}" exit="success"/>'
+               f'<hosts up="{len(hosts)}" down="0" total="{len(hosts)}"/></runstats></nmaprun>')
+    sys.stdout.write("".join(out) + "\n")
+    return 0
+
+
+def install(directory: str, delay: float = 0.0) -> str:
+    """Crea `directory/nmap` que ejecuta este script; devuelve su ruta."""
+    path = os.path.join(directory, "nmap")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'#!/bin/sh\nBENCH_NMAP_DELAY={delay} exec "{sys.executable}" "{os.path.abspath(__file__)}" "$@"\n')
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return path
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,89 @@
+"""Servidor HTTP con páginas de resultados enlatadas.
+
+- GET /search: página de Google (bloques `div.g`), paginada con start/num.
+- GET /html/: página de DuckDuckGo (enlaces `a.result__url`), como la que usa ReconBot.
+- POST /api/analyze/: respuesta fija de la API de análisis con IA.
+
+Los resultados dependen sólo de la consulta, así que dos ejecuciones del
+benchmark reciben exactamente las mismas páginas.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from html import escape
+from urllib.parse import parse_qs, urlsplit
+import json
+import time
+import zlib
+
+ANALYSIS = {"classification": "informational", "risk": "low",
+            "summary": "Respuesta fija del servidor de benchmarks"}
+
+
+class SearchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        query = params.get("q", "")
+        if url.path == "/search":
+            start = int(params.get("start", 0))
+            count = min(int(params.get("num", 10)), 10, max(0, self.server.results - start))
+            self._reply(200, "text/html", google_page(query, start, count))
+        elif url.path == "/html/":
+            self._reply(200, "text/html", duckduckgo_page(query, min(self.server.results, 10)))
+        else:
+            self._reply(404, "text/plain", "not found")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if urlsplit(self.path).path == "/api/analyze/":
+            self._reply(200, "application/json", json.dumps(ANALYSIS))
+        else:
+            self._reply(404, "text/plain", "not found")
+
+    def _reply(self, status: int, content_type: str, body: str):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SearchStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, results: int = 30, delay: float = 0.0):
+        super().__init__(address, SearchHandler)
+        # Resultados totales por consulta (las páginas son de 10, como en Google)
+        self.results = results
+        self.delay = delay
+
+
+def _results(query: str, start: int, count: int):
+    seed = zlib.crc32(query.encode())
+    for index in range(start, start + count):
+        yield (f"https://site{seed % 97}.bench.test/docs/{index}.html",
+               f"Resultado {index} de {escape(query)}")
+
+
+def google_page(query: str, start: int, count: int) -> str:
+    blocks = "".join(
+        f'<div class="g"><div><a href="{url}"><h3>{title}</h3></a>'
+        f'<span>Fragmento del resultado {index}</span></div></div>'
+        for index, (url, title) in enumerate(_results(query, start, count), start))
+    return f'<html><body><div id="search">{blocks}</div></body></html>'
+
+
+def duckduckgo_page(query: str, count: int) -> str:
+    blocks = "".join(
+        f'<div class="result"><h2 class="result__title">{title}</h2>'
+        f'<a class="result__url" href="{url}">{url}</a></div>'
+        for url, title in _results(query, 0, count))
+    return f'<html><body><div id="links">{blocks}</div></body></html>'
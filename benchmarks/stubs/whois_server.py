@@ -0,0 +1,80 @@
+"""Servidor WHOIS (RFC 3912) con respuestas al estilo del registro de .com.
+
+El cliente envía el dominio seguido de CRLF y el servidor responde y cierra
+la conexión. Los dominios cuya primera etiqueta empieza por "nx" no existen.
+python-whois siempre conecta al puerto 43 del servidor del TLD, así que
+`whois_query` habla el mismo protocolo contra el puerto del stub y analiza
+la respuesta con el parser de python-whois, como haría `whois.whois`.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Callable
+import socket
+import socketserver
+import time
+import zlib
+
+from whois.parser import WhoisEntry
+
+RESPONSE = """\
+   Domain Name: {domain}
+   Registry Domain ID: {id}_DOMAIN_COM-VRSN
+   Registrar WHOIS Server: whois.bench-registrar.test
+   Registrar URL: http://www.bench-registrar.test
+   Updated Date: {updated}
+   Creation Date: {created}
+   Registry Expiry Date: {expires}
+   Registrar: Bench Registrar, Inc.
+   Registrar IANA ID: 9999
+   Domain Status: clientDeleteProhibited https://icann.org/epp#clientDeleteProhibited
+   Domain Status: clientTransferProhibited https://icann.org/epp#clientTransferProhibited
+   Name Server: NS1.{domain}
+   Name Server: NS2.{domain}
+   DNSSEC: unsigned
+>>> Last update of whois database: {updated} <<<
+"""
+
+
+class WhoisHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        domain = self.rfile.readline(512).decode("utf-8", "replace").strip()
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        self.wfile.write(self.server.response(domain).encode("utf-8"))
+
+
+class WhoisStubServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, address, delay: float = 0.0):
+        super().__init__(address, WhoisHandler)
+        # Latencia añadida a cada respuesta (segundos); los servidores reales tardan cientos de ms
+        self.delay = delay
+
+    @staticmethod
+    def response(domain: str) -> str:
+        if domain.split(".", 1)[0].lower().startswith("nx"):
+            return f'No match for "{domain.upper()}".\r\n'
+        seed = zlib.crc32(domain.lower().encode())
+        created = datetime(1995, 1, 1) + timedelta(days=seed % 9000)
+        stamp = "%Y-%m-%dT%H:%M:%SZ"
+        return RESPONSE.format(
+            domain=domain.upper(), id=seed, created=created.strftime(stamp),
+            updated=(created + timedelta(days=3000)).strftime(stamp),
+            expires=(created + timedelta(days=11000)).strftime(stamp)).replace("\n", "\r\n")
+
+
+def whois_query(address) -> Callable[[str], Any]:
+    """Función de consulta para WhoisClient(query=...) que pregunta al stub de `address`."""
+    def query(domain: str) -> WhoisEntry:
+        with socket.create_connection(address, timeout=10) as conn:
+            conn.sendall(domain.encode("idna") + b"\r\n")
+            chunks = []
+            while True:
+                chunk = conn.recv(4096)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        return WhoisEntry.load(domain, b"".join(chunks).decode("utf-8", "replace"))
+    return query
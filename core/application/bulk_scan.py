@@ -0,0 +1,91 @@
+# core/application/bulk_scan.py
+"""Escaneo en bloque: N objetivos × M tipos de escaneo en una sola operación.
+
+Las subpeticiones idénticas se ejecutan una sola vez y todas corren a la
+vez, con un límite de concurrencia propio para cada escáner (nmap o las
+búsquedas admiten mucha menos concurrencia que DNS). El límite es del
+proceso (ScanLimiter): varias peticiones en bloque simultáneas lo comparten.
+"""
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Mapping, Tuple
+import asyncio
+import threading
+import weakref
+
+# Un runner recibe el objetivo y devuelve el resultado (serializable) de un escaneo
+ScanRunner = Callable[[str], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class ScanRequest:
+    scan: str
+    target: str
+
+
+def normalize_target(target: str) -> str:
+    # Dominios y direcciones no distinguen mayúsculas; el punto final del FQDN es opcional
+    return target.strip().lower().rstrip('.')
+
+
+def plan_requests(targets: Iterable[str], scans: Iterable[str]) -> List[ScanRequest]:
+    """Producto objetivos × escaneos sin duplicados, en el orden de la petición."""
+    targets = [target for target in dict.fromkeys(map(normalize_target, targets)) if target]
+    scans = list(dict.fromkeys(scans))
+    return [ScanRequest(scan, target) for target in targets for scan in scans]
+
+
+class ScanLimiter:
+    """Semáforos por escáner compartidos por todas las peticiones del proceso.
+
+    Un semáforo de asyncio sólo sirve en el bucle de eventos en el que se usa,
+    así que hay un juego por bucle (con uvicorn, uno por proceso).
+    """
+
+    def __init__(self, limits: Mapping[str, int]):
+        self.limits = limits
+        # Bucle de eventos -> {escáner: semáforo}; se liberan al cerrarse el bucle
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def semaphore(self, scan: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._semaphores.setdefault(loop, {})
+            if scan not in semaphores:
+                semaphores[scan] = asyncio.Semaphore(self.limits.get(scan, 1))
+            return semaphores[scan]
+
+
+class BulkScanUseCase:
+    def __init__(self, runners: Mapping[str, ScanRunner], limiter: ScanLimiter):
+        self.runners = runners
+        self.limiter = limiter
+
+    async def iter_results(self, requests: Iterable[ScanRequest]) -> AsyncIterator[Tuple[ScanRequest, Any]]:
+        """Entrega cada (subpetición, resultado) en cuanto termina; un fallo no detiene al resto."""
+        requests = list(dict.fromkeys(requests))
+
+        async def run(request: ScanRequest) -> Tuple[ScanRequest, Any]:
+            async with self.limiter.semaphore(request.scan):
+                try:
+                    return request, await self.runners[request.scan](request.target)
+                except Exception as e:
+                    return request, {"error": str(e)}
+
+        tasks = [asyncio.ensure_future(run(request)) for request in requests]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def execute(self, requests: Iterable[ScanRequest]) -> Dict[str, Dict[str, Any]]:
+        """Resultados agrupados por objetivo y tipo de escaneo: {objetivo: {escaneo: resultado}}."""
+        requests = list(dict.fromkeys(requests))
+        done = {request: result async for request, result in self.iter_results(requests)}
+        results: Dict[str, Dict[str, Any]] = {}
+        for request in requests:
+            results.setdefault(request.target, {})[request.scan] = done[request]
+        return results
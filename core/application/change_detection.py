@@ -0,0 +1,109 @@
+# core/application/change_detection.py
+"""Diferencias entre un resultado de escaneo y la última observación del mismo objetivo.
+
+Todas las funciones devuelven diccionarios serializables a JSON que sólo
+contienen lo que cambió; `has_changes` indica si un diff está vacío.
+"""
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+from core.domain.entities import NmapScanResult
+
+WHOIS_FIELDS = ('registrar', 'creation_date', 'expiration_date', 'name_servers', 'status')
+WHOIS_LIST_FIELDS = ('name_servers', 'status')
+
+
+def diff_values(before: Iterable[str], after: Iterable[str]) -> Dict[str, List[str]]:
+    before, after = set(before), set(after)
+    changes = {}
+    if after - before:
+        changes['added'] = sorted(after - before)
+    if before - after:
+        changes['removed'] = sorted(before - after)
+    return changes
+
+
+def diff_dns(before: Mapping[str, Iterable[str]],
+             after: Mapping[str, Iterable[str]]) -> Dict[str, Dict[str, List[str]]]:
+    """Registros añadidos y eliminados por tipo; sólo se comparan los tipos consultados ahora."""
+    changes = {}
+    for record_type, values in after.items():
+        record_changes = diff_values(before.get(record_type, ()), values)
+        if record_changes:
+            changes[record_type] = record_changes
+    return changes
+
+
+def _normalize_whois_value(field: str, value: Any) -> Any:
+    if field in WHOIS_LIST_FIELDS:
+        if not value:
+            return []
+        if isinstance(value, str):
+            value = [value]
+        # Los servidores de nombres llegan a veces en mayúsculas y en otro orden
+        return sorted({str(item).lower() for item in value})
+    # ReconBot guarda las fechas con str(), por lo que una fecha ausente es "None"
+    return '' if value is None or value == 'None' else str(value)
+
+
+def diff_whois(before: Optional[Mapping[str, Any]], after: Mapping[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Campos WHOIS cuyo valor cambió, con el valor anterior y el nuevo."""
+    before = before or {}
+    changes = {}
+    for field in WHOIS_FIELDS:
+        old = _normalize_whois_value(field, before.get(field))
+        new = _normalize_whois_value(field, after.get(field))
+        if old != new:
+            changes[field] = {'before': old, 'after': new}
+    return changes
+
+
+def failed(result: NmapScanResult) -> bool:
+    """El escaneo del host falló (el escáner devuelve una entrada {"error": ...})."""
+    return any(isinstance(port, dict) and 'error' in port for port in result.ports)
+
+
+def open_ports(results: Iterable[NmapScanResult]) -> Dict[str, Set[int]]:
+    """Puertos abiertos por host de un escaneo Nmap.
+
+    Los hosts cuyo escaneo falló se omiten, para no confundir un error con el
+    cierre de todos sus puertos; un host sin puertos abiertos tiene un conjunto vacío.
+    """
+    ports: Dict[str, Set[int]] = {}
+    for result in results:
+        if failed(result):
+            continue
+        host_ports = ports.setdefault(result.target, set())
+        for port in result.ports:
+            if isinstance(port, dict) and port.get('state') == 'open':
+                host_ports.add(int(port['port']))
+    return ports
+
+
+def diff_ports(before: Mapping[str, Iterable[int]],
+               after: Mapping[str, Iterable[int]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Puertos que se abrieron o cerraron; sólo se comparan los hosts escaneados ahora."""
+    opened, closed = [], []
+    for host, ports in after.items():
+        host_changes = diff_values(before.get(host, ()), ports)
+        opened += [{'host': host, 'port': port} for port in host_changes.get('added', [])]
+        closed += [{'host': host, 'port': port} for port in host_changes.get('removed', [])]
+    changes = {}
+    if opened:
+        changes['opened'] = opened
+    if closed:
+        changes['closed'] = closed
+    return changes
+
+
+def diff_urls(before: Iterable[str], after: Iterable[str]) -> Dict[str, List[str]]:
+    """URLs que no se habían visto antes (que una URL deje de aparecer no es relevante)."""
+    new = diff_values(before, after).get('added')
+    return {'new': new} if new else {}
+
+
+def has_changes(diff: Any) -> bool:
+    if isinstance(diff, Mapping):
+        return any(has_changes(value) for value in diff.values())
+    if isinstance(diff, (list, tuple, set)):
+        return bool(diff)
+    return diff is not None
@@ -0,0 +1,99 @@
+# core/application/single_flight.py
+"""Coalescencia de llamadas idénticas en curso ("single flight").
+
+Si varios hilos piden a la vez el mismo resultado (misma clave), sólo el
+primero ejecuta la función; el resto espera y recibe su resultado o su
+excepción. En cuanto la llamada termina la clave se libera: no es una caché.
+
+`do_async` hace lo mismo con corrutinas dentro de un bucle de eventos: la
+llamada corre en una tarea propia, así que cancelar a quien la inició no la
+cancela para los demás; sólo se cancela cuando ya no la espera nadie.
+"""
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+import asyncio
+import threading
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncCall:
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        # Las tareas pertenecen a un bucle: la clave incluye el bucle en el que corren
+        self._async_calls: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], _AsyncCall] = {}
+        self._lock = threading.Lock()
+        # Llamadas que reutilizaron el resultado de otra en curso
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        call_key = (loop, key)
+        with self._lock:
+            call = self._async_calls.get(call_key)
+            if call is None:
+                call = self._async_calls[call_key] = _AsyncCall(loop.create_task(fn()))
+                call.task.add_done_callback(lambda _: self._forget(call_key, call))
+            else:
+                self.coalesced += 1
+            call.waiters += 1
+
+        try:
+            # shield: cancelar a uno de los que esperan no cancela la llamada compartida
+            return await asyncio.shield(call.task)
+        finally:
+            with self._lock:
+                call.waiters -= 1
+                abandoned = call.waiters == 0 and not call.task.done()
+                # Una llamada nueva con la misma clave ya no debe unirse a la que se cancela
+                if abandoned and self._async_calls.get(call_key) is call:
+                    del self._async_calls[call_key]
+            if abandoned:
+                call.task.cancel()
+
+    def _forget(self, call_key, call: _AsyncCall) -> None:
+        with self._lock:
+            if self._async_calls.get(call_key) is call:
+                del self._async_calls[call_key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls) + len(self._async_calls)
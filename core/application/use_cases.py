@@ -1,31 +1,98 @@
-from core.domain.services import GoogleDorkScanner, DnsScanner, WhoisScanner, NmapScanner
-from core.domain.entities import GoogleDorkResult, DNSRecord, WhoisInfo, NmapScanResult
-from typing import List
+from core.domain.services import GoogleDorkScanner, DnsScanner, WhoisScanner, NmapScanner, UrlAnalyzer
+from core.domain.entities import GoogleDorkResult, DNSRecord, WhoisInfo, NmapScanResult, AIAnalysisResult
+from core.application.single_flight import SingleFlight
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+# Las ejecuciones idénticas en curso (mismo objetivo y opciones) se comparten con
+# SingleFlight: todos los que la piden reciben el mismo resultado, sin copiarlo.
+# Las respuestas en streaming y los barridos con progreso no se comparten.
+
+
+def _domain(domain: str) -> str:
+    return domain.strip().lower().rstrip('.')
+
+
+def _record_types(record_types: Iterable[str]) -> tuple:
+    return tuple(record_type.upper() for record_type in record_types)
+
 
 class GoogleDorkUseCase:
-    def __init__(self, scanner: GoogleDorkScanner):
+    def __init__(self, scanner: GoogleDorkScanner, flights: Optional[SingleFlight] = None):
         self.scanner = scanner
+        self.flights = flights or SingleFlight()
 
     def execute(self, query: str) -> GoogleDorkResult:
-        return self.scanner.scan(query)
+        return self.flights.do(query, lambda: self.scanner.scan(query))
+
+    def stream(self, query: str) -> Iterator[Dict[str, Any]]:
+        return self.scanner.iter_scan(query)
+
+    async def execute_async(self, query: str) -> GoogleDorkResult:
+        return await self.flights.do_async(query, lambda: self.scanner.scan_async(query))
 
 class DnsScanUseCase:
-    def __init__(self, scanner: DnsScanner):
+    def __init__(self, scanner: DnsScanner, flights: Optional[SingleFlight] = None):
         self.scanner = scanner
+        self.flights = flights or SingleFlight()
 
     def execute(self, domain: str, record_type: str) -> List[DNSRecord]:
-        return self.scanner.scan(domain, record_type)
+        return self.flights.do((_domain(domain), _record_types([record_type])),
+                               lambda: self.scanner.scan(domain, record_type))
+
+    def execute_many(self, domain: str, record_types: Iterable[str]) -> List[DNSRecord]:
+        record_types = list(record_types)
+        return self.flights.do((_domain(domain), _record_types(record_types)),
+                               lambda: self.scanner.scan_many(domain, record_types))
+
+    def stream(self, domain: str, record_types: Iterable[str]) -> Iterator[DNSRecord]:
+        return self.scanner.iter_scan(domain, record_types)
+
+    async def execute_async(self, domain: str, record_type: str) -> List[DNSRecord]:
+        return await self.flights.do_async((_domain(domain), _record_types([record_type])),
+                                           lambda: self.scanner.scan_async(domain, record_type))
+
+    async def execute_many_async(self, domain: str, record_types: Iterable[str]) -> List[DNSRecord]:
+        record_types = list(record_types)
+        return await self.flights.do_async((_domain(domain), _record_types(record_types)),
+                                           lambda: self.scanner.scan_many_async(domain, record_types))
 
 class WhoisScanUseCase:
-    def __init__(self, scanner: WhoisScanner):
+    def __init__(self, scanner: WhoisScanner, flights: Optional[SingleFlight] = None):
         self.scanner = scanner
+        self.flights = flights or SingleFlight()
 
     def execute(self, domain: str) -> WhoisInfo:
-        return self.scanner.scan(domain)
+        return self.flights.do(_domain(domain), lambda: self.scanner.scan(domain))
+
+    async def execute_async(self, domain: str) -> WhoisInfo:
+        return await self.flights.do_async(_domain(domain), lambda: self.scanner.scan_async(domain))
 
 class NmapScanUseCase:
-    def __init__(self, scanner: NmapScanner):
+    def __init__(self, scanner: NmapScanner, flights: Optional[SingleFlight] = None):
         self.scanner = scanner
+        self.flights = flights or SingleFlight()
 
     def execute(self, target: str, ports: str = None) -> NmapScanResult:
-        return self.scanner.scan(target, ports)
+        return self.flights.do((target.strip().lower(), ports or None),
+                               lambda: self.scanner.scan(target, ports))
+
+    def execute_sweep(self, targets: Union[str, Iterable[str]], ports: str = None,
+                      progress: Optional[Callable[[float], None]] = None) -> List[NmapScanResult]:
+        return self.scanner.sweep(targets, ports, progress)
+
+    def stream(self, target: str, ports: str = None) -> Iterator[Dict[str, Any]]:
+        return self.scanner.iter_scan(target, ports)
+
+    async def execute_async(self, target: str, ports: str = None) -> NmapScanResult:
+        return await self.flights.do_async((target.strip().lower(), ports or None),
+                                           lambda: self.scanner.scan_async(target, ports))
+
+    async def execute_sweep_async(self, targets: Union[str, Iterable[str]], ports: str = None) -> List[NmapScanResult]:
+        return await self.scanner.sweep_async(targets, ports)
+
+class AIAnalysisUseCase:
+    def __init__(self, analyzer: UrlAnalyzer):
+        self.analyzer = analyzer
+
+    def execute(self, results: Union[Iterable[str], Mapping[str, Iterable[str]]]) -> AIAnalysisResult:
+        return self.analyzer.analyze(results)
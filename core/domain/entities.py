@@ -1,36 +1,45 @@
-from dataclasses import dataclass
-from typing import List, Dict, Any
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
 
+# Entidades inmutables y con __slots__: sin __dict__ por instancia, que pesa en
+# las respuestas grandes (miles de registros DNS o puertos). Las listas de
+# dentro no se copian: no deben modificarse una vez creada la entidad.
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class GoogleDorkResult:
     query: str
-    results: List[str]
+    # {"title", "url"} por resultado, o {"error"} si la búsqueda falló
+    results: List[Dict[str, Any]]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DNSRecord:
     type: str
     value: str
+    # ok | nxdomain | no_answer | error; en los tres últimos `value` describe el motivo
+    status: str = "ok"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WhoisInfo:
-    registrar: str
-    creation_date: str
-    expiration_date: str
-    name_servers: List[str]
-    status: List[str]
+    domain: Optional[str] = None
+    registrar: Optional[str] = None
+    creation_date: Optional[str] = None
+    expiration_date: Optional[str] = None
+    name_servers: List[str] = field(default_factory=list)
+    status: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NmapScanResult:
     target: str
-    ports: List[str]
-    services: List[str]
+    # {"port", "state", "service", "version"} por puerto, o {"error"} si el escaneo falló
+    ports: List[Dict[str, Any]]
+    services: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AIAnalysisResult:
     classification: str
     confidence: float
@@ -1,5 +1,5 @@
-from typing import Protocol,List
-from .entities import GoogleDorkResult, DNSRecord, WhoisInfo, NmapScanResult
+from typing import Protocol,List,Iterable,Iterator,Callable,Optional,Union,Dict,Any,Mapping
+from .entities import GoogleDorkResult, DNSRecord, WhoisInfo, NmapScanResult, AIAnalysisResult
 
 class GoogleDorkScanner(Protocol):
     def scan(self, query: str) -> GoogleDorkResult:
@@ -9,6 +9,9 @@ class DnsScanner(Protocol):
     def scan(self, domain: str, record_type: str) -> List[DNSRecord]:
         ...
 
+    def scan_many(self, domain: str, record_types: Iterable[str]) -> List[DNSRecord]:
+        ...
+
 class WhoisScanner(Protocol):
     def scan(self, domain: str) -> WhoisInfo:
         ...
@@ -16,3 +19,55 @@ class WhoisScanner(Protocol):
 class NmapScanner(Protocol):
     def scan(self, target: str, ports: str = None) -> NmapScanResult:
         ...
+
+    def sweep(self, targets: Union[str, Iterable[str]], ports: str = None,
+              progress: Optional[Callable[[float], None]] = None) -> List[NmapScanResult]:
+        ...
+
+class UrlAnalyzer(Protocol):
+    def analyze(self, urls: Union[Iterable[str], Mapping[str, Iterable[str]]]) -> AIAnalysisResult:
+        ...
+
+
+# Versiones generadoras: entregan cada elemento en cuanto se obtiene
+class GoogleDorkStreamScanner(Protocol):
+    def iter_scan(self, query: str) -> Iterator[Dict[str, Any]]:
+        ...
+
+class DnsStreamScanner(Protocol):
+    def iter_scan(self, domain: str, record_types: Iterable[str]) -> Iterator[DNSRecord]:
+        ...
+
+class NmapStreamScanner(Protocol):
+    def iter_scan(self, target: str, ports: str = None) -> Iterator[Dict[str, Any]]:
+        ...
+
+
+# Modelos de lenguaje usados para redactar resúmenes
+class ChatClient(Protocol):
+    def complete(self, messages: List[Dict[str, str]], model: str, **params: Any) -> str:
+        ...
+
+
+# Versiones asíncronas: no ocupan un hilo mientras esperan la red
+class AsyncGoogleDorkScanner(Protocol):
+    async def scan_async(self, query: str) -> GoogleDorkResult:
+        ...
+
+class AsyncDnsScanner(Protocol):
+    async def scan_async(self, domain: str, record_type: str) -> List[DNSRecord]:
+        ...
+
+    async def scan_many_async(self, domain: str, record_types: Iterable[str]) -> List[DNSRecord]:
+        ...
+
+class AsyncWhoisScanner(Protocol):
+    async def scan_async(self, domain: str) -> WhoisInfo:
+        ...
+
+class AsyncNmapScanner(Protocol):
+    async def scan_async(self, target: str, ports: str = None) -> NmapScanResult:
+        ...
+
+    async def sweep_async(self, targets: Union[str, Iterable[str]], ports: str = None) -> List[NmapScanResult]:
+        ...
@@ -0,0 +1,85 @@
+# core/infrastructure/adapters/container.py
+"""Registro de los componentes compartidos por todo el proceso (escáneres, use cases...).
+
+Cada componente se construye una sola vez, la primera vez que se pide, y
+se reutiliza desde todos los hilos y corrutinas. Los componentes pueden
+ofrecer dos métodos opcionales:
+
+- `warm_up()`: prepara de antemano lo que cuesta crear (binarios, resolvers...).
+- `health()`: comprobación barata de su estado; devuelve un dict con detalles
+  y lanza una excepción si el componente no puede funcionar.
+"""
+from typing import Any, Callable, Dict
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ScannerContainer:
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        # Reentrante: la factoría de un use case pide su escáner al contenedor
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = self._instances[name] = self._factories[name]()
+        return instance
+
+    def peek(self, name: str) -> Any:
+        """La instancia ya construida, o None: no construye el componente."""
+        return self._instances.get(name)
+
+    def names(self):
+        return list(self._factories)
+
+    def reset(self) -> None:
+        """Descarta las instancias creadas; se reconstruyen en el siguiente get."""
+        with self._lock:
+            self._instances.clear()
+
+    def warm_up(self) -> Dict[str, float]:
+        """Construye y prepara todos los componentes; devuelve los segundos de cada uno.
+
+        Un componente que falla no impide preparar el resto: el error queda en
+        el log y lo mostrará `health`.
+        """
+        timings = {}
+        for name in self.names():
+            start = time.perf_counter()
+            try:
+                component = self.get(name)
+                if hasattr(component, 'warm_up'):
+                    component.warm_up()
+            except Exception as e:
+                logger.warning("No se pudo preparar el componente %s: %s", name, e)
+            timings[name] = time.perf_counter() - start
+        return timings
+
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """Estado de los componentes con `health` (o que no se pudieron construir).
+
+        Cada entrada es {'status': 'ok' | 'error', ...detalles}.
+        """
+        report = {}
+        for name in self.names():
+            try:
+                component = self.get(name)
+                if not hasattr(component, 'health'):
+                    continue
+                report[name] = {'status': 'ok', **(component.health() or {})}
+            except Exception as e:
+                report[name] = {'status': 'error', 'error': str(e)}
+        return report
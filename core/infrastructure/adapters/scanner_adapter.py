@@ -2,16 +2,130 @@ from core.infrastructure.scanners.google_dorks import GoogleDorkScannerImpl
 from core.infrastructure.scanners.dns_scan import DnsScannerImpl
 from core.infrastructure.scanners.whois_scan import WhoisScannerImpl
 from core.infrastructure.scanners.nmap_scan import NmapScannerImpl
-from core.application.use_cases import GoogleDorkUseCase, DnsScanUseCase, WhoisScanUseCase, NmapScanUseCase
+from core.infrastructure.analyzers.url_rules import DEFAULT_RULES_FILE, RuleRegistry
+from core.infrastructure.analyzers.url_sensitivity import UrlSensitivityAnalyzer
+from core.infrastructure.cache.dns_cache import DnsAnswerCache
+from core.infrastructure.cache.whois_cache import WhoisCache
+from core.infrastructure.whois.client import WhoisClient
+from core.infrastructure.adapters.container import ScannerContainer
+from core.infrastructure.metrics import instrument, registry
+from core.application.use_cases import GoogleDorkUseCase, DnsScanUseCase, WhoisScanUseCase, NmapScanUseCase, AIAnalysisUseCase
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+# Caché de respuestas DNS compartida por todas las peticiones del proceso
+dns_answer_cache = DnsAnswerCache(
+    max_entries=int(os.getenv("DNS_CACHE_MAX_ENTRIES", "4096")),
+    max_ttl=float(os.getenv("DNS_CACHE_MAX_TTL", "3600")),
+)
+
+# Consultas WHOIS: caché en disco (WHOIS_CACHE_DAYS=0 la desactiva) y límite por TLD
+WHOIS_CACHE_FILE = os.getenv("WHOIS_CACHE_FILE", "whois_cache.sqlite3")
+WHOIS_CACHE_DAYS = float(os.getenv("WHOIS_CACHE_DAYS", "7"))
+WHOIS_TLD_RATE = float(os.getenv("WHOIS_TLD_RATE", "0.5"))
+WHOIS_TLD_BURST = float(os.getenv("WHOIS_TLD_BURST", "3"))
+# Segundos que una consulta espera turno en su TLD antes de responder con error
+WHOIS_MAX_WAIT = float(os.getenv("WHOIS_MAX_WAIT", "10"))
+
+# Hilos para las consultas WHOIS de las vistas asíncronas (python-whois es bloqueante)
+whois_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("WHOIS_ASYNC_WORKERS", "32")), thread_name_prefix="whois")
+
+# Reparto de los barridos Nmap multi-host
+NMAP_SWEEP_SHARD_SIZE = int(os.getenv("NMAP_SWEEP_SHARD_SIZE", "64"))
+NMAP_SWEEP_WORKERS = int(os.getenv("NMAP_SWEEP_WORKERS", "4"))
+# Máximo de hosts por petición (CIDR, rangos y listas); las vistas rechazan los mayores con 400
+NMAP_SWEEP_MAX_HOSTS = int(os.getenv("NMAP_SWEEP_MAX_HOSTS", "4096"))
+
+# Reglas del analizador de URLs; se recargan solas al modificar el fichero
+url_rule_registry = RuleRegistry(
+    path=os.getenv("URL_RULES_FILE", DEFAULT_RULES_FILE),
+    check_interval=float(os.getenv("URL_RULES_CHECK_INTERVAL", "2")),
+)
+url_sensitivity_analyzer = UrlSensitivityAnalyzer(url_rule_registry)
+
+# Un escáner y un use case de cada tipo por proceso, compartidos por todas las peticiones
+container = ScannerContainer()
+container.register("google_dork_scanner", GoogleDorkScannerImpl)
+container.register("dns_scanner", lambda: DnsScannerImpl(cache=dns_answer_cache))
+container.register("whois_client", lambda: WhoisClient(
+    cache=WhoisCache(WHOIS_CACHE_FILE, ttl_days=WHOIS_CACHE_DAYS) if WHOIS_CACHE_DAYS > 0 else None,
+    tld_rate=WHOIS_TLD_RATE, tld_burst=WHOIS_TLD_BURST, max_wait=WHOIS_MAX_WAIT))
+container.register("whois_scanner", lambda: WhoisScannerImpl(
+    client=container.get("whois_client"), executor=whois_executor))
+container.register("nmap_scanner", lambda: NmapScannerImpl(
+    shard_size=NMAP_SWEEP_SHARD_SIZE, max_workers=NMAP_SWEEP_WORKERS, max_hosts=NMAP_SWEEP_MAX_HOSTS))
+container.register("url_analyzer", lambda: url_sensitivity_analyzer)
+# Los use cases se envuelven con `instrument`: latencia, errores y llamadas en curso por método
+container.register("google_dork_use_case", lambda: instrument(
+    GoogleDorkUseCase(container.get("google_dork_scanner")), "google_dork"))
+container.register("dns_scan_use_case", lambda: instrument(
+    DnsScanUseCase(container.get("dns_scanner")), "dns"))
+container.register("whois_scan_use_case", lambda: instrument(
+    WhoisScanUseCase(container.get("whois_scanner")), "whois"))
+container.register("nmap_scan_use_case", lambda: instrument(
+    NmapScanUseCase(container.get("nmap_scanner")), "nmap"))
+container.register("ai_analysis_use_case", lambda: instrument(
+    AIAnalysisUseCase(container.get("url_analyzer")), "ai_analysis"))
+
+
+def cache_metrics():
+    """Estadísticas de las cachés DNS y WHOIS, leídas en cada consulta a /metrics."""
+    dns_stats = dns_answer_cache.stats()
+    yield ("dns_cache_entries", "gauge", "Respuestas DNS en caché", {}, dns_stats["entries"])
+    for result in ("hit", "miss"):
+        yield ("dns_cache_requests_total", "counter", "Consultas a la caché DNS por resultado",
+               {"result": result}, dns_stats["hits" if result == "hit" else "misses"])
+    # El cliente WHOIS sólo se inspecciona si ya existe (crearlo abre la caché en disco)
+    whois_client = container.peek("whois_client")
+    if whois_client is None:
+        return
+    whois_stats = whois_client.stats()
+    yield ("whois_queries_total", "counter", "Consultas enviadas a servidores WHOIS", {}, whois_stats["queries"])
+    yield ("whois_coalesced_total", "counter", "Consultas WHOIS resueltas por otra idéntica en curso",
+           {}, whois_stats["coalesced"])
+    cache_stats = whois_stats.get("cache")
+    if cache_stats is not None:
+        yield ("whois_cache_entries", "gauge", "Respuestas WHOIS vigentes en caché", {}, cache_stats["entries"])
+        for result in ("hit", "miss"):
+            yield ("whois_cache_requests_total", "counter", "Consultas a la caché WHOIS por resultado",
+                   {"result": result}, cache_stats["hits" if result == "hit" else "misses"])
+
+
+def coalescing_metrics():
+    """Llamadas a los use cases resueltas con la ejecución idéntica de otra petición en curso."""
+    for name, scanner in USE_CASE_SCANNERS.items():
+        use_case = container.peek(name)
+        if use_case is None:
+            continue
+        yield ("use_case_coalesced_total", "counter",
+               "Llamadas que compartieron una ejecución idéntica en curso", {"scanner": scanner},
+               use_case.flights.coalesced)
+        yield ("use_case_flights_in_progress", "gauge", "Ejecuciones compartibles en curso",
+               {"scanner": scanner}, use_case.flights.in_flight())
+
+
+USE_CASE_SCANNERS = {
+    "google_dork_use_case": "google_dork",
+    "dns_scan_use_case": "dns",
+    "whois_scan_use_case": "whois",
+    "nmap_scan_use_case": "nmap",
+}
+
+registry.register_collector(cache_metrics)
+registry.register_collector(coalescing_metrics)
 
 def create_google_dork_use_case() -> GoogleDorkUseCase:
-    return GoogleDorkUseCase(GoogleDorkScannerImpl())
+    return container.get("google_dork_use_case")
 
 def create_dns_scan_use_case() -> DnsScanUseCase:
-    return DnsScanUseCase(DnsScannerImpl())
+    return container.get("dns_scan_use_case")
 
 def create_whois_scan_use_case() -> WhoisScanUseCase:
-    return WhoisScanUseCase(WhoisScannerImpl())
+    return container.get("whois_scan_use_case")
 
 def create_nmap_scan_use_case() -> NmapScanUseCase:
-    return NmapScanUseCase(NmapScannerImpl())
+    return container.get("nmap_scan_use_case")
+
+def create_ai_analysis_use_case() -> AIAnalysisUseCase:
+    return container.get("ai_analysis_use_case")
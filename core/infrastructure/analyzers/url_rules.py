@@ -0,0 +1,224 @@
+# core/infrastructure/analyzers/url_rules.py
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Set
+from urllib.parse import urlsplit
+import fnmatch
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(__file__), 'url_rules.json')
+
+SEVERITIES = ('info', 'low', 'medium', 'high', 'critical')
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UrlRule:
+    id: str
+    section: str
+    confidence: float
+    severity: str = 'medium'
+    description: str = ''
+    extensions: List[str] = field(default_factory=list)
+    keywords: List[str] = field(default_factory=list)
+    globs: List[str] = field(default_factory=list)
+    patterns: List[str] = field(default_factory=list)
+
+
+class KeywordAutomaton:
+    """Autómata Aho-Corasick para buscar todas las palabras clave en un solo recorrido.
+
+    La función de transición se precalcula completa (las transiciones al
+    estado inicial se omiten), por lo que el coste por URL depende de su
+    longitud y no del número de palabras clave.
+    """
+
+    def __init__(self, keywords: Dict[str, Iterable[int]]):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Set[int]] = [set()]
+        for keyword, rule_ids in keywords.items():
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append(set())
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].update(rule_ids)
+
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = list(goto[0].values())
+        for state in queue:
+            # Los hijos heredan las transiciones del estado de fallo (BFS)
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            outputs[state] |= outputs[fail[state]]
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(char, 0) if state else 0
+                queue.append(child)
+        self._delta = [{char: target for char, target in row.items() if target} for row in delta]
+        self._outputs: List[FrozenSet[int]] = [frozenset(out) for out in outputs]
+
+    def search(self, text: str) -> Set[int]:
+        delta = self._delta
+        outputs = self._outputs
+        found: Set[int] = set()
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+
+class CompiledRuleSet:
+    """Reglas compiladas en estructuras de búsqueda por tipo de condición.
+
+    - extensiones: tabla de sufijos (búsqueda O(1) por cada punto del último segmento)
+    - palabras clave: autómata Aho-Corasick
+    - globs sobre el path: una única regex combinada
+    - expresiones regulares: una regex combinada descarta las URLs sin coincidencias
+    """
+
+    def __init__(self, rules: List[UrlRule], recommendations: Dict[str, str]):
+        self.rules = rules
+        self.recommendations = recommendations
+        self.sections = list(dict.fromkeys(
+            list(recommendations) + [rule.section for rule in rules]))
+
+        self._suffixes: Dict[str, Set[int]] = {}
+        keywords: Dict[str, Set[int]] = {}
+        globs = []
+        patterns = []
+        for index, rule in enumerate(rules):
+            for extension in rule.extensions:
+                self._suffixes.setdefault(extension.lower().lstrip('.'), set()).add(index)
+            for keyword in rule.keywords:
+                keywords.setdefault(keyword.lower(), set()).add(index)
+            globs += [(index, glob.lower()) for glob in rule.globs]
+            patterns += [(index, pattern) for pattern in rule.patterns]
+
+        self._automaton = KeywordAutomaton(keywords) if keywords else None
+        # Lookaheads opcionales anclados al inicio: un solo match informa de todos los globs
+        self._globs = re.compile(''.join(
+            f'(?:(?=(?P<g{number}>{fnmatch.translate(glob)})))?'
+            for number, (_, glob) in enumerate(globs))) if globs else None
+        self._glob_rules = [index for index, _ in globs]
+        # La alternativa combinada sólo filtra: en cada posición informa de una sola
+        # alternativa, así que si encuentra algo se prueba cada expresión por separado
+        self._patterns = re.compile('|'.join(f'(?:{pattern})' for _, pattern in patterns)) if patterns else None
+        self._pattern_rules = [(index, re.compile(pattern)) for index, pattern in patterns]
+
+    def match(self, url: str) -> Set[int]:
+        """Índices de las reglas que cumple la URL."""
+        url = url.lower()
+        matched: Set[int] = set()
+
+        if self._suffixes:
+            tail = url.rsplit('/', 1)[-1]
+            dot = tail.find('.')
+            while dot != -1:
+                rule_ids = self._suffixes.get(tail[dot + 1:])
+                if rule_ids:
+                    matched |= rule_ids
+                dot = tail.find('.', dot + 1)
+
+        if self._automaton is not None:
+            matched |= self._automaton.search(url)
+
+        if self._globs is not None:
+            groups = self._globs.match(urlsplit(url).path or '/').groupdict()
+            matched.update(self._glob_rules[int(name[1:])]
+                           for name, value in groups.items() if value is not None)
+
+        if self._patterns is not None and self._patterns.search(url):
+            matched.update(index for index, pattern in self._pattern_rules
+                           if index not in matched and pattern.search(url))
+        return matched
+
+
+def _parse_rules(data: dict) -> CompiledRuleSet:
+    recommendations = {
+        name: section.get('recommendation', '') for name, section in data.get('sections', {}).items()}
+    rules = []
+    for raw in data.get('rules', []):
+        try:
+            rule = UrlRule(**raw)
+        except TypeError as e:
+            raise ValueError(f"Regla inválida {raw.get('id', raw)!r}: {e}")
+        if rule.severity not in SEVERITIES:
+            raise ValueError(f"Severidad desconocida en la regla {rule.id!r}: {rule.severity}")
+        if not (rule.extensions or rule.keywords or rule.globs or rule.patterns):
+            raise ValueError(f"La regla {rule.id!r} no define ninguna condición")
+        rules.append(rule)
+    return CompiledRuleSet(rules, recommendations)
+
+
+def load_rules(path: str) -> CompiledRuleSet:
+    """Carga y compila un fichero de reglas en JSON o YAML."""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("PyYAML no está instalado; use un fichero de reglas JSON")
+            try:
+                data = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise ValueError(f"YAML inválido: {e}")
+        else:
+            data = json.load(f)
+    return _parse_rules(data or {})
+
+
+class RuleRegistry:
+    """Reglas cargadas desde un fichero que se recargan solas cuando éste cambia.
+
+    Como mucho cada `check_interval` segundos se comprueba la fecha de
+    modificación del fichero; si cambió se recompila y se sustituye el
+    conjunto de reglas de forma atómica. Si la nueva versión es inválida se
+    siguen usando las reglas anteriores; si no se puede cargar al crearse se
+    usan las reglas por defecto hasta que el fichero sea válido.
+    """
+
+    def __init__(self, path: str = DEFAULT_RULES_FILE, check_interval: float = 2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        try:
+            self._mtime = os.stat(path).st_mtime_ns
+            self._rules = load_rules(path)
+        except (OSError, ValueError) as e:
+            if path == DEFAULT_RULES_FILE:
+                raise
+            # Un URL_RULES_FILE erróneo no debe impedir que arranque la API
+            logger.error("Error al cargar las reglas de %s; se usan las reglas por defecto: %s", path, e)
+            self._mtime = None
+            self._rules = load_rules(DEFAULT_RULES_FILE)
+        self._checked_at = time.monotonic()
+
+    def current(self) -> CompiledRuleSet:
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self._reload_if_changed()
+        return self._rules
+
+    def _reload_if_changed(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            return  # otro hilo ya lo está comprobando
+        try:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+                if mtime == self._mtime:
+                    return
+                self._rules = load_rules(self.path)
+                self._mtime = mtime
+            except (OSError, ValueError) as e:
+                logger.warning("Error al recargar las reglas de %s: %s", self.path, e)
+        finally:
+            self._lock.release()
@@ -0,0 +1,56 @@
+# core/infrastructure/analyzers/url_sensitivity.py
+from core.domain.services import UrlAnalyzer
+from core.domain.entities import AIAnalysisResult
+from core.infrastructure.analyzers.url_rules import SEVERITIES, CompiledRuleSet, RuleRegistry
+from typing import Iterable, Mapping, Union
+
+
+class UrlSensitivityAnalyzer(UrlAnalyzer):
+    """Clasifica URLs según las reglas vigentes del registro.
+
+    Las reglas se piden al registro en cada análisis, así un cambio en el
+    fichero de reglas se aplica sin reiniciar los workers.
+    """
+
+    def __init__(self, rules: Union[RuleRegistry, CompiledRuleSet, None] = None):
+        self.rules = rules if rules is not None else RuleRegistry()
+
+    def _current_rules(self) -> CompiledRuleSet:
+        if isinstance(self.rules, RuleRegistry):
+            return self.rules.current()
+        return self.rules
+
+    def health(self):
+        return {"rules": len(self._current_rules().rules)}
+
+    def analyze(self, urls: Union[Iterable[str], Mapping[str, Iterable[str]]]) -> AIAnalysisResult:
+        """Analiza un lote de URLs o un diccionario {dork: [urls]}."""
+        if isinstance(urls, Mapping):
+            urls = (url for dork_urls in urls.values() for url in dork_urls)
+        rules = self._current_rules()
+        sections = {section: {} for section in rules.sections}
+        targets = [(sections[rule.section], rule.confidence, SEVERITIES.index(rule.severity))
+                   for rule in rules.rules]
+        match = rules.match
+        confidence = 0.0
+        severity = -1
+        # Cada URL distinta se evalúa una sola vez y aparece una vez por sección
+        for url in dict.fromkeys(urls):
+            for rule_index in match(url):
+                found, rule_confidence, rule_severity = targets[rule_index]
+                found[url] = None
+                if rule_confidence > confidence:
+                    confidence = rule_confidence
+                if rule_severity > severity:
+                    severity = rule_severity
+
+        details = {section: list(found) for section, found in sections.items()}
+        details['recommendations'] = [
+            rules.recommendations[section] for section in rules.recommendations
+            if details[section] and rules.recommendations[section]]
+        details['severity'] = SEVERITIES[severity] if severity >= 0 else None
+        return AIAnalysisResult(
+            classification='potentially_sensitive' if any(sections.values()) else 'neutral',
+            confidence=confidence,
+            details=details,
+        )
@@ -0,0 +1,69 @@
+# core/infrastructure/cache/dns_cache.py
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+import threading
+import time
+
+from core.domain.entities import DNSRecord
+
+
+class DnsAnswerCache:
+    """Caché LRU en memoria de respuestas DNS que respeta el TTL de cada RRset.
+
+    Las entradas se indexan por (dominio, tipo de registro) y caducan cuando
+    vence su TTL. Es segura entre hilos para poder compartirse entre peticiones.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_ttl: float = 3600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, List[DNSRecord]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(domain: str, record_type: str) -> Tuple[str, str]:
+        return domain.lower().rstrip('.'), record_type.upper()
+
+    def get(self, domain: str, record_type: str) -> Optional[List[DNSRecord]]:
+        key = self._key(domain, record_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, records = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return list(records)
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, domain: str, record_type: str, records: List[DNSRecord], ttl: float) -> None:
+        ttl = min(ttl, self.max_ttl)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        key = self._key(domain, record_type)
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, list(records))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
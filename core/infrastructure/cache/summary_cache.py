@@ -0,0 +1,87 @@
+# core/infrastructure/cache/summary_cache.py
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def summary_cache_key(messages: List[Dict[str, str]], model: str, **params: Any) -> str:
+    """Hash SHA-256 de los mensajes y parámetros del modelo en forma canónica."""
+    canonical = json.dumps({"messages": messages, "model": model, "params": params},
+                           sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """Caché en disco (SQLite) de respuestas de un modelo de lenguaje, indexadas por contenido.
+
+    Cuando el tamaño total de las respuestas supera `max_bytes` se eliminan
+    las menos usadas recientemente. Cada operación abre su propia conexión,
+    por lo que puede compartirse entre hilos y procesos.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                " key TEXT PRIMARY KEY, content TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, last_used REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS summaries_last_used ON summaries (last_used)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT content FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE summaries SET last_used = ? WHERE key = ?", (time.time(), key))
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return None if row is None else row[0]
+
+    def set(self, key: str, content: str) -> None:
+        now = time.time()
+        size = len(content.encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, content, size, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?)", (key, content, size, now, now))
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM summaries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Se borran las entradas menos usadas hasta volver por debajo del límite
+        evicted = []
+        for key, size in conn.execute("SELECT key, size FROM summaries ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM summaries WHERE key = ?", evicted)
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM summaries")
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summaries").fetchone()
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,66 @@
+# core/infrastructure/cache/whois_cache.py
+from typing import Any, Dict, Optional
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DAY = 24 * 3600
+
+
+class WhoisCache:
+    """Caché en disco (SQLite) de respuestas WHOIS por dominio, con caducidad en días.
+
+    Los datos de registro casi nunca cambian y los servidores WHOIS limitan
+    mucho las consultas, así que la caducidad por defecto es de una semana.
+    Cada operación abre su propia conexión: se puede compartir entre hilos y
+    procesos (la API y ReconBot pueden usar el mismo fichero).
+    """
+
+    def __init__(self, path: str, ttl_days: float = 7):
+        self.path = path
+        self.ttl = ttl_days * DAY
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS whois ("
+                " domain TEXT PRIMARY KEY, data TEXT NOT NULL, fetched_at REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS whois_fetched_at ON whois (fetched_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, domain: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM whois WHERE domain = ? AND fetched_at >= ?",
+                               (domain, time.time() - self.ttl)).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return None if row is None else json.loads(row[0])
+
+    def set(self, domain: str, data: Dict[str, Any]) -> None:
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO whois (domain, data, fetched_at) VALUES (?, ?, ?)",
+                         (domain, json.dumps(data, ensure_ascii=False), time.time()))
+
+    def purge_expired(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM whois WHERE fetched_at < ?", (time.time() - self.ttl,)).rowcount
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM whois")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM whois WHERE fetched_at >= ?",
+                                   (time.time() - self.ttl,)).fetchone()[0]
+        return {"entries": entries, "ttl_days": self.ttl / DAY, "hits": self.hits, "misses": self.misses}
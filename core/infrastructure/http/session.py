@@ -0,0 +1,161 @@
+# core/infrastructure/http/session.py
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple, Union
+import asyncio
+import os
+import threading
+import time
+import weakref
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (conexión, lectura) en segundos
+DEFAULT_TIMEOUT: Tuple[float, float] = (
+    float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+    float(os.getenv("HTTP_READ_TIMEOUT", "30")),
+)
+DEFAULT_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+DEFAULT_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.5"))
+DEFAULT_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter que aplica un timeout por defecto a las peticiones que no lo indican."""
+
+    def __init__(self, *args, timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def build_session(retries: int = DEFAULT_RETRIES, backoff_factor: float = DEFAULT_BACKOFF,
+                  timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                  pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Sesión con pool de conexiones keep-alive, timeouts y reintentos con backoff.
+
+    Se reintenta ante errores de conexión y respuestas 429/5xx, respetando
+    Retry-After. Las peticiones que se hacen desde aquí (búsquedas y la
+    llamada de análisis) son idempotentes, por eso POST también se reintenta.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = TimeoutHTTPAdapter(
+        max_retries=retry, timeout=timeout, pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_shared_session: Optional[requests.Session] = None
+_shared_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Sesión compartida por todo el proceso (reutiliza conexiones entre hilos)."""
+    global _shared_session
+    if _shared_session is None:
+        with _shared_lock:
+            if _shared_session is None:
+                _shared_session = build_session()
+    return _shared_session
+
+
+class RetryingAsyncTransport(httpx.AsyncHTTPTransport):
+    """Transporte httpx con la misma política de reintentos que build_session.
+
+    Reintenta ante errores de conexión y respuestas 429/5xx con backoff
+    exponencial, respetando Retry-After.
+    """
+
+    def __init__(self, retries: int = DEFAULT_RETRIES, backoff_factor: float = DEFAULT_BACKOFF, **kwargs):
+        super().__init__(**kwargs)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self.retries + 1):
+            delay = self.backoff_factor * (2 ** attempt)
+            try:
+                response = await super().handle_async_request(request)
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+                retry_after = _retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    delay = retry_after
+                await response.aclose()
+            await asyncio.sleep(delay)
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    # Retry-After puede indicar segundos o una fecha HTTP
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def build_async_client(retries: int = DEFAULT_RETRIES, backoff_factor: float = DEFAULT_BACKOFF,
+                       timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+                       pool_size: int = DEFAULT_POOL_SIZE) -> httpx.AsyncClient:
+    """Equivalente asíncrono de build_session (pool keep-alive, timeouts y reintentos).
+
+    Las corrutinas que no consiguen conexión libre esperan en el pool sin
+    límite de tiempo: el número de peticiones simultáneas lo acota el pool.
+    """
+    connect_timeout, read_timeout = timeout
+    return httpx.AsyncClient(
+        transport=RetryingAsyncTransport(
+            retries=retries, backoff_factor=backoff_factor,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)),
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout, pool=None),
+        headers={"User-Agent": USER_AGENT},
+        follow_redirects=True,
+    )
+
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+    weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Cliente asíncrono compartido por las corrutinas del bucle de eventos actual.
+
+    Un AsyncClient sólo puede usarse desde el bucle en el que abrió sus
+    conexiones; bajo ASGI hay un único bucle por proceso.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = build_async_client()
+    return client
@@ -0,0 +1,70 @@
+# core/infrastructure/llm/chat_client.py
+from core.domain.services import ChatClient
+from core.infrastructure.cache.summary_cache import SummaryCache, summary_cache_key
+from typing import Any, Callable, Dict, List, Optional, Union
+import random
+import time
+
+
+class OpenAIChatClient(ChatClient):
+    """Cliente de chat de OpenAI con reintentos y espera exponencial con jitter."""
+
+    def __init__(self, client: Any = None, retries: int = 3, backoff: float = 1.0,
+                 max_backoff: float = 30.0, sleep: Callable[[float], None] = time.sleep):
+        self.client = client
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+
+    def complete(self, messages: List[Dict[str, str]], model: str, **params: Any) -> str:
+        if self.client is None:
+            import openai
+            self.client = openai
+        # Al menos un intento aunque retries sea 0; el último fallo se propaga
+        attempts = max(self.retries, 1)
+        for attempt in range(attempts):
+            try:
+                response = self.client.chat.completions.create(model=model, messages=messages, **params)
+                return response.choices[0].message.content
+            except Exception as e:
+                if attempt == attempts - 1:
+                    raise
+                delay = min(self.backoff * 2 ** attempt, self.max_backoff) * random.uniform(0.5, 1.0)
+                print(f"Intento {attempt + 1} fallido ({e}), reintentando en {delay:.1f}s...")
+                self._sleep(delay)
+
+
+class StubChatClient(ChatClient):
+    """Cliente local que no llama a ninguna API; para pruebas y uso sin conexión.
+
+    Devuelve `response` (o el resultado de llamarlo con los mensajes) y
+    guarda cada petición en `calls`.
+    """
+
+    def __init__(self, response: Union[str, Callable[[List[Dict[str, str]]], str]] =
+                 "Resumen generado sin conexión (cliente de pruebas)."):
+        self.response = response
+        self.calls: List[Dict[str, Any]] = []
+
+    def complete(self, messages: List[Dict[str, str]], model: str, **params: Any) -> str:
+        self.calls.append({"messages": messages, "model": model, "params": params})
+        return self.response(messages) if callable(self.response) else self.response
+
+
+class CachedChatClient(ChatClient):
+    """Sirve desde la caché las peticiones idénticas (mismos mensajes, modelo y parámetros)."""
+
+    def __init__(self, client: ChatClient, cache: Optional[SummaryCache]):
+        self.client = client
+        self.cache = cache
+
+    def complete(self, messages: List[Dict[str, str]], model: str, **params: Any) -> str:
+        if self.cache is None:
+            return self.client.complete(messages, model, **params)
+        key = summary_cache_key(messages, model, **params)
+        content = self.cache.get(key)
+        if content is None:
+            content = self.client.complete(messages, model, **params)
+            self.cache.set(key, content)
+        return content
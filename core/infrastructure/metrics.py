@@ -0,0 +1,321 @@
+# core/infrastructure/metrics.py
+"""Métricas del proceso (contadores, gauges e histogramas) en formato de texto de Prometheus.
+
+`registry` es el registro del proceso; `/metrics` lo publica y ReconBot puede
+volcarlo a un fichero. Las métricas se crean al vuelo con sus etiquetas:
+
+    registry.counter("scanner_errors_total", "...", ("scanner",)).inc(scanner="dns")
+
+`instrument` mide las llamadas a los métodos de un objeto (p.ej. un use case)
+y un colector (`register_collector`) añade valores que se leen en cada
+consulta, como las estadísticas de las cachés.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import functools
+import inspect
+import math
+import threading
+import time
+
+# Límites (segundos) de los histogramas de latencia: de 5 ms a 2 minutos
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# (nombre, tipo, ayuda, etiquetas, valor) de un colector
+Sample = Tuple[str, str, str, Dict[str, str], float]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} espera las etiquetas {self.label_names}, no {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.label_names, key))
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, self._labels(key), value
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Cuentas por intervalo (la última para +Inf), suma y total
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            values = {key: (list(state[0]), state[1], state[2]) for key, state in self._values.items()}
+        for key, (counts, total, count) in sorted(values.items()):
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, label_names: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, label_names, **kwargs)
+            elif not isinstance(metric, cls) or metric.label_names != tuple(label_names):
+                raise ValueError(f"La métrica {name} ya existe con otro tipo o etiquetas")
+            return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, label_names)
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, label_names)
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, label_names, buckets=buckets)
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Todas las métricas en el formato de texto de Prometheus (versión 0.0.4)."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+            collectors = list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines += [f"{name}{_format_labels(labels)} {_format_value(value)}"
+                      for name, labels, value in metric.samples()]
+        described = set()
+        for collector in collectors:
+            try:
+                samples = list(collector())
+            except Exception:
+                # Un colector roto no debe dejar sin métricas al resto
+                continue
+            for name, metric_type, documentation, labels, value in samples:
+                if name not in described:
+                    described.add(name)
+                    lines.append(f"# HELP {name} {_escape(documentation)}")
+                    lines.append(f"# TYPE {name} {metric_type}")
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def _operation_metrics(metrics: MetricsRegistry):
+    return (
+        metrics.histogram("scanner_duration_seconds", "Duración de las operaciones de cada escáner",
+                          ("scanner", "operation")),
+        metrics.counter("scanner_errors_total", "Operaciones de escáner que lanzaron una excepción",
+                        ("scanner", "operation")),
+        metrics.gauge("scanner_in_flight", "Operaciones de escáner en curso", ("scanner",)),
+    )
+
+
+def timed(scanner: str, operation: str, metrics: Optional[MetricsRegistry] = None):
+    """Decorador que mide latencia, errores y llamadas en curso de una función.
+
+    Sirve para funciones normales, corrutinas y generadores (en éstos la
+    duración va hasta que se agotan o se cierran).
+    """
+    duration, errors, in_flight = _operation_metrics(metrics or registry)
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                in_flight.inc(scanner=scanner)
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    errors.inc(scanner=scanner, operation=operation)
+                    raise
+                finally:
+                    duration.observe(time.perf_counter() - start, scanner=scanner, operation=operation)
+                    in_flight.dec(scanner=scanner)
+        elif inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func):
+            # Los generadores se miden en _timed_iterator al consumirlos
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                return _timed_iterator(func(*args, **kwargs), scanner, operation, duration, errors, in_flight)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                in_flight.inc(scanner=scanner)
+                start = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception:
+                    errors.inc(scanner=scanner, operation=operation)
+                    raise
+                finally:
+                    duration.observe(time.perf_counter() - start, scanner=scanner, operation=operation)
+                    in_flight.dec(scanner=scanner)
+                return result
+        return wrapper
+    return decorator
+
+
+def _timed_iterator(iterator, scanner, operation, duration, errors, in_flight):
+    if hasattr(iterator, "__anext__"):
+        async def wrapped():
+            in_flight.inc(scanner=scanner)
+            start = time.perf_counter()
+            try:
+                async for item in iterator:
+                    yield item
+            except Exception:
+                errors.inc(scanner=scanner, operation=operation)
+                raise
+            finally:
+                duration.observe(time.perf_counter() - start, scanner=scanner, operation=operation)
+                in_flight.dec(scanner=scanner)
+        return wrapped()
+
+    def wrapped():
+        in_flight.inc(scanner=scanner)
+        start = time.perf_counter()
+        try:
+            yield from iterator
+        except Exception:
+            errors.inc(scanner=scanner, operation=operation)
+            raise
+        finally:
+            duration.observe(time.perf_counter() - start, scanner=scanner, operation=operation)
+            in_flight.dec(scanner=scanner)
+    return wrapped()
+
+
+class Instrumented:
+    """Envoltorio que mide cada llamada a los métodos públicos del objeto envuelto.
+
+    Las métricas se etiquetan con `scanner` y el nombre del método; los
+    métodos que devuelven un iterador se miden hasta que éste se agota.
+    """
+
+    def __init__(self, target: Any, scanner: str, metrics: Optional[MetricsRegistry] = None):
+        self._target = target
+        self._scanner = scanner
+        self._metrics = metrics or registry
+        self._wrapped: Dict[str, Callable] = {}
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._target, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+        wrapper = self._wrapped.get(name)
+        if wrapper is None:
+            wrapper = self._wrapped[name] = self._wrap(name, attribute)
+        return wrapper
+
+    def _wrap(self, name: str, method: Callable) -> Callable:
+        timed_method = timed(self._scanner, name, self._metrics)(method)
+        if inspect.iscoroutinefunction(method) or inspect.isgeneratorfunction(method) \
+                or inspect.isasyncgenfunction(method):
+            return timed_method
+        duration, errors, in_flight = _operation_metrics(self._metrics)
+
+        # Un método normal puede devolver un iterador perezoso (p.ej. stream)
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            result = timed_method(*args, **kwargs)
+            if isinstance(result, Iterator) or hasattr(result, "__anext__"):
+                return _timed_iterator(result, self._scanner, f"{name}_iter", duration, errors, in_flight)
+            return result
+        return wrapper
+
+
+def instrument(target: Any, scanner: str, metrics: Optional[MetricsRegistry] = None) -> Instrumented:
+    return Instrumented(target, scanner, metrics)
@@ -0,0 +1,132 @@
+# core/infrastructure/rate_limit.py
+from typing import Callable, Iterable, Optional, Tuple
+import os
+import sqlite3
+import threading
+import time
+
+
+class RateLimitExceeded(Exception):
+    """No hay tokens disponibles dentro del tiempo máximo de espera."""
+
+    def __init__(self, retry_after: float, message: str = "Límite de tasa superado"):
+        super().__init__(f"{message}; reintentar en {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Limitador de tasa en memoria: `rate` tokens por segundo con ráfagas de hasta `capacity`.
+
+    Es seguro entre hilos; para compartir un presupuesto entre procesos se
+    necesita un almacén común.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("La tasa debe ser mayor que cero")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Consume `tokens` si hay disponibles; si no, devuelve los segundos a esperar."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> None:
+        """Bloquea hasta poder consumir `tokens`.
+
+        Con `timeout` no espera más de esos segundos: si los tokens no llegarían
+        a tiempo lanza RateLimitExceeded sin consumir nada.
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return
+            if deadline is not None and self._clock() + wait > deadline:
+                raise RateLimitExceeded(wait)
+            time.sleep(wait)
+
+
+class SqliteTokenBucketStore:
+    """Token buckets guardados en SQLite, compartidos por todos los procesos que usan el fichero.
+
+    Cada bucket se identifica por una clave y guarda sus tokens y la hora de
+    la última actualización (reloj de pared: el monotónico no es común a los
+    procesos). `try_acquire` consume de varios buckets a la vez o de ninguno,
+    dentro de una transacción que bloquea la escritura (BEGIN IMMEDIATE).
+    """
+
+    # Cada cuántas adquisiciones se borran los buckets que ya estarían llenos
+    PURGE_EVERY = 1000
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self._clock = clock
+        self._calls = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, full_at REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS buckets_full_at ON buckets (full_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Transacciones explícitas (isolation_level=None) para poder usar BEGIN IMMEDIATE
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def try_acquire(self, buckets: Iterable[Tuple[str, float, float, float]]) -> float:
+        """Consume de cada bucket (clave, tasa, capacidad, tokens) si todos tienen tokens.
+
+        Devuelve 0 si se consumieron o, si no, los segundos que faltan para
+        que el más lento tenga los tokens pedidos (sin consumir nada).
+        """
+        buckets = list(buckets)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = self._clock()
+            wait, updates = 0.0, []
+            for key, rate, capacity, tokens in buckets:
+                row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)).fetchone()
+                available = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+                if available < tokens:
+                    wait = max(wait, (tokens - available) / rate)
+                remaining = available - tokens
+                updates.append((key, remaining, now, now + (capacity - remaining) / rate))
+            if not wait:
+                conn.executemany("INSERT OR REPLACE INTO buckets (key, tokens, updated_at, full_at) "
+                                 "VALUES (?, ?, ?, ?)", updates)
+                if self._should_purge():
+                    conn.execute("DELETE FROM buckets WHERE full_at < ?", (now,))
+            conn.execute("COMMIT")
+            return wait
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _should_purge(self) -> bool:
+        # Un bucket lleno equivale a uno inexistente: se puede borrar sin cambiar nada
+        with self._lock:
+            self._calls += 1
+            return self._calls % self.PURGE_EVERY == 0
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM buckets")
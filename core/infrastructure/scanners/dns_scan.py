@@ -1,18 +1,172 @@
 # core/infrastructure/scanners/dns_scan.py
-from core.domain.services import DnsScanner
+from core.domain.services import AsyncDnsScanner, DnsScanner, DnsStreamScanner
 from core.domain.entities import DNSRecord
+from core.infrastructure.cache.dns_cache import DnsAnswerCache
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+import asyncio
+import dns.asyncresolver
+import dns.rdatatype
 import dns.resolver
 
-class DnsScannerImpl(DnsScanner):
+# Límites por defecto para el modo batch
+DEFAULT_MAX_CONCURRENCY = 20
+DEFAULT_TIMEOUT = 5.0
+# TTL negativo cuando la respuesta no trae SOA en la sección de autoridad
+DEFAULT_NEGATIVE_TTL = 60.0
+
+
+class DnsScannerImpl(DnsScanner, DnsStreamScanner, AsyncDnsScanner):
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, timeout: float = DEFAULT_TIMEOUT,
+                 cache: Optional[DnsAnswerCache] = None, resolver: Optional[dns.asyncresolver.Resolver] = None):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.cache = cache
+        # Crear un resolver lee /etc/resolv.conf: se crea una vez y se comparte.
+        # Se puede indicar uno ya configurado (p.ej. contra un servidor local);
+        # `scan` usa el mismo servidor con un resolver síncrono equivalente.
+        self._async_resolver: Optional[dns.asyncresolver.Resolver] = resolver
+        self._sync_resolver: Optional[dns.resolver.Resolver] = None
+        if resolver is not None:
+            self._sync_resolver = dns.resolver.Resolver(configure=False)
+            self._sync_resolver.nameservers = list(resolver.nameservers)
+            self._sync_resolver.port = resolver.port
+
+    def warm_up(self) -> None:
+        self._resolver()
+        dns.resolver.get_default_resolver()
+
+    def health(self) -> Dict[str, object]:
+        nameservers = self._resolver().nameservers
+        if not nameservers:
+            raise RuntimeError("No hay servidores DNS configurados")
+        details: Dict[str, object] = {"nameservers": [str(server) for server in nameservers]}
+        if self.cache is not None:
+            details["cache"] = self.cache.stats()
+        return details
+
+    def _resolver(self) -> dns.asyncresolver.Resolver:
+        if self._async_resolver is None:
+            self._async_resolver = dns.asyncresolver.Resolver()
+        return self._async_resolver
+
     def scan(self, domain: str, record_type: str) -> list[DNSRecord]:
-        records = []
+        cached = self._cached(domain, record_type)
+        if cached is not None:
+            return cached
         try:
-            for rdata in dns.resolver.resolve(domain, record_type):
-                records.append(DNSRecord(type=record_type, value=str(rdata)))
-        except dns.resolver.NXDOMAIN:
-            records.append(DNSRecord(type=record_type, value=f"Dominio no encontrado: {domain}"))
-        except dns.resolver.NoAnswer:
-            records.append(DNSRecord(type=record_type, value=f"No se encontraron registros {record_type} para {domain}"))
+            resolve = self._sync_resolver.resolve if self._sync_resolver is not None else dns.resolver.resolve
+            answer = resolve(domain, record_type, lifetime=self.timeout)
+            return self._store_answer(domain, record_type, answer)
         except Exception as e:
-            records.append(DNSRecord(type=record_type, value=f"Error al realizar la consulta DNS: {e}"))
+            return self._store_error(domain, record_type, e)
+
+    def scan_many(self, domain: str, record_types: Iterable[str]) -> list[DNSRecord]:
+        """Resuelve varios tipos de registro de un dominio en paralelo."""
+        return asyncio.run(self.scan_many_async(domain, record_types))
+
+    async def scan_async(self, domain: str, record_type: str) -> list[DNSRecord]:
+        query = (domain, record_type)
+        return (await self.scan_batch_async([query]))[query]
+
+    async def scan_many_async(self, domain: str, record_types: Iterable[str]) -> list[DNSRecord]:
+        queries = [(domain, record_type) for record_type in dict.fromkeys(record_types)]
+        results = await self.scan_batch_async(queries)
+        return [record for query in queries for record in results[query]]
+
+    def scan_batch(self, queries: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], List[DNSRecord]]:
+        """Resuelve pares (dominio, tipo) en paralelo y los devuelve indexados por par."""
+        return asyncio.run(self.scan_batch_async(queries))
+
+    async def scan_batch_async(self, queries: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], List[DNSRecord]]:
+        queries = list(dict.fromkeys(queries))
+        resolver = self._resolver()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(
+            *(self._resolve(resolver, semaphore, domain, record_type) for domain, record_type in queries))
+        return dict(zip(queries, results))
+
+    def iter_scan(self, domain: str, record_types: Iterable[str]) -> Iterator[DNSRecord]:
+        """Entrega los registros de cada tipo en cuanto llega su respuesta."""
+        loop = asyncio.new_event_loop()
+        records = self.iter_scan_async(domain, record_types)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(records.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(records.aclose())
+            loop.close()
+
+    async def iter_scan_async(self, domain: str, record_types: Iterable[str]) -> AsyncIterator[DNSRecord]:
+        resolver = self._resolver()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [asyncio.ensure_future(self._resolve(resolver, semaphore, domain, record_type))
+                 for record_type in dict.fromkeys(record_types)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for record in await next_done:
+                    yield record
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _resolve(self, resolver, semaphore, domain: str, record_type: str) -> list[DNSRecord]:
+        cached = self._cached(domain, record_type)
+        if cached is not None:
+            return cached
+        async with semaphore:
+            try:
+                answer = await resolver.resolve(domain, record_type, lifetime=self.timeout)
+                return self._store_answer(domain, record_type, answer)
+            except Exception as e:
+                return self._store_error(domain, record_type, e)
+
+    def _cached(self, domain: str, record_type: str) -> Optional[list[DNSRecord]]:
+        if self.cache is None:
+            return None
+        return self.cache.get(domain, record_type)
+
+    def _store_answer(self, domain: str, record_type: str, answer) -> list[DNSRecord]:
+        records = [DNSRecord(type=record_type, value=str(rdata)) for rdata in answer]
+        if self.cache is not None and answer.rrset is not None:
+            self.cache.set(domain, record_type, records, answer.rrset.ttl)
         return records
+
+    def _store_error(self, domain: str, record_type: str, error: Exception) -> list[DNSRecord]:
+        records = [self._error_record(domain, record_type, error)]
+        if self.cache is not None:
+            # Solo las respuestas negativas (NXDOMAIN/NoAnswer) se guardan en caché
+            ttl = self._negative_ttl(error)
+            if ttl is not None:
+                self.cache.set(domain, record_type, records, ttl)
+        return records
+
+    @staticmethod
+    def _negative_ttl(error: Exception) -> Optional[float]:
+        """TTL de una respuesta negativa según el mínimo del SOA (RFC 2308)."""
+        try:
+            if isinstance(error, dns.resolver.NXDOMAIN):
+                responses = list(error.responses().values())
+            elif isinstance(error, dns.resolver.NoAnswer):
+                responses = [error.response()]
+            else:
+                return None
+        except KeyError:
+            return DEFAULT_NEGATIVE_TTL
+        for response in responses:
+            for rrset in response.authority:
+                if rrset.rdtype == dns.rdatatype.SOA and len(rrset):
+                    return min(rrset.ttl, rrset[0].minimum)
+        return DEFAULT_NEGATIVE_TTL
+
+    @staticmethod
+    def _error_record(domain: str, record_type: str, error: Exception) -> DNSRecord:
+        if isinstance(error, dns.resolver.NXDOMAIN):
+            return DNSRecord(type=record_type, value=f"Dominio no encontrado: {domain}", status="nxdomain")
+        if isinstance(error, dns.resolver.NoAnswer):
+            return DNSRecord(type=record_type, value=f"No se encontraron registros {record_type} para {domain}",
+                             status="no_answer")
+        return DNSRecord(type=record_type, value=f"Error al realizar la consulta DNS: {error}", status="error")
@@ -1,16 +1,79 @@
 # core/infrastructure/scanners/google_dorks.py
-from core.domain.services import GoogleDorkScanner
+from core.domain.services import AsyncGoogleDorkScanner, GoogleDorkScanner, GoogleDorkStreamScanner
 from core.domain.entities import GoogleDorkResult
-# Importa las librerías necesarias para tu script de Google Dorks (ej. googlesearch-python)
-# pip install googlesearch-python
+from core.infrastructure.http.session import get_async_client, get_session
+from itertools import islice
+from typing import Any, Dict, Iterator, Optional
+from bs4 import BeautifulSoup
+import httpx
+import requests
+
+GOOGLE_SEARCH_URL = "https://www.google.com/search"
+
+
+class GoogleDorkScannerImpl(GoogleDorkScanner, GoogleDorkStreamScanner, AsyncGoogleDorkScanner):
+    """Búsquedas en Google usando la sesión HTTP compartida (pool, timeouts y reintentos).
+
+    Interpreta la página de resultados igual que googlesearch-python, pero sus
+    peticiones no tenían timeout ni reutilizaban conexiones. `scan_async` hace
+    las mismas peticiones con el cliente httpx asíncrono del proceso.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, num_results: int = 10,
+                 search_url: str = GOOGLE_SEARCH_URL, lang: str = "en",
+                 async_client: Optional[httpx.AsyncClient] = None):
+        self.session = session
+        self.async_client = async_client
+        self.num_results = num_results
+        self.search_url = search_url
+        self.lang = lang
 
-class GoogleDorkScannerImpl(GoogleDorkScanner):
     def scan(self, query: str) -> GoogleDorkResult:
+        return GoogleDorkResult(query=query, results=list(self.iter_scan(query)))
+
+    def iter_scan(self, query: str) -> Iterator[Dict[str, Any]]:
+        # Cada página de resultados se pide a medida que se consume
+        session = self.session or get_session()
+        start = 0
         try:
-            from googlesearch import search
-            results_data = [{"title": result, "url": result} for result in search(query, num_results=10)]
-            return GoogleDorkResult(query=query, results=results_data)
-        except ImportError:
-            return GoogleDorkResult(query=query, results=[{"error": "googlesearch-python no está instalado"}])
+            while start < self.num_results:
+                response = session.get(self.search_url, params=self._params(query, start))
+                response.raise_for_status()
+                found = 0
+                for result in self._parse(response.text):
+                    found += 1
+                    yield result
+                    if start + found >= self.num_results:
+                        break
+                if not found:
+                    break
+                start += found
         except Exception as e:
-            return GoogleDorkResult(query=query, results=[{"error": str(e)}])
+            yield {"error": str(e)}
+
+    async def scan_async(self, query: str) -> GoogleDorkResult:
+        client = self.async_client or get_async_client()
+        results = []
+        try:
+            while len(results) < self.num_results:
+                response = await client.get(self.search_url, params=self._params(query, len(results)))
+                response.raise_for_status()
+                page = list(islice(self._parse(response.text), self.num_results - len(results)))
+                if not page:
+                    break
+                results += page
+        except Exception as e:
+            results.append({"error": str(e)})
+        return GoogleDorkResult(query=query, results=results)
+
+    def _params(self, query: str, start: int) -> Dict[str, Any]:
+        return {"q": query, "num": self.num_results - start + 2, "hl": self.lang, "start": start}
+
+    @staticmethod
+    def _parse(page: str) -> Iterator[Dict[str, Any]]:
+        soup = BeautifulSoup(page, "html.parser")
+        for block in soup.find_all("div", attrs={"class": "g"}):
+            link = block.find("a", href=True)
+            title = block.find("h3")
+            if link and title:
+                yield {"title": title.text, "url": link["href"]}
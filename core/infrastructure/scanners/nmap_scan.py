@@ -1,20 +1,285 @@
 # core/infrastructure/scanners/nmap_scan.py
-from core.domain.services import NmapScanner
+from core.domain.services import AsyncNmapScanner, NmapScanner, NmapStreamScanner
 from core.domain.entities import NmapScanResult
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+import asyncio
+import copy
+import ipaddress
+import re
+import shlex
+import threading
 import nmap
 
-class NmapScannerImpl(NmapScanner):
+DEFAULT_ARGUMENTS = '-sS -sV'  # SYN scan y detección de versión
+DEFAULT_SHARD_SIZE = 64
+DEFAULT_MAX_WORKERS = 4
+# Hosts que puede abarcar una petición: un /8 o un /64 de IPv6 agotarían la memoria
+DEFAULT_MAX_HOSTS = 4096
+NMAP_BINARY = 'nmap'
+
+_TARGET_SEPARATORS = re.compile(r'[,\s]+')
+# Caracteres de un objetivo de nmap (direcciones, nombres, CIDR y rangos). Las
+# comillas y las barras invertidas no se admiten: python-nmap pasa los hosts por
+# shlex.split y con ellas un objetivo podría convertirse en una opción de nmap
+_HOST_TOKEN = re.compile(r'^[0-9A-Za-z.:/_*-]+$')
+# Octeto de un rango de nmap: 10, 1-20, -20, 200-, *
+_OCTET_RANGE = re.compile(r'^(\*|\d+|\d*-\d*)$')
+
+
+def _tokens(targets: Union[str, Iterable[str]]) -> List[str]:
+    if isinstance(targets, str):
+        targets = [targets]
+    return [token for entry in targets for token in _TARGET_SEPARATORS.split(entry.strip()) if token]
+
+
+def _octet_size(octet: str) -> int:
+    if octet == '*':
+        return 256
+    if '-' not in octet:
+        return 1
+    low, _, high = octet.partition('-')
+    return max(0, min(int(high or 255), 255) - int(low or 0) + 1)
+
+
+def count_hosts(token: str) -> int:
+    """Hosts que nmap escanearía para un objetivo: CIDR, rango por octetos (10.0.0-3.*) o nombre."""
+    try:
+        return ipaddress.ip_network(token, strict=False).num_addresses
+    except ValueError:
+        pass
+    name, _, mask = token.partition('/')
+    if mask:
+        # Nombre con máscara (example.com/24): nmap escanea la red de su dirección
+        if not mask.isdigit():
+            raise ValueError(f"Objetivo no válido: {token}")
+        return 2 ** (32 - min(int(mask), 32))
+    octets = name.split('.')
+    if len(octets) == 4 and all(_OCTET_RANGE.match(octet) for octet in octets):
+        total = 1
+        for octet in octets:
+            total *= _octet_size(octet)
+        return total
+    return 1
+
+
+def check_targets(targets: Union[str, Iterable[str]], max_hosts: Optional[int] = DEFAULT_MAX_HOSTS) -> int:
+    """Valida los objetivos antes de expandirlos o pasarlos a nmap; devuelve cuántos hosts abarcan.
+
+    Lanza ValueError si un objetivo empieza por '-' (nmap lo leería como una
+    opción), contiene caracteres que no son de un host (p.ej. comillas) o si
+    en total superan `max_hosts` (None = sin límite).
+    """
+    total = 0
+    for token in _tokens(targets):
+        if token.startswith('-') or not _HOST_TOKEN.match(token):
+            raise ValueError(f"Objetivo no válido: {token}")
+        total += count_hosts(token)
+    if max_hosts is not None and total > max_hosts:
+        raise ValueError(f"Los objetivos abarcan {total} hosts; el máximo es {max_hosts}")
+    return total
+
+
+def expand_targets(targets: Union[str, Iterable[str]], max_hosts: Optional[int] = DEFAULT_MAX_HOSTS) -> List[str]:
+    """Expande rangos CIDR y listas de hosts en una lista de hosts sin duplicados."""
+    check_targets(targets, max_hosts)
+    hosts = {}
+    for token in _tokens(targets):
+        try:
+            network = ipaddress.ip_network(token, strict=False)
+        except ValueError:
+            # Nombre de host o rango propio de nmap (p.ej. 10.0.0.1-20)
+            hosts[token] = None
+            continue
+        if network.num_addresses == 1:
+            hosts[str(network.network_address)] = None
+        else:
+            for address in network.hosts():
+                hosts[str(address)] = None
+    return list(hosts)
+
+
+def _host_sort_key(result: NmapScanResult):
+    try:
+        address = ipaddress.ip_address(result.target)
+        return (0, address.version, int(address), '')
+    except ValueError:
+        return (1, 0, 0, result.target)
+
+
+def _parse_host(host: str, host_info: dict) -> NmapScanResult:
+    ports_data = []
+    services = []
+    for port, port_info in host_info.get('tcp', {}).items():
+        ports_data.append({"port": port, "state": port_info['state'], "service": port_info['name'],
+                           "version": port_info['product'] + " " + port_info['version']})
+        if port_info['name'] and port_info['name'] not in services:
+            services.append(port_info['name'])
+    return NmapScanResult(target=host, ports=ports_data, services=services)
+
+
+def _error_results(hosts: List[str], error: Exception) -> List[NmapScanResult]:
+    return [NmapScanResult(target=host, ports=[{"error": str(error)}], services=[]) for host in hosts]
+
+
+def _target_result(target: str, hosts: Dict[str, dict]) -> NmapScanResult:
+    if target in hosts:
+        return _parse_host(target, hosts[target])
+    if len(hosts) == 1:
+        # El objetivo era un nombre de host: nmap indexa por su IP
+        return _parse_host(target, next(iter(hosts.values())))
+    return NmapScanResult(target=target, ports=[], services=[])
+
+
+_prototype: Optional[nmap.PortScanner] = None
+_prototype_lock = threading.Lock()
+
+
+def _port_scanner() -> nmap.PortScanner:
+    """PortScanner listo para usar sin volver a lanzar `nmap -V`.
+
+    El binario y su versión se detectan una vez por proceso. Cada llamada
+    recibe una copia porque PortScanner guarda en sí mismo el último resultado.
+    """
+    global _prototype
+    if _prototype is None:
+        with _prototype_lock:
+            if _prototype is None:
+                _prototype = nmap.PortScanner()
+    scanner = copy.copy(_prototype)
+    scanner._scan_result = {}
+    return scanner
+
+
+def _scan_shard(hosts: List[str], ports: Optional[str], arguments: str) -> List[NmapScanResult]:
+    # Se ejecuta en un proceso del pool: cada shard es una invocación de nmap
+    nm = _port_scanner()
+    scan_results = nm.scan(hosts=' '.join(hosts), ports=ports, arguments=arguments)
+    return [_parse_host(host, host_info) for host, host_info in scan_results['scan'].items()]
+
+
+class _NmapXmlParser(nmap.PortScanner):
+    """PortScanner que sólo interpreta la salida XML: no lanza `nmap -V` al crearse."""
+
+    def __init__(self):
+        self._scan_result = {}
+        self._nmap_last_output = ''
+
+
+async def _run_nmap_async(hosts: List[str], ports: Optional[str], arguments: str) -> Dict[str, dict]:
+    """Lanza nmap como subproceso asíncrono y devuelve sus hosts indexados por dirección."""
+    args = ['-oX', '-'] + hosts + (['-p', ports] if ports else []) + shlex.split(arguments)
+    process = await asyncio.create_subprocess_exec(
+        NMAP_BINARY, *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    try:
+        output, error = await process.communicate()
+    except asyncio.CancelledError:
+        # La petición se canceló (p.ej. el cliente cerró la conexión): no se deja nmap huérfano
+        process.kill()
+        await process.wait()
+        raise
+    error = error.decode(errors='replace')
+    # Igual que python-nmap: los avisos no invalidan el resultado
+    lines = [line for line in error.splitlines() if line]
+    warnings = [line for line in lines if line.lower().startswith('warning: ')]
+    errors = [line for line in lines if line not in warnings]
+    scan_results = _NmapXmlParser().analyse_nmap_xml_scan(
+        nmap_xml_output=output, nmap_err=error,
+        nmap_err_keep_trace=errors, nmap_warn_keep_trace=warnings)
+    return scan_results['scan']
+
+
+class NmapScannerImpl(NmapScanner, NmapStreamScanner, AsyncNmapScanner):
+    def __init__(self, arguments: str = DEFAULT_ARGUMENTS, shard_size: int = DEFAULT_SHARD_SIZE,
+                 max_workers: int = DEFAULT_MAX_WORKERS, max_hosts: Optional[int] = DEFAULT_MAX_HOSTS):
+        self.arguments = arguments
+        self.shard_size = shard_size
+        self.max_workers = max_workers
+        self.max_hosts = max_hosts
+
+    def warm_up(self) -> None:
+        _port_scanner()
+
+    def health(self) -> Dict[str, Any]:
+        major, minor = _port_scanner().nmap_version()
+        return {"version": f"{major}.{minor}"}
+
     def scan(self, target: str, ports: str = None) -> NmapScanResult:
-        nm = nmap.PortScanner()
         try:
-            scan_results = nm.scan(hosts=target, ports=ports, arguments='-sS -sV')  # SYN scan y detección de versión
-            ports_data = []
-            if target in scan_results['scan']:
-                for port, port_info in scan_results['scan'][target]['tcp'].items():
-                    ports_data.append({"port": port, "state": port_info['state'], "service": port_info['name'], "version": port_info['product'] + " " + port_info['version']})
-            return NmapScanResult(target=target, ports=ports_data)
+            check_targets(target, self.max_hosts)
+            scan_results = _port_scanner().scan(hosts=target, ports=ports, arguments=self.arguments)
+            return _target_result(target, scan_results['scan'])
         except Exception as e:
-            return NmapScanResult(target=target, ports=[{"error": str(e)}])
+            return NmapScanResult(target=target, ports=[{"error": str(e)}], services=[])
+
+    async def scan_async(self, target: str, ports: str = None) -> NmapScanResult:
+        try:
+            check_targets(target, self.max_hosts)
+            return _target_result(target, await _run_nmap_async(shlex.split(target), ports, self.arguments))
+        except Exception as e:
+            return NmapScanResult(target=target, ports=[{"error": str(e)}], services=[])
+
+    def sweep(self, targets: Union[str, Iterable[str]], ports: str = None,
+              progress: Optional[Callable[[float], None]] = None) -> List[NmapScanResult]:
+        """Escanea CIDRs y listas de hosts repartidos en shards sobre un pool de procesos."""
+        return sorted(self.iter_sweep(targets, ports, progress), key=_host_sort_key)
+
+    def iter_sweep(self, targets: Union[str, Iterable[str]], ports: str = None,
+                   progress: Optional[Callable[[float], None]] = None) -> Iterator[NmapScanResult]:
+        """Como sweep, pero entrega los hosts a medida que termina cada shard."""
+        hosts = expand_targets(targets, self.max_hosts)
+        if not hosts:
+            return
+        shards = [hosts[i:i + self.shard_size] for i in range(0, len(hosts), self.shard_size)]
+        if len(shards) == 1:
+            yield from self._scan_shard_safely(shards[0], ports)
+            if progress is not None:
+                progress(1.0)
+            return
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(shards))) as pool:
+            futures = {pool.submit(_scan_shard, shard, ports, self.arguments): shard for shard in shards}
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    try:
+                        yield from future.result()
+                    except Exception as e:
+                        yield from _error_results(futures[future], e)
+                    if progress is not None:
+                        progress(done / len(shards))
+            finally:
+                # Si el consumidor abandona el generador no se lanzan más shards
+                for future in futures:
+                    future.cancel()
+
+    async def sweep_async(self, targets: Union[str, Iterable[str]], ports: str = None) -> List[NmapScanResult]:
+        """Como sweep, pero cada shard es un subproceso asíncrono (hasta max_workers a la vez)."""
+        hosts = expand_targets(targets, self.max_hosts)
+        shards = [hosts[i:i + self.shard_size] for i in range(0, len(hosts), self.shard_size)]
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def scan_shard(shard: List[str]) -> List[NmapScanResult]:
+            async with semaphore:
+                try:
+                    hosts_info = await _run_nmap_async(shard, ports, self.arguments)
+                    return [_parse_host(host, host_info) for host, host_info in hosts_info.items()]
+                except Exception as e:
+                    return _error_results(shard, e)
+
+        shard_results = await asyncio.gather(*(scan_shard(shard) for shard in shards))
+        return sorted((result for results in shard_results for result in results), key=_host_sort_key)
+
+    def iter_scan(self, target: str, ports: str = None) -> Iterator[Dict[str, Any]]:
+        """Entrega cada puerto encontrado, con su host, en cuanto su shard termina."""
+        for result in self.iter_sweep(target, ports):
+            for port in result.ports:
+                yield {"host": result.target, **port}
+
+    def _scan_shard_safely(self, hosts: List[str], ports: Optional[str]) -> List[NmapScanResult]:
+        try:
+            return _scan_shard(hosts, ports, self.arguments)
+        except Exception as e:
+            return _error_results(hosts, e)
+
 
 # Asegúrate de tener nmap instalado en tu sistema y la librería python-nmap:
 # pip install python-nmap
@@ -1,17 +1,35 @@
-from core.domain.services import WhoisScanner
+from core.domain.services import AsyncWhoisScanner, WhoisScanner
 from core.domain.entities import WhoisInfo
-import whois
+from core.infrastructure.whois.client import WhoisClient, normalize_domain
+from concurrent.futures import Executor
+from typing import Any, Dict, Optional
+import asyncio
+
+class WhoisScannerImpl(WhoisScanner, AsyncWhoisScanner):
+    def __init__(self, client: Optional[WhoisClient] = None, executor: Optional[Executor] = None):
+        # Cliente con caché, límite por TLD y coalescencia (ver core/infrastructure/whois/client.py)
+        self.client = client or WhoisClient()
+        # python-whois sólo ofrece un cliente bloqueante: las consultas asíncronas
+        # se ejecutan en este pool (o en el del bucle de eventos si no se indica)
+        self.executor = executor
 
-class WhoisScannerImpl(WhoisScanner):
     def scan(self, domain: str) -> WhoisInfo:
         try:
-            whois_info = whois.whois(domain)
+            info = self.client.lookup(domain)
             return WhoisInfo(
-                domain=whois_info.domain[0] if isinstance(whois_info.domain, list) and whois_info.domain else whois_info.domain,
-                registrar=whois_info.registrar[0] if isinstance(whois_info.registrar, list) and whois_info.registrar else whois_info.registrar,
-                creation_date=str(whois_info.creation_date[0] if isinstance(whois_info.creation_date, list) and whois_info.creation_date else whois_info.creation_date),
+                domain=normalize_domain(domain),
+                registrar=info["registrar"],
+                creation_date=info["creation_date"],
+                expiration_date=info["expiration_date"],
+                name_servers=info["name_servers"],
+                status=info["status"],
             )
-        except whois.DomainInvalid:
-            return WhoisInfo(domain=domain, registrar="N/A", creation_date="N/A")
         except Exception as e:
-            return WhoisInfo(domain=domain, registrar="Error", creation_date=str(e))
+            return WhoisInfo(domain=normalize_domain(domain), registrar="Error",
+                             creation_date=str(e), expiration_date="")
+
+    async def scan_async(self, domain: str) -> WhoisInfo:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self.scan, domain)
+
+    def health(self) -> Dict[str, Any]:
+        return self.client.stats()
@@ -0,0 +1,127 @@
+# core/infrastructure/whois/client.py
+"""Consultas WHOIS compartidas por la API y ReconBot.
+
+- Caché persistente por dominio con caducidad en días (cache/whois_cache.py).
+- Límite de tasa por TLD: cada registro tiene su propio servidor WHOIS y
+  bloquea a quien lo consulta demasiado, así que cada TLD tiene su token bucket.
+- Coalescencia: las consultas simultáneas del mismo dominio comparten una.
+
+El protocolo WHOIS (RFC 3912) cierra la conexión tras cada respuesta, por
+lo que no hay conexiones que reutilizar: lo que se ahorra son consultas.
+"""
+from typing import Any, Callable, Dict, List, Optional
+import threading
+
+import whois
+
+from core.application.single_flight import SingleFlight
+from core.infrastructure.cache.whois_cache import WhoisCache
+from core.infrastructure.rate_limit import RateLimitExceeded, TokenBucket
+
+# Consultas por segundo (y ráfaga) permitidas contra el servidor de cada TLD
+DEFAULT_TLD_RATE = 0.5
+DEFAULT_TLD_BURST = 3.0
+# Segundos que una consulta espera turno en el bucket de su TLD antes de rendirse
+DEFAULT_MAX_WAIT = 10.0
+
+
+# Campos de los que al menos uno debe tener valor para que una respuesta se guarde
+DATA_FIELDS = ("registrar", "creation_date", "expiration_date", "name_servers")
+
+
+def normalize_domain(domain: str) -> str:
+    return domain.strip().lower().rstrip('.')
+
+
+def _first(value: Any) -> Any:
+    # python-whois devuelve una lista cuando el registro repite el campo
+    return value[0] if isinstance(value, list) and value else value
+
+
+def _text(value: Any) -> Optional[str]:
+    value = _first(value)
+    return None if value is None else str(value)
+
+
+def _text_list(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(dict.fromkeys(str(item) for item in value))
+
+
+def whois_fields(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Campos de una respuesta de python-whois en forma serializable a JSON."""
+    return {
+        "domain": _text(entry.get("domain_name")),
+        "registrar": _text(entry.get("registrar")),
+        "creation_date": _text(entry.get("creation_date")),
+        "expiration_date": _text(entry.get("expiration_date")),
+        # Los servidores de nombres suelen venir repetidos en mayúsculas y minúsculas
+        "name_servers": list(dict.fromkeys(server.lower() for server in _text_list(entry.get("name_servers")))),
+        "status": _text_list(entry.get("status")),
+    }
+
+
+class WhoisClient:
+    def __init__(self, cache: Optional[WhoisCache] = None, tld_rate: float = DEFAULT_TLD_RATE,
+                 tld_burst: float = DEFAULT_TLD_BURST, query: Callable[[str], Any] = whois.whois,
+                 max_wait: Optional[float] = DEFAULT_MAX_WAIT):
+        self.cache = cache
+        # Con tld_rate <= 0 no se limita la tasa
+        self.tld_rate = tld_rate
+        self.tld_burst = tld_burst
+        # Con max_wait None se espera el turno lo que haga falta (p.ej. análisis por lotes)
+        self.max_wait = max_wait
+        self.query = query
+        self.flights = SingleFlight()
+        self.queries = 0
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, domain: str) -> Dict[str, Any]:
+        """Campos WHOIS del dominio (ver whois_fields); propaga el error si la consulta falla.
+
+        Lanza RateLimitExceeded si el TLD no tiene turno en `max_wait` segundos.
+        """
+        domain = normalize_domain(domain)
+        if self.cache is not None:
+            cached = self.cache.get(domain)
+            if cached is not None:
+                return cached
+        # Los que esperan a la misma consulta reciben el mismo dict: se entrega una copia
+        return dict(self.flights.do(domain, lambda: self._query(domain)))
+
+    def _query(self, domain: str) -> Dict[str, Any]:
+        bucket = self.bucket(domain)
+        if bucket is not None:
+            try:
+                bucket.acquire(timeout=self.max_wait)
+            except RateLimitExceeded as e:
+                # WhoisScannerImpl lo devuelve como entidad de error; ReconBot lo registra y sigue
+                tld = domain.rsplit('.', 1)[-1]
+                raise RateLimitExceeded(e.retry_after, f"Límite de consultas WHOIS a .{tld} superado") from None
+        with self._lock:
+            self.queries += 1
+        fields = whois_fields(self.query(domain))
+        # python-whois devuelve una respuesta vacía si no pudo conectar: ésa no se guarda
+        if self.cache is not None and any(fields[field] for field in DATA_FIELDS):
+            self.cache.set(domain, fields)
+        return fields
+
+    def bucket(self, domain: str) -> Optional[TokenBucket]:
+        if self.tld_rate <= 0:
+            return None
+        tld = domain.rsplit('.', 1)[-1]
+        with self._lock:
+            bucket = self._buckets.get(tld)
+            if bucket is None:
+                bucket = self._buckets[tld] = TokenBucket(rate=self.tld_rate, capacity=self.tld_burst)
+        return bucket
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"queries": self.queries, "coalesced": self.flights.coalesced}
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        return stats
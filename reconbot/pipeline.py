@@ -0,0 +1,113 @@
+"""Planificador de etapas para ReconBot.
+
+Cada etapa declara de qué otras depende; las que no dependen entre sí se
+ejecutan en paralelo en un pool de hilos, de modo que un análisis dura lo
+que su camino crítico y no la suma de todas las etapas.
+
+Una etapa con `skip_if` se omite si la condición se cumple cuando le llega
+el turno (p.ej. en un reescaneo incremental en el que nada cambió).
+
+Con `metrics` (un MetricsRegistry) la duración de cada etapa y la espera en
+su limitador de tasa se acumulan en histogramas, además de en los tiempos
+que devuelve `run`.
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import time
+
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[[], Any]
+    depends_on: Tuple[str, ...] = ()
+    description: Optional[str] = None
+    skip_if: Optional[Callable[[], bool]] = None
+
+
+class StageScheduler:
+    def __init__(self, stages: List[Stage], max_workers: int = 4,
+                 rate_limits: Optional[Dict[str, Any]] = None, metrics: Any = None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.max_workers = max_workers
+        # Limitadores por etapa (objetos con acquire()), compartibles entre análisis
+        self.rate_limits = rate_limits or {}
+        self.stage_duration = self.stage_wait = None
+        if metrics is not None:
+            self.stage_duration = metrics.histogram(
+                "reconbot_stage_duration_seconds", "Duración de las etapas de ReconBot", ("stage", "status"))
+            self.stage_wait = metrics.histogram(
+                "reconbot_stage_rate_limit_wait_seconds",
+                "Espera de las etapas de ReconBot en su límite de tasa", ("stage",))
+        self._validate()
+
+    def _validate(self):
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"La etapa '{stage.name}' depende de una etapa inexistente: '{dependency}'")
+        # Detección de ciclos: orden topológico de Kahn
+        remaining = {name: set(stage.depends_on) for name, stage in self.stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependencias circulares entre las etapas: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """Ejecuta todas las etapas y devuelve sus tiempos (segundos desde el inicio)."""
+        timings: Dict[str, Dict[str, Any]] = {}
+        started_at = time.perf_counter()
+        done = set()
+        running = {}
+
+        def execute(stage: Stage):
+            if stage.skip_if is not None and stage.skip_if():
+                now = round(time.perf_counter() - started_at, 4)
+                timings[stage.name] = {"start": now, "end": now, "duration": 0.0, "status": "skipped"}
+                if self.stage_duration is not None:
+                    self.stage_duration.observe(0.0, stage=stage.name, status="skipped")
+                return
+            limiter = self.rate_limits.get(stage.name)
+            if limiter is not None:
+                waiting = time.perf_counter()
+                limiter.acquire()
+                if self.stage_wait is not None:
+                    self.stage_wait.observe(time.perf_counter() - waiting, stage=stage.name)
+            if stage.description:
+                print(f"\n[+] {stage.description}...")
+            start = time.perf_counter()
+            status = "ok"
+            try:
+                stage.func()
+            except Exception as e:
+                # Las etapas que dependen de ésta se ejecutan igualmente con los datos disponibles
+                print(f"Error en la etapa '{stage.name}': {str(e)}")
+                status = f"error: {e}"
+            end = time.perf_counter()
+            timings[stage.name] = {
+                "start": round(start - started_at, 4),
+                "end": round(end - started_at, 4),
+                "duration": round(end - start, 4),
+                "status": status,
+            }
+            if self.stage_duration is not None:
+                self.stage_duration.observe(end - start, stage=stage.name,
+                                            status="ok" if status == "ok" else "error")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="reconbot-stage") as pool:
+            while len(done) < len(self.stages):
+                for name, stage in self.stages.items():
+                    if name not in done and name not in running.values() \
+                            and all(dep in done for dep in stage.depends_on):
+                        running[pool.submit(execute, stage)] = name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done.add(running.pop(future))
+
+        timings["total"] = {"duration": round(time.perf_counter() - started_at, 4)}
+        return timings
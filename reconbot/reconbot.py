@@ -1,85 +1,130 @@
 #!/usr/bin/env python3
-import dns.resolver
-import whois
+import asyncio
+import dns.asyncresolver
 import requests
 from bs4 import BeautifulSoup
-from googlesearch import search as google_search
 import json
 import argparse
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import openai
-from fpdf import FPDF
-from datetime import datetime
-import html
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from pipeline import Stage, StageScheduler
+from report_html import render_html_report
+from report_pdf import render_pdf_report
+from reports import REPORT_WORKERS, ReportRenderer, report_path
+
+# Permite importar el paquete core al ejecutar el script directamente
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.application.change_detection import (  # noqa: E402
+    diff_dns, diff_urls, diff_whois, has_changes)
+from core.infrastructure.cache.summary_cache import SummaryCache  # noqa: E402
+from core.infrastructure.http.session import get_session  # noqa: E402
+from core.infrastructure.llm.chat_client import (  # noqa: E402
+    CachedChatClient, OpenAIChatClient, StubChatClient)
+from core.infrastructure.metrics import registry as metrics_registry  # noqa: E402
+from core.infrastructure.cache.whois_cache import WhoisCache  # noqa: E402
+from core.infrastructure.rate_limit import TokenBucket  # noqa: E402
+from core.infrastructure.whois.client import WhoisClient  # noqa: E402
+
+# Tipos de registro consultados y límites de la resolución DNS
+DNS_RECORD_TYPES = ['A', 'MX', 'NS', 'SOA', 'TXT']
+DNS_MAX_CONCURRENCY = 10
+DNS_TIMEOUT = 5.0
+# Hilos para las etapas independientes del análisis
+STAGE_WORKERS = 4
+DUCKDUCKGO_URL = "https://html.duckduckgo.com/html/"
+# Modelo del resumen y caché en disco de los resúmenes ya generados
+SUMMARY_MODEL = "gpt-3.5-turbo"
+SUMMARY_PARAMS = {"temperature": 0.7, "max_tokens": 2000}
+SUMMARY_CACHE_FILE = os.getenv("RECONBOT_SUMMARY_CACHE", os.path.join("hallazgos", "summary_cache.sqlite3"))
+SUMMARY_CACHE_MAX_MB = float(os.getenv("RECONBOT_SUMMARY_CACHE_MB", "50"))
+# Caché de respuestas WHOIS y consultas por segundo a cada servidor de TLD
+WHOIS_CACHE_FILE = os.getenv("RECONBOT_WHOIS_CACHE", os.path.join("hallazgos", "whois_cache.sqlite3"))
+WHOIS_CACHE_DAYS = float(os.getenv("RECONBOT_WHOIS_CACHE_DAYS", "7"))
+WHOIS_TLD_RATE = float(os.getenv("RECONBOT_WHOIS_TLD_RATE", "0.5"))
 
 
 class ReconBot:
-    def __init__(self, domain: str):
+    def __init__(self, domain: str, rate_limits: Optional[Dict[str, TokenBucket]] = None,
+                 session: Optional[requests.Session] = None, incremental: bool = False,
+                 llm_client: Optional[Any] = None, report_renderer: Optional[ReportRenderer] = None,
+                 whois_client: Optional[WhoisClient] = None,
+                 resolver: Optional[dns.asyncresolver.Resolver] = None, search_url: str = DUCKDUCKGO_URL):
         self.domain = domain
+        # En modo incremental se compara con el análisis anterior y, si nada
+        # cambió, se omiten el análisis con IA, el resumen y los informes
+        self.incremental = incremental
+        self.previous = load_results(domain) if incremental else None
+        # Sesión HTTP con pool de conexiones, timeouts y reintentos (compartida por defecto)
+        self.session = session or get_session()
+        # Límites de tasa por etapa, compartidos entre todos los análisis de un lote
+        self.rate_limits = rate_limits or {}
         self.results = {
             "dns_records": {},
             "whois_info": {},
             "dork_results": {},
             "ai_analysis": {}
         }
+        self.ai_summary = ""
         load_dotenv()
         self.api_url = os.getenv(
             "API_URL", "http://localhost:8000/api/analyze/")
         openai.api_key = os.getenv("OPENAI_API_KEY")
-        if not openai.api_key:
-            raise ValueError("OPENAI_API_KEY no encontrada en el archivo .env")
+        # Cliente del modelo de lenguaje (ver core/infrastructure/llm/chat_client.py)
+        self.llm_client = llm_client or build_llm_client()
+        # Pool de procesos para los informes; sin él se generan en el propio hilo
+        self.report_renderer = report_renderer
+        # Cliente WHOIS con caché y límite por TLD (compartido en modo lote)
+        self.whois_client = whois_client or build_whois_client()
+        # Resolver DNS (por defecto el del sistema) y buscador de los dorks
+        self.resolver = resolver
+        self.search_url = search_url
 
         # Crear directorio de hallazgos si no existe
         self.hallazgos_dir = "hallazgos"
-        if not os.path.exists(self.hallazgos_dir):
-            os.makedirs(self.hallazgos_dir)
+        os.makedirs(self.hallazgos_dir, exist_ok=True)
 
     def get_dns_records(self) -> Dict[str, Any]:
-        """Obtiene registros DNS del dominio."""
+        """Obtiene registros DNS del dominio resolviendo todos los tipos en paralelo."""
         try:
-            # Registro A
-            a_records = dns.resolver.resolve(self.domain, 'A')
-            self.results["dns_records"]["A"] = [str(r) for r in a_records]
-
-            # Registro MX
-            mx_records = dns.resolver.resolve(self.domain, 'MX')
-            self.results["dns_records"]["MX"] = [str(r) for r in mx_records]
-
-            # Registro NS
-            ns_records = dns.resolver.resolve(self.domain, 'NS')
-            self.results["dns_records"]["NS"] = [str(r) for r in ns_records]
-
-            # Registro SOA
-            soa_records = dns.resolver.resolve(self.domain, 'SOA')
-            self.results["dns_records"]["SOA"] = [str(r) for r in soa_records]
-
-            # Registro TXT
-            try:
-                txt_records = dns.resolver.resolve(self.domain, 'TXT')
-                self.results["dns_records"]["TXT"] = [
-                    str(r) for r in txt_records]
-            except:
-                self.results["dns_records"]["TXT"] = []
-
+            self.results["dns_records"] = asyncio.run(self._resolve_dns_records())
         except Exception as e:
             print(f"Error al obtener registros DNS: {str(e)}")
 
         return self.results["dns_records"]
 
+    async def _resolve_dns_records(self) -> Dict[str, List[str]]:
+        resolver = self.resolver or dns.asyncresolver.Resolver()
+        semaphore = asyncio.Semaphore(DNS_MAX_CONCURRENCY)
+
+        async def resolve(record_type: str) -> List[str]:
+            async with semaphore:
+                try:
+                    answer = await resolver.resolve(
+                        self.domain, record_type, lifetime=DNS_TIMEOUT)
+                    return [str(r) for r in answer]
+                except Exception as e:
+                    print(f"Error al obtener registros {record_type}: {str(e)}")
+                    return []
+
+        records = await asyncio.gather(*(resolve(t) for t in DNS_RECORD_TYPES))
+        return dict(zip(DNS_RECORD_TYPES, records))
+
     def get_whois_info(self) -> Dict[str, Any]:
         """Obtiene información WHOIS del dominio."""
         try:
-            w = whois.whois(self.domain)
+            info = self.whois_client.lookup(self.domain)
             self.results["whois_info"] = {
-                "registrar": w.registrar,
-                "creation_date": str(w.creation_date),
-                "expiration_date": str(w.expiration_date),
-                "name_servers": w.name_servers,
-                "status": w.status
+                "registrar": info["registrar"],
+                "creation_date": info["creation_date"],
+                "expiration_date": info["expiration_date"],
+                "name_servers": info["name_servers"],
+                "status": info["status"]
             }
         except Exception as e:
             print(f"Error al obtener información WHOIS: {str(e)}")
@@ -98,17 +143,8 @@ class ReconBot:
                 print(f"\n[*] Ejecutando búsqueda: {dork}")
                 results = []
 
-                # Usar DuckDuckGo para las búsquedas
-                import requests
-                from bs4 import BeautifulSoup
-
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
-
-                # Realizar la búsqueda en DuckDuckGo
-                search_url = f"https://html.duckduckgo.com/html/?q={dork}"
-                response = requests.get(search_url, headers=headers)
+                # Realizar la búsqueda en DuckDuckGo con la sesión compartida
+                response = self.session.get(self.search_url, params={"q": dork})
 
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.text, 'html.parser')
@@ -132,7 +168,7 @@ class ReconBot:
     def analyze_with_ai(self) -> Dict[str, Any]:
         """Envía los resultados a la API de análisis con IA."""
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
                 json={"text": json.dumps(self.results["dork_results"])}
             )
@@ -148,20 +184,24 @@ class ReconBot:
     def generate_ai_summary(self) -> str:
         """Genera un resumen de los hallazgos usando OpenAI."""
         try:
+            # Entradas en forma canónica: el mismo hallazgo produce siempre el mismo
+            # prompt y, por tanto, la misma clave en la caché de resúmenes
+            dns_records = {record_type: sorted(values)
+                           for record_type, values in self.results['dns_records'].items()}
             prompt = f"""
             Analiza los siguientes hallazgos de seguridad para el dominio {self.domain} y genera un informe detallado:
 
             Registros DNS:
-            {json.dumps(self.results['dns_records'], indent=2)}
+            {json.dumps(dns_records, indent=2, sort_keys=True)}
 
             Información WHOIS:
-            {json.dumps(self.results['whois_info'], indent=2)}
+            {json.dumps(self.results['whois_info'], indent=2, sort_keys=True)}
 
             Resultados de búsquedas Dork:
-            {json.dumps(self.results['dork_results'], indent=2)}
+            {json.dumps(self.results['dork_results'], indent=2, sort_keys=True)}
 
             Análisis de IA:
-            {json.dumps(self.results['ai_analysis'], indent=2)}
+            {json.dumps(self.results['ai_analysis'], indent=2, sort_keys=True)}
 
             Por favor, genera un informe que incluya:
             1. Resumen ejecutivo
@@ -173,30 +213,12 @@ class ReconBot:
             El informe debe ser técnico pero comprensible, y enfocarse en los aspectos de seguridad más importantes.
             """
 
-            # Configurar el cliente de OpenAI
-            openai.api_key = os.getenv("OPENAI_API_KEY")
-
-            # Intentar generar el resumen con un máximo de 3 intentos
-            for attempt in range(3):
-                try:
-                    response = openai.chat.completions.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                            {"role": "system", "content": "Eres un experto en seguridad informática que genera informes detallados de análisis de seguridad."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.7,
-                        max_tokens=2000
-                    )
-                    return response.choices[0].message.content
-                except Exception as e:
-                    if attempt < 2:  # Si no es el último intento
-                        print(
-                            f"Intento {attempt + 1} fallido, reintentando...")
-                        import time
-                        time.sleep(2)  # Esperar 2 segundos entre intentos
-                    else:
-                        raise e
+            # El cliente reintenta con espera exponencial y sirve desde la caché
+            # los prompts ya resumidos
+            return self.llm_client.complete([
+                {"role": "system", "content": "Eres un experto en seguridad informática que genera informes detallados de análisis de seguridad."},
+                {"role": "user", "content": prompt}
+            ], SUMMARY_MODEL, **SUMMARY_PARAMS)
 
         except Exception as e:
             print(f"Error al generar resumen con OpenAI: {str(e)}")
@@ -205,410 +227,293 @@ class ReconBot:
     def generate_html_report(self, ai_summary: str):
         """Genera un informe HTML con los resultados."""
         try:
-            # Crear el contenido HTML usando variables separadas
-            domain = self.domain
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            escaped_summary = html.escape(ai_summary).replace('\n', '<br>')
-            dns_html = self._generate_dns_html()
-            whois_html = self._generate_whois_html()
-            dork_html = self._generate_dork_html()
-
-            html_content = f"""
-            <!DOCTYPE html>
-            <html lang="es">
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>Informe de Seguridad - {domain}</title>
-                <style>
-                    :root {{
-                        --primary-color: #2c3e50;
-                        --secondary-color: #3498db;
-                        --accent-color: #e74c3c;
-                        --background-color: #f8f9fa;
-                        --text-color: #2c3e50;
-                        --border-radius: 8px;
-                        --box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                    }}
-
-                    body {{
-                        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                        line-height: 1.6;
-                        margin: 0;
-                        padding: 20px;
-                        color: var(--text-color);
-                        background-color: var(--background-color);
-                    }}
-
-                    .container {{
-                        max-width: 1200px;
-                        margin: 0 auto;
-                        padding: 20px;
-                    }}
-
-                    .header {{
-                        text-align: center;
-                        margin-bottom: 40px;
-                        padding: 30px;
-                        background: linear-gradient(135deg, var(--primary-color), var(--secondary-color));
-                        color: white;
-                        border-radius: var(--border-radius);
-                        box-shadow: var(--box-shadow);
-                    }}
-
-                    .header h1 {{
-                        margin: 0;
-                        font-size: 2.5em;
-                        font-weight: 600;
-                    }}
-
-                    .header h2 {{
-                        margin: 10px 0;
-                        font-size: 1.8em;
-                        font-weight: 400;
-                    }}
-
-                    .timestamp {{
-                        font-style: italic;
-                        color: rgba(255, 255, 255, 0.9);
-                        margin-top: 10px;
-                    }}
-
-                    .section {{
-                        margin-bottom: 40px;
-                        padding: 25px;
-                        background-color: white;
-                        border-radius: var(--border-radius);
-                        box-shadow: var(--box-shadow);
-                    }}
-
-                    .section h2 {{
-                        color: var(--primary-color);
-                        border-bottom: 2px solid var(--secondary-color);
-                        padding-bottom: 10px;
-                        margin-top: 0;
-                    }}
-
-                    .summary {{
-                        white-space: pre-wrap;
-                        background-color: var(--background-color);
-                        padding: 20px;
-                        border-radius: var(--border-radius);
-                        border-left: 4px solid var(--secondary-color);
-                    }}
-
-                    .dns-record, .whois-info {{
-                        margin-bottom: 15px;
-                        padding: 15px;
-                        background-color: var(--background-color);
-                        border-radius: var(--border-radius);
-                    }}
-
-                    .dns-record h3, .whois-info h3 {{
-                        color: var(--secondary-color);
-                        margin-top: 0;
-                    }}
-
-                    .dork-result {{
-                        margin-bottom: 20px;
-                        padding: 15px;
-                        background-color: var(--background-color);
-                        border-radius: var(--border-radius);
-                    }}
-
-                    .dork-result h3 {{
-                        color: var(--secondary-color);
-                        margin-top: 0;
-                    }}
-
-                    .url {{
-                        color: var(--secondary-color);
-                        text-decoration: none;
-                        transition: color 0.3s ease;
-                    }}
-
-                    .url:hover {{
-                        color: var(--accent-color);
-                        text-decoration: underline;
-                    }}
-
-                    .critical {{
-                        color: var(--accent-color);
-                        font-weight: bold;
-                    }}
-
-                    .recommendation {{
-                        background-color: #e8f4f8;
-                        padding: 15px;
-                        border-radius: var(--border-radius);
-                        margin: 10px 0;
-                        border-left: 4px solid var(--secondary-color);
-                    }}
-
-                    @media print {{
-                        body {{
-                            background-color: white;
-                        }}
-                        .section {{
-                            box-shadow: none;
-                            border: 1px solid #ddd;
-                        }}
-                        .header {{
-                            background: var(--primary-color);
-                        }}
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>Informe de Seguridad</h1>
-                        <h2>Dominio: {domain}</h2>
-                        <p class="timestamp">Fecha: {timestamp}</p>
-                    </div>
-
-                    <div class="section">
-                        <h2>Resumen del Análisis</h2>
-                        <div class="summary">
-                            {escaped_summary}
-                        </div>
-                    </div>
-
-                    <div class="section">
-                        <h2>Registros DNS</h2>
-                        {dns_html}
-                    </div>
-
-                    <div class="section">
-                        <h2>Información WHOIS</h2>
-                        {whois_html}
-                    </div>
-
-                    <div class="section">
-                        <h2>Resultados de Búsquedas Dork</h2>
-                        {dork_html}
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-
-            output_file = os.path.join(
-                self.hallazgos_dir, f"reconbot_{self.domain.replace('.', '_')}_report.html")
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            output_file = report_path(self.hallazgos_dir, self.domain, "html")
+            # La plantilla se compila una vez y el informe se escribe a medida que se genera
+            render_html_report(output_file, self.domain, self.results, ai_summary)
             print(f"\n[+] Informe HTML generado: {output_file}")
 
         except Exception as e:
             print(f"Error al generar el informe HTML: {str(e)}")
 
-    def _generate_dns_html(self) -> str:
-        """Genera el HTML para la sección de DNS."""
-        html = ""
-        for record_type, records in self.results['dns_records'].items():
-            html += f'<div class="dns-record">'
-            html += f'<h3>{record_type}</h3>'
-            for record in records:
-                html += f'<p>  - {record}</p>'
-            html += '</div>'
-        return html
-
-    def _generate_whois_html(self) -> str:
-        """Genera el HTML para la sección de WHOIS."""
-        html = ""
-        for key, value in self.results['whois_info'].items():
-            html += f'<div class="whois-info">'
-            if isinstance(value, list):
-                html += f'<h3>{key}</h3>'
-                for item in value:
-                    html += f'<p>  - {item}</p>'
-            else:
-                html += f'<p><strong>{key}:</strong> {value}</p>'
-            html += '</div>'
-        return html
-
-    def _generate_dork_html(self) -> str:
-        """Genera el HTML para la sección de Dork."""
-        html = ""
-        for dork, urls in self.results['dork_results'].items():
-            html += f'<div class="dork-result">'
-            html += f'<h3>Búsqueda: {dork}</h3>'
-            for url in urls:
-                html += f'<p><a href="{url}" class="url" target="_blank">{url}</a></p>'
-            html += '</div>'
-        return html
-
     def generate_pdf_report(self, ai_summary: str):
         """Genera un informe PDF con los resultados."""
         try:
-            pdf = FPDF()
-            pdf.add_page()
-
-            # Configurar fuentes
-            try:
-                # Nueva forma de agregar fuentes en FPDF2
-                pdf.add_font('DejaVu', '', 'DejaVuSansCondensed.ttf')
-                pdf.add_font('DejaVu', 'B', 'DejaVuSansCondensed-Bold.ttf')
-                pdf.add_font('DejaVu', 'I', 'DejaVuSansCondensed-Oblique.ttf')
-                font_family = 'DejaVu'
-            except:
-                font_family = 'helvetica'
-
-            # Configurar colores
-            primary_color = (44, 62, 80)    # Azul oscuro
-            secondary_color = (52, 152, 219)  # Azul
-            accent_color = (231, 76, 60)     # Rojo
-            text_color = (44, 62, 80)        # Texto principal
-            light_bg = (248, 249, 250)       # Fondo claro
-
-            # Título con fondo
-            pdf.set_fill_color(*primary_color)
-            pdf.set_text_color(255, 255, 255)
-            pdf.set_font(font_family, 'B', 24)
-            pdf.cell(0, 30, f'Informe de Seguridad - {self.domain}',
-                     new_x="LMARGIN", new_y="NEXT", align='C', fill=True)
-            pdf.ln(10)
-
-            # Fecha con estilo
-            pdf.set_text_color(*secondary_color)
-            pdf.set_font(font_family, 'I', 12)
-            pdf.cell(
-                0, 10, f'Fecha: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}', new_x="LMARGIN", new_y="NEXT")
-            pdf.ln(10)
-
-            # Resumen de IA con fondo
-            pdf.set_fill_color(*light_bg)
-            pdf.set_text_color(*text_color)
-            pdf.set_font(font_family, 'B', 16)
-            pdf.cell(0, 15, 'Resumen del Análisis',
-                     new_x="LMARGIN", new_y="NEXT")
-            pdf.ln(5)
-
-            # Fondo para el resumen
-            pdf.set_fill_color(*light_bg)
-            pdf.rect(10, pdf.get_y(), 190, 60, style='F')
-
-            pdf.set_font(font_family, '', 12)
-            pdf.set_text_color(0, 0, 0)
-            for line in ai_summary.split('\n'):
-                pdf.multi_cell(0, 10, line)
-                pdf.ln(2)
-
-            # Registros DNS
-            pdf.add_page()
-            pdf.set_fill_color(*primary_color)
-            pdf.set_text_color(255, 255, 255)
-            pdf.set_font(font_family, 'B', 16)
-            pdf.cell(0, 15, 'Registros DNS', new_x="LMARGIN",
-                     new_y="NEXT", fill=True)
-            pdf.ln(5)
-
-            pdf.set_font(font_family, '', 12)
-            for record_type, records in self.results['dns_records'].items():
-                pdf.set_text_color(*secondary_color)
-                pdf.cell(0, 10, f'{record_type}:',
-                         new_x="LMARGIN", new_y="NEXT")
-                pdf.set_text_color(0, 0, 0)
-                for record in records:
-                    pdf.cell(0, 10, f'  - {record}',
-                             new_x="LMARGIN", new_y="NEXT")
-                pdf.ln(2)
-
-            # Información WHOIS
-            pdf.add_page()
-            pdf.set_fill_color(*primary_color)
-            pdf.set_text_color(255, 255, 255)
-            pdf.set_font(font_family, 'B', 16)
-            pdf.cell(0, 15, 'Información WHOIS',
-                     new_x="LMARGIN", new_y="NEXT", fill=True)
-            pdf.ln(5)
-
-            pdf.set_font(font_family, '', 12)
-            for key, value in self.results['whois_info'].items():
-                pdf.set_text_color(*secondary_color)
-                if isinstance(value, list):
-                    pdf.cell(0, 10, f'{key}:', new_x="LMARGIN", new_y="NEXT")
-                    pdf.set_text_color(0, 0, 0)
-                    for item in value:
-                        pdf.cell(0, 10, f'  - {item}',
-                                 new_x="LMARGIN", new_y="NEXT")
-                else:
-                    pdf.cell(0, 10, f'{key}: {value}',
-                             new_x="LMARGIN", new_y="NEXT")
-                pdf.ln(2)
-
-            # Resultados Dork
-            pdf.add_page()
-            pdf.set_fill_color(*primary_color)
-            pdf.set_text_color(255, 255, 255)
-            pdf.set_font(font_family, 'B', 16)
-            pdf.cell(0, 15, 'Resultados de Búsquedas Dork',
-                     new_x="LMARGIN", new_y="NEXT", fill=True)
-            pdf.ln(5)
-
-            pdf.set_font(font_family, '', 12)
-            for dork, urls in self.results['dork_results'].items():
-                pdf.set_text_color(*secondary_color)
-                pdf.cell(0, 10, f'Búsqueda: {dork}',
-                         new_x="LMARGIN", new_y="NEXT")
-                pdf.set_text_color(0, 0, 0)
-                for url in urls:
-                    pdf.cell(0, 10, f'  - {url}',
-                             new_x="LMARGIN", new_y="NEXT")
-                pdf.ln(2)
-
-            # Guardar PDF
-            output_file = os.path.join(
-                self.hallazgos_dir, f"reconbot_{self.domain.replace('.', '_')}_report.pdf")
-            pdf.output(output_file)
+            output_file = report_path(self.hallazgos_dir, self.domain, "pdf")
+            render_pdf_report(output_file, self.domain, self.results, ai_summary)
             print(f"\n[+] Informe PDF generado: {output_file}")
 
         except Exception as e:
             print(f"Error al generar el informe PDF: {str(e)}")
 
+    def generate_reports(self, ai_summary: str):
+        """Genera los informes PDF y HTML, en paralelo si hay un pool de informes."""
+        if self.report_renderer is None:
+            self.generate_pdf_report(ai_summary)
+            self.generate_html_report(ai_summary)
+            return
+        paths = self.report_renderer.render(self.hallazgos_dir, self.domain, self.results, ai_summary)
+        for report_format, output_file in paths.items():
+            if output_file:
+                print(f"\n[+] Informe {report_format.upper()} generado: {output_file}")
+
+    def detect_changes(self) -> Dict[str, Any]:
+        """Compara los datos recogidos con los del análisis anterior del dominio."""
+        previous = self.previous or {}
+        previous_urls = [url for urls in previous.get("dork_results", {}).values() for url in urls]
+        urls = [url for urls in self.results["dork_results"].values() for url in urls]
+        changes = {
+            "dns": diff_dns(previous.get("dns_records", {}), self.results["dns_records"]),
+            "whois": diff_whois(previous.get("whois_info"), self.results["whois_info"]),
+            "dorks": diff_urls(previous_urls, urls),
+        }
+        self.results["changes"] = changes
+        if self.previous is None:
+            print("[*] No hay un análisis anterior: se realiza el análisis completo")
+        elif not has_changes(changes):
+            print("[=] Sin cambios desde el análisis anterior: se reutilizan su análisis e informes")
+            self.results["ai_analysis"] = previous.get("ai_analysis", {})
+        else:
+            print(f"[+] Cambios detectados en: "
+                  f"{', '.join(name for name, diff in changes.items() if has_changes(diff))}")
+        return changes
+
+    def unchanged(self) -> bool:
+        return self.previous is not None and not has_changes(self.results.get("changes"))
+
+    def build_stages(self) -> List[Stage]:
+        """Etapas del análisis y sus dependencias."""
+        skip_if = self.unchanged if self.incremental else None
+        stages = [
+            Stage("dns", self.get_dns_records,
+                  description="Obteniendo registros DNS"),
+            Stage("whois", self.get_whois_info,
+                  description="Obteniendo información WHOIS"),
+            Stage("dorking", self.perform_dorking,
+                  description="Realizando búsquedas Dork"),
+            Stage("analysis", self.analyze_with_ai,
+                  ("dorking", "changes") if self.incremental else ("dorking",),
+                  description="Analizando resultados con IA", skip_if=skip_if),
+            Stage("summary", self._generate_summary, ("dns", "whois", "dorking", "analysis"),
+                  description="Generando resumen con OpenAI", skip_if=skip_if),
+            Stage("reports", lambda: self.generate_reports(self.ai_summary), ("summary",),
+                  description="Generando informes PDF y HTML", skip_if=skip_if),
+        ]
+        if self.incremental:
+            stages.append(Stage("changes", self.detect_changes, ("dns", "whois", "dorking"),
+                                description="Comparando con el análisis anterior"))
+        return stages
+
+    def _generate_summary(self):
+        self.ai_summary = self.generate_ai_summary()
+
     def run_analysis(self) -> Dict[str, Any]:
-        """Ejecuta el análisis completo."""
+        """Ejecuta el análisis completo; las etapas independientes corren en paralelo."""
         print(f"\n[*] Iniciando análisis del dominio: {self.domain}")
 
-        print("\n[+] Obteniendo registros DNS...")
-        self.get_dns_records()
+        scheduler = StageScheduler(
+            self.build_stages(), max_workers=STAGE_WORKERS, rate_limits=self.rate_limits,
+            metrics=metrics_registry)
+        self.results["stage_timings"] = scheduler.run()
 
-        print("\n[+] Obteniendo información WHOIS...")
-        self.get_whois_info()
+        return self.results
 
-        print("\n[+] Realizando búsquedas Dork...")
-        self.perform_dorking()
 
-        print("\n[+] Analizando resultados con IA...")
-        self.analyze_with_ai()
+def build_llm_client(stub: bool = False, cache_file: Optional[str] = SUMMARY_CACHE_FILE) -> CachedChatClient:
+    """Cliente de OpenAI (o local, con `stub`) con caché de resúmenes si se indica fichero."""
+    load_dotenv()
+    if not stub and not os.getenv("OPENAI_API_KEY"):
+        raise ValueError("OPENAI_API_KEY no encontrada en el archivo .env")
+    cache = SummaryCache(cache_file, max_bytes=int(SUMMARY_CACHE_MAX_MB * 1024 * 1024)) if cache_file else None
+    return CachedChatClient(StubChatClient() if stub else OpenAIChatClient(), cache)
 
-        print("\n[+] Generando resumen con OpenAI...")
-        ai_summary = self.generate_ai_summary()
 
-        print("\n[+] Generando informes...")
-        self.generate_pdf_report(ai_summary)
-        self.generate_html_report(ai_summary)
+def build_whois_client(cache_file: Optional[str] = WHOIS_CACHE_FILE) -> WhoisClient:
+    """Cliente WHOIS con caché en disco (si se indica fichero) y límite de tasa por TLD."""
+    cache = WhoisCache(cache_file, ttl_days=WHOIS_CACHE_DAYS) if cache_file else None
+    # En un lote cada consulta espera su turno sin límite: el TLD marca el ritmo del análisis
+    return WhoisClient(cache=cache, tld_rate=WHOIS_TLD_RATE, max_wait=None)
+
+
+def results_file(domain: str) -> str:
+    return os.path.join("hallazgos", f"reconbot_{domain.replace('.', '_')}.json")
 
-        return self.results
+
+def load_results(domain: str) -> Optional[Dict[str, Any]]:
+    """Resultados del último análisis guardado del dominio, si existe."""
+    try:
+        with open(results_file(domain), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_results(domain: str, results: Dict[str, Any]) -> str:
+    """Guarda los resultados de un dominio en un archivo JSON."""
+    output_file = results_file(domain)
+    with open(output_file, 'w') as f:
+        json.dump({"domain": domain, **results}, f, indent=4)
+    return output_file
+
+
+def read_domains(source: str) -> List[str]:
+    """Lee un dominio por línea de un fichero ('-' para stdin), sin duplicados ni comentarios."""
+    f = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        lines = [line.strip() for line in f]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    return list(dict.fromkeys(line for line in lines if line and not line.startswith("#")))
+
+
+def parse_rate_limits(values: List[str]) -> Dict[str, TokenBucket]:
+    """Convierte argumentos ETAPA=POR_SEGUNDO en limitadores por etapa."""
+    limits = {}
+    for value in values:
+        stage, _, rate = value.partition("=")
+        try:
+            limits[stage.strip()] = TokenBucket(rate=float(rate))
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"Límite inválido '{value}', se esperaba ETAPA=POR_SEGUNDO (p.ej. whois=0.5)")
+    return limits
+
+
+def run_batch(domains: List[str], workers: int, rate_limits: Dict[str, TokenBucket],
+              summary_file: str, force: bool = False, incremental: bool = False,
+              llm_client: Optional[CachedChatClient] = None,
+              report_renderer: Optional[ReportRenderer] = None,
+              whois_client: Optional[WhoisClient] = None) -> Dict[str, int]:
+    """Analiza muchos dominios en paralelo; los ya analizados en hallazgos/ se omiten.
+
+    En modo incremental se reanalizan todos, pero los que no cambiaron sólo
+    repiten la recogida de datos.
+    """
+    pending = [d for d in domains if force or incremental or not os.path.exists(results_file(d))]
+    skipped = len(domains) - len(pending)
+    if skipped:
+        print(f"[*] Omitiendo {skipped} dominios ya analizados (use --force para repetirlos)")
+
+    os.makedirs(os.path.dirname(summary_file) or ".", exist_ok=True)
+    summary_lock = threading.Lock()
+    # Todos los dominios comparten la caché WHOIS y el presupuesto de cada TLD
+    whois_client = whois_client or build_whois_client()
+
+    def analyze(domain: str) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            results = ReconBot(domain, rate_limits=rate_limits, incremental=incremental,
+                               llm_client=llm_client, report_renderer=report_renderer,
+                               whois_client=whois_client).run_analysis()
+            entry = {
+                "domain": domain,
+                "status": "ok",
+                "output_file": save_results(domain, results),
+                "dns_records": sum(len(r) for r in results["dns_records"].values()),
+                "dork_urls": sum(len(u) for u in results["dork_results"].values()),
+                "classification": results["ai_analysis"].get("classification"),
+            }
+            if incremental:
+                entry["changed"] = has_changes(results.get("changes"))
+        except Exception as e:
+            entry = {"domain": domain, "status": "error", "error": str(e)}
+        entry["duration"] = round(time.perf_counter() - start, 3)
+        with summary_lock:
+            with open(summary_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+    counts = {"total": len(domains), "skipped": skipped, "ok": 0, "error": 0}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reconbot-domain") as pool:
+        for entry in pool.map(analyze, pending):
+            counts[entry["status"]] += 1
+    return counts
 
 
 def main():
     parser = argparse.ArgumentParser(
         description="ReconBot - Herramienta de Reconocimiento Automatizado")
-    parser.add_argument("domain", help="Dominio objetivo para el análisis")
+    parser.add_argument("domain", nargs="?", help="Dominio objetivo para el análisis")
+    parser.add_argument("-f", "--file",
+                        help="Modo lote: fichero con un dominio por línea ('-' para leer de stdin)")
+    parser.add_argument("-w", "--workers", type=int, default=4,
+                        help="Dominios analizados en paralelo en modo lote (por defecto 4)")
+    parser.add_argument("--rate", action="append", default=[], metavar="ETAPA=POR_SEGUNDO",
+                        help="Límite de ejecuciones por segundo de una etapa (dns, whois, dorking, "
+                             "analysis, summary...); se puede repetir")
+    parser.add_argument("--summary", default=os.path.join("hallazgos", "reconbot_summary.ndjson"),
+                        help="Fichero NDJSON con el resumen del lote")
+    parser.add_argument("--force", action="store_true",
+                        help="Repetir también los dominios que ya tienen resultados")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Comparar con el análisis anterior y omitir el análisis con IA, el "
+                             "resumen y los informes si nada cambió")
+    parser.add_argument("--no-summary-cache", action="store_true",
+                        help="No reutilizar resúmenes ya generados para los mismos hallazgos")
+    parser.add_argument("--no-whois-cache", action="store_true",
+                        help="Consultar siempre los servidores WHOIS en lugar de la caché")
+    parser.add_argument("--stub-llm", action="store_true",
+                        help="Usar un cliente local en lugar de OpenAI (pruebas sin conexión)")
+    parser.add_argument("--report-workers", type=int, default=REPORT_WORKERS,
+                        help=f"Procesos que generan los informes (por defecto {REPORT_WORKERS})")
+    parser.add_argument("--metrics-file",
+                        help="Guardar al terminar las métricas de las etapas en formato Prometheus "
+                             "(p.ej. para el textfile collector de node_exporter)")
     args = parser.parse_args()
-
-    reconbot = ReconBot(args.domain)
-    results = reconbot.run_analysis()
+    if not args.domain and not args.file:
+        parser.error("indique un dominio o un fichero de dominios con --file")
+    try:
+        rate_limits = parse_rate_limits(args.rate)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    # Un único cliente, y por tanto una única caché de resúmenes, para todos los dominios
+    llm_client = build_llm_client(
+        stub=args.stub_llm, cache_file=None if args.no_summary_cache else SUMMARY_CACHE_FILE)
+    whois_client = build_whois_client(cache_file=None if args.no_whois_cache else WHOIS_CACHE_FILE)
+
+    try:
+        run(args, rate_limits, llm_client, whois_client)
+    finally:
+        if args.metrics_file:
+            save_metrics(args.metrics_file)
+
+
+def run(args, rate_limits: Dict[str, TokenBucket], llm_client: CachedChatClient, whois_client: WhoisClient):
+    # El pool de informes se crea antes de lanzar hilos y lo comparten todos los dominios
+    with ReportRenderer(max_workers=args.report_workers) as report_renderer:
+        if args.file:
+            domains = read_domains(args.file)
+            if args.domain:
+                domains = list(dict.fromkeys([args.domain] + domains))
+            counts = run_batch(domains, args.workers, rate_limits, args.summary,
+                               force=args.force, incremental=args.incremental,
+                               llm_client=llm_client, report_renderer=report_renderer,
+                               whois_client=whois_client)
+            print(f"\n[+] Lote completado: {counts['ok']} correctos, {counts['error']} con error, "
+                  f"{counts['skipped']} omitidos. Resumen en: {args.summary}")
+            return
+
+        reconbot = ReconBot(args.domain, rate_limits=rate_limits, incremental=args.incremental,
+                            llm_client=llm_client, report_renderer=report_renderer,
+                            whois_client=whois_client)
+        results = reconbot.run_analysis()
 
     # Guardar resultados en un archivo JSON
-    output_file = os.path.join(
-        "hallazgos", f"reconbot_{args.domain.replace('.', '_')}.json")
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=4)
+    output_file = save_results(args.domain, results)
 
     print(f"\n[+] Análisis completado. Resultados guardados en: {output_file}")
 
 
+def save_metrics(path: str):
+    """Escribe las métricas del proceso; se escribe a un temporal y se renombra para no leerlas a medias."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(metrics_registry.render())
+    os.replace(tmp_path, path)
+    print(f"[+] Métricas guardadas en: {path}")
+
 if __name__ == "__main__":
     main()
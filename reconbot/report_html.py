@@ -0,0 +1,67 @@
+"""Informe HTML de ReconBot generado con el motor de plantillas de Django.
+
+La plantilla (templates/report.html) se compila una sola vez con un
+`Engine` propio con autoescape activado, así que todos los valores del
+informe se escapan al renderizar. No necesita settings de Django: ReconBot
+se ejecuta como script independiente, por lo que se desactivan la
+localización y las zonas horarias y los valores se pasan como texto.
+"""
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import os
+
+from django.template import Context, Engine, Template
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+REPORT_TEMPLATE = "report.html"
+# Tamaño del buffer de escritura del fichero de salida
+WRITE_BUFFER = 1 << 16
+
+_engine = Engine(dirs=[TEMPLATE_DIR], autoescape=True)
+
+
+@lru_cache(maxsize=None)
+def load_template(name: str = REPORT_TEMPLATE) -> Template:
+    return _engine.get_template(name)
+
+
+def _is_http(url: str) -> bool:
+    # Sólo se enlazan URLs http(s); el resto (javascript:, data:...) se muestra sin enlace
+    return url[:8].lower().startswith(("http://", "https://"))
+
+
+def _dns_items(dns_records: Dict[str, List[Any]]) -> Iterator[Tuple[str, List[str]]]:
+    for record_type, records in dns_records.items():
+        yield str(record_type), [str(record) for record in records]
+
+
+def _whois_items(whois_info: Dict[str, Any]) -> Iterator[Tuple[str, str, Optional[List[str]]]]:
+    # (campo, valor, elementos): los campos con lista se muestran como viñetas
+    for key, value in whois_info.items():
+        if isinstance(value, list):
+            yield str(key), "", [str(item) for item in value]
+        else:
+            yield str(key), str(value), None
+
+
+def _dork_items(dork_results: Dict[str, List[str]]) -> Iterator[Tuple[str, List[Tuple[str, bool]]]]:
+    for dork, urls in dork_results.items():
+        yield str(dork), [(str(url), _is_http(str(url))) for url in urls]
+
+
+def render_html_report(output_file: str, domain: str, results: Dict[str, Any], summary: str,
+                       timestamp: Optional[str] = None) -> str:
+    """Escribe el informe HTML de un dominio en `output_file` y devuelve su ruta."""
+    context = Context({
+        "domain": str(domain),
+        "timestamp": timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "summary": str(summary),
+        "dns_records": _dns_items(results.get("dns_records", {})),
+        "whois_info": _whois_items(results.get("whois_info", {})),
+        "dork_results": _dork_items(results.get("dork_results", {})),
+    }, autoescape=True, use_l10n=False, use_tz=False)
+    html = load_template().render(context)
+    with open(output_file, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        f.write(html)
+    return output_file
@@ -0,0 +1,242 @@
+"""Informe PDF de ReconBot.
+
+Las fuentes DejaVu se buscan y analizan una sola vez por proceso
+(ReportFonts) y cada documento recibe una copia de las fuentes ya
+analizadas, en lugar de volver a leer los ficheros TTF en cada informe.
+"""
+from datetime import datetime
+from io import BytesIO
+from typing import Any, Dict, List, Optional
+import copy
+import os
+
+from fpdf import FPDF
+
+# Internos de fpdf2 (y fontTools, del que depende): pueden cambiar entre
+# versiones; sin ellos las fuentes se registran con add_font en cada documento
+try:
+    from fontTools import ttLib
+    from fpdf.fonts import SubsetMap, TTFFont
+except ImportError:
+    ttLib = SubsetMap = TTFFont = None
+
+FONT_FAMILY = "DejaVu"
+FALLBACK_FONT_FAMILY = "helvetica"
+# Directorios donde se buscan las fuentes, por orden
+FONT_DIRS = [
+    os.getenv("RECONBOT_FONT_DIR", ""),
+    os.getcwd(),
+    os.path.dirname(os.path.abspath(__file__)),
+    "/usr/share/fonts/truetype/dejavu",
+    "/usr/share/fonts/dejavu",
+    "/Library/Fonts",
+]
+# Ficheros candidatos por estilo; si falta la cursiva o la negrita se usa la regular
+FONT_FILES = {
+    "": ("DejaVuSansCondensed.ttf", "DejaVuSans.ttf"),
+    "B": ("DejaVuSansCondensed-Bold.ttf", "DejaVuSans-Bold.ttf"),
+    "I": ("DejaVuSansCondensed-Oblique.ttf", "DejaVuSans-Oblique.ttf"),
+}
+
+
+def find_font_files(font_dirs: List[str] = FONT_DIRS) -> Dict[str, str]:
+    """Ruta de la fuente DejaVu de cada estilo, o un diccionario vacío si no hay regular."""
+    found = {}
+    for style, names in FONT_FILES.items():
+        for name in names:
+            paths = [os.path.join(directory, name) for directory in font_dirs if directory]
+            path = next((path for path in paths if os.path.isfile(path)), None)
+            if path:
+                found[style] = path
+                break
+    if "" not in found:
+        return {}
+    return {style: found.get(style, found[""]) for style in FONT_FILES}
+
+
+class ReportFonts:
+    """Fuentes del informe, analizadas una vez y reutilizables en muchos documentos.
+
+    fpdf2 analiza el TTF completo en cada add_font (más de la mitad del
+    tiempo de un informe pequeño). Aquí se analiza una vez y cada documento
+    recibe una copia superficial con su propio estado de subconjunto de
+    glifos. Si la versión de fpdf2 no lo permite se recurre a add_font.
+    """
+
+    def __init__(self, font_files: Optional[Dict[str, str]] = None):
+        self.font_files = find_font_files() if font_files is None else font_files
+        self.family = FONT_FAMILY if self.font_files else FALLBACK_FONT_FAMILY
+        self._prototypes: Dict[str, Any] = {}
+        self._data: Dict[str, bytes] = {}
+        if not self.font_files:
+            print("Fuentes DejaVu no encontradas: los informes PDF usarán helvetica")
+            return
+        if TTFFont is None:
+            return
+        try:
+            probe = FPDF()
+            for style, path in self.font_files.items():
+                with open(path, "rb") as f:
+                    self._data[style] = f.read()
+                self._prototypes[style] = TTFFont(probe, path, f"{FONT_FAMILY.lower()}{style}", style)
+        except Exception:
+            self._prototypes = {}
+
+    def install(self, pdf: FPDF) -> str:
+        """Registra las fuentes en el documento y devuelve la familia a usar."""
+        if self._prototypes:
+            try:
+                pdf.fonts.update(self._copy_fonts(pdf))
+                return self.family
+            except Exception as e:
+                # La versión de fpdf2 no admite reutilizar las fuentes: no se vuelve a intentar
+                print(f"No se pueden reutilizar las fuentes analizadas ({e}); se usará add_font")
+                self._prototypes = {}
+        for style, path in self.font_files.items():
+            pdf.add_font(FONT_FAMILY, style, path)
+        return self.family
+
+    def _copy_fonts(self, pdf: FPDF) -> Dict[str, Any]:
+        # Se preparan todas antes de tocar el documento: si una falla, pdf.fonts queda intacto
+        reserved = "\x00 \r\n"
+        if pdf.str_alias_nb_pages:
+            reserved += "0123456789" + pdf.str_alias_nb_pages
+        fonts = {}
+        for style, prototype in self._prototypes.items():
+            font = copy.copy(prototype)
+            font.i = len(pdf.fonts) + len(fonts) + 1
+            # El subconjunto de glifos y el TTF (que se recorta al guardar) son propios del documento
+            font.ttfont = ttLib.TTFont(BytesIO(self._data[style]), recalcTimestamp=False,
+                                       fontNumber=0, lazy=True)
+            font.missing_glyphs = []
+            font.subset = SubsetMap(font, [ord(char) for char in reserved])
+            fonts[prototype.fontkey] = font
+        return fonts
+
+
+_fonts: Optional[ReportFonts] = None
+
+
+def get_report_fonts() -> ReportFonts:
+    """Fuentes del proceso actual; se cargan en la primera llamada."""
+    global _fonts
+    if _fonts is None:
+        _fonts = ReportFonts()
+    return _fonts
+
+
+def render_pdf_report(output_file: str, domain: str, results: Dict[str, Any], summary: str,
+                      timestamp: Optional[str] = None) -> str:
+    """Escribe el informe PDF de un dominio en `output_file` y devuelve su ruta."""
+    pdf = FPDF()
+    pdf.add_page()
+
+    # Configurar fuentes (analizadas una sola vez por proceso)
+    font_family = get_report_fonts().install(pdf)
+
+    # Configurar colores
+    primary_color = (44, 62, 80)    # Azul oscuro
+    secondary_color = (52, 152, 219)  # Azul
+    accent_color = (231, 76, 60)     # Rojo
+    text_color = (44, 62, 80)        # Texto principal
+    light_bg = (248, 249, 250)       # Fondo claro
+
+    # Título con fondo
+    pdf.set_fill_color(*primary_color)
+    pdf.set_text_color(255, 255, 255)
+    pdf.set_font(font_family, 'B', 24)
+    pdf.cell(0, 30, f'Informe de Seguridad - {domain}',
+             new_x="LMARGIN", new_y="NEXT", align='C', fill=True)
+    pdf.ln(10)
+
+    # Fecha con estilo
+    pdf.set_text_color(*secondary_color)
+    pdf.set_font(font_family, 'I', 12)
+    pdf.cell(
+        0, 10, f'Fecha: {timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")}', new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(10)
+
+    # Resumen de IA con fondo
+    pdf.set_fill_color(*light_bg)
+    pdf.set_text_color(*text_color)
+    pdf.set_font(font_family, 'B', 16)
+    pdf.cell(0, 15, 'Resumen del Análisis',
+             new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(5)
+
+    # Fondo para el resumen
+    pdf.set_fill_color(*light_bg)
+    pdf.rect(10, pdf.get_y(), 190, 60, style='F')
+
+    pdf.set_font(font_family, '', 12)
+    pdf.set_text_color(0, 0, 0)
+    for line in summary.split('\n'):
+        pdf.multi_cell(0, 10, line)
+        pdf.ln(2)
+
+    # Registros DNS
+    pdf.add_page()
+    pdf.set_fill_color(*primary_color)
+    pdf.set_text_color(255, 255, 255)
+    pdf.set_font(font_family, 'B', 16)
+    pdf.cell(0, 15, 'Registros DNS', new_x="LMARGIN",
+             new_y="NEXT", fill=True)
+    pdf.ln(5)
+
+    pdf.set_font(font_family, '', 12)
+    for record_type, records in results['dns_records'].items():
+        pdf.set_text_color(*secondary_color)
+        pdf.cell(0, 10, f'{record_type}:',
+                 new_x="LMARGIN", new_y="NEXT")
+        pdf.set_text_color(0, 0, 0)
+        for record in records:
+            pdf.cell(0, 10, f'  - {record}',
+                     new_x="LMARGIN", new_y="NEXT")
+        pdf.ln(2)
+
+    # Información WHOIS
+    pdf.add_page()
+    pdf.set_fill_color(*primary_color)
+    pdf.set_text_color(255, 255, 255)
+    pdf.set_font(font_family, 'B', 16)
+    pdf.cell(0, 15, 'Información WHOIS',
+             new_x="LMARGIN", new_y="NEXT", fill=True)
+    pdf.ln(5)
+
+    pdf.set_font(font_family, '', 12)
+    for key, value in results['whois_info'].items():
+        pdf.set_text_color(*secondary_color)
+        if isinstance(value, list):
+            pdf.cell(0, 10, f'{key}:', new_x="LMARGIN", new_y="NEXT")
+            pdf.set_text_color(0, 0, 0)
+            for item in value:
+                pdf.cell(0, 10, f'  - {item}',
+                         new_x="LMARGIN", new_y="NEXT")
+        else:
+            pdf.cell(0, 10, f'{key}: {value}',
+                     new_x="LMARGIN", new_y="NEXT")
+        pdf.ln(2)
+
+    # Resultados Dork
+    pdf.add_page()
+    pdf.set_fill_color(*primary_color)
+    pdf.set_text_color(255, 255, 255)
+    pdf.set_font(font_family, 'B', 16)
+    pdf.cell(0, 15, 'Resultados de Búsquedas Dork',
+             new_x="LMARGIN", new_y="NEXT", fill=True)
+    pdf.ln(5)
+
+    pdf.set_font(font_family, '', 12)
+    for dork, urls in results['dork_results'].items():
+        pdf.set_text_color(*secondary_color)
+        pdf.cell(0, 10, f'Búsqueda: {dork}',
+                 new_x="LMARGIN", new_y="NEXT")
+        pdf.set_text_color(0, 0, 0)
+        for url in urls:
+            pdf.cell(0, 10, f'  - {url}',
+                     new_x="LMARGIN", new_y="NEXT")
+        pdf.ln(2)
+
+    # Guardar PDF
+    pdf.output(output_file)
+    return output_file
@@ -0,0 +1,83 @@
+"""Generación de los informes de ReconBot en un pool de procesos.
+
+La maquetación del PDF es CPU intensiva y no se beneficia de los hilos,
+así que cada formato (y, en modo lote, cada dominio) se genera en un
+proceso del pool. Cada proceso carga las fuentes una sola vez al arrancar.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+import os
+
+from report_html import render_html_report
+from report_pdf import get_report_fonts, render_pdf_report
+
+RENDERERS = {
+    "pdf": render_pdf_report,
+    "html": render_html_report,
+}
+REPORT_FORMATS = tuple(RENDERERS)
+REPORT_WORKERS = int(os.getenv("RECONBOT_REPORT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+def report_path(hallazgos_dir: str, domain: str, report_format: str) -> str:
+    return os.path.join(hallazgos_dir, f"reconbot_{domain.replace('.', '_')}_report.{report_format}")
+
+
+def init_report_worker():
+    # Inicializador de cada proceso: las fuentes se analizan aquí y no en cada informe
+    get_report_fonts()
+
+
+def _ready() -> bool:
+    return True
+
+
+def render_report(report_format: str, output_file: str, domain: str,
+                  results: Dict[str, Any], summary: str) -> str:
+    return RENDERERS[report_format](output_file, domain, results, summary)
+
+
+class ReportRenderer:
+    """Pool de procesos compartible entre dominios para generar sus informes."""
+
+    def __init__(self, max_workers: int = REPORT_WORKERS, formats: Iterable[str] = REPORT_FORMATS):
+        self.formats = tuple(formats)
+        unknown = set(self.formats) - set(RENDERERS)
+        if unknown:
+            raise ValueError(f"Formatos de informe desconocidos: {', '.join(sorted(unknown))}")
+        self._pool = ProcessPoolExecutor(max_workers=max_workers, initializer=init_report_worker)
+        # Se arrancan los procesos ahora, antes de que el análisis lance sus hilos
+        self._pool.submit(_ready).result()
+
+    def submit(self, hallazgos_dir: str, domain: str, results: Dict[str, Any],
+               summary: str) -> Dict[str, Future]:
+        """Encola todos los formatos de un dominio; cada uno se genera en su proceso."""
+        # Sólo se envían los datos que usan los informes
+        data = {key: results.get(key, {}) for key in ("dns_records", "whois_info", "dork_results")}
+        return {
+            report_format: self._pool.submit(
+                render_report, report_format, report_path(hallazgos_dir, domain, report_format),
+                domain, data, summary)
+            for report_format in self.formats
+        }
+
+    def render(self, hallazgos_dir: str, domain: str, results: Dict[str, Any],
+               summary: str) -> Dict[str, Optional[str]]:
+        """Genera los informes de un dominio; devuelve la ruta de cada uno (None si falló)."""
+        paths = {}
+        for report_format, future in self.submit(hallazgos_dir, domain, results, summary).items():
+            try:
+                paths[report_format] = future.result()
+            except Exception as e:
+                print(f"Error al generar el informe {report_format.upper()}: {str(e)}")
+                paths[report_format] = None
+        return paths
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()